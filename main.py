@@ -1,38 +1,29 @@
 import sys
-import pygame.time
 # Importing the game's entry point as an alias
 # for clarity and convenience
 import pypong.core.game_instance as pypong
-
-
-# Game window options
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-SCREEN_CAPTION = "Py-Pong!"
+from pypong.core.config import parse_profile
+from pypong.core.game_loop import FixedTimestepLoop, ThreadedLoop
 
 
 def main():
+    # The game's options (window, game loop, rendering, physics, ...) come from a profile,
+    # which is selected and modified by the command line flags (see --help)
+    profile = parse_profile(description="Py-Pong!")
+
     pypong_instance = pypong.GameInstance()  
-    pypong_instance.start(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_CAPTION) 
+    pypong_instance.start_from_profile(profile) 
     
-    # Delta time = time between this frame and the last
-    # Used to keep a consistent movement speed across devices
-    # regardless of the frames-per-second that the game is
-    # running at
-    delta_time = 0.0
-    last_time = 0.0
     # Keep running the game loop until either the window is closed
     # or the player presses ESC
-    while pypong_instance.run(delta_time) != -1:
-        # Amount of time since creation of the game instance
-        # (in milliseconds)
-        t = pygame.time.get_ticks()
- 
-        # Convert delta time from milliseconds to nanoseconds 
-        # because for game calculations, milliseconds 
-        # is a huge number to multiply by
-        delta_time = (t - last_time) / 1000
-        last_time = t
+    # The game logic is updated in fixed steps to keep the same speed across
+    # all devices, regardless of the frames-per-second that the game is running at
+    # (either in between the frames or on a thread of its own)
+    if profile.threaded_simulation:
+        game_loop = ThreadedLoop(pypong_instance, profile.tick_rate, profile.render_rate, idle_timeout=profile.idle_timeout)
+    else:
+        game_loop = FixedTimestepLoop(pypong_instance, profile.tick_rate, profile.render_rate, idle_timeout=profile.idle_timeout)
+    game_loop.run()
 
     # Close the game and clean up
     pypong_instance.quit()
@@ -40,4 +31,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
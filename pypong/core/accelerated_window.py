@@ -0,0 +1,113 @@
+import weakref
+from typing import Tuple
+import pygame.rect
+import pygame.surface
+from pygame._sdl2 import video
+
+
+"""Class that stands in for the window's Surface when rendering through an SDL Renderer
+Implements the part of the Surface interface used by the game's rendering code (blit, fill, get_size, get_rect),
+but instead of copying pixels it draws Textures with the Renderer.
+Every Surface blitted onto it is uploaded into a Texture the first time it's drawn, the Texture is then
+reused for as long as the Surface exists. Surfaces are therefore expected not to change after being drawn,
+which holds for the rendered text, the GameObjects and the compositor's layers."""
+class TextureCanvas:
+    def __init__(self, renderer: video.Renderer, size: Tuple[int, int]) -> None:
+        self._renderer = renderer
+        self._size = tuple(size)
+        # The Textures are dropped together with the Surfaces they were uploaded from
+        self._textures = weakref.WeakKeyDictionary()
+
+
+    """Draw the Surface at the provided position
+    'area' selects the part of the Surface that gets drawn, all of it by default"""
+    def blit(self, source: pygame.surface.Surface, dest: Tuple[float, float], area: pygame.rect.Rect = None) -> pygame.rect.Rect:
+        texture = self._textures.get(source)
+        if texture is None:
+            texture = video.Texture.from_surface(self._renderer, source)
+            self._textures[source] = texture
+
+        # Surface.blit truncates float positions, which the Textures have to match
+        if area is None:
+            dest_rect = pygame.rect.Rect(int(dest[0]), int(dest[1]), texture.width, texture.height)
+        else:
+            area = pygame.rect.Rect(area)
+            dest_rect = pygame.rect.Rect(int(dest[0]), int(dest[1]), area.width, area.height)
+        texture.draw(srcrect=area, dstrect=dest_rect)
+        return dest_rect
+
+
+    """Fill the provided area (the whole canvas by default) with the color"""
+    def fill(self, color: Tuple[int, int, int], rect: pygame.rect.Rect = None) -> None:
+        self._renderer.draw_color = (color[0], color[1], color[2], 255)
+        if rect is None:
+            self._renderer.clear()
+        else:
+            self._renderer.fill_rect(pygame.rect.Rect(rect))
+
+
+    """Read the current contents of the canvas back into a Surface (slow, meant for tests and screenshots)"""
+    def to_surface(self) -> pygame.surface.Surface:
+        return self._renderer.to_surface()
+
+
+
+    def get_size(self) -> Tuple[int, int]:
+        return self._size
+
+
+    def get_rect(self) -> pygame.rect.Rect:
+        return pygame.rect.Rect((0, 0), self._size)
+
+
+"""Class that represents the window in which the game is taking place, rendered using SDL's Renderer
+Alternative to GameWindow: instead of blitting Surfaces onto the window's Surface in software,
+everything is drawn as Textures, which the graphics card composes into the frame.
+'driver' selects the SDL render driver by its name (eg. "opengl" or "software"),
+the best available one is used by default. The software driver works on machines without a GPU."""
+class AcceleratedGameWindow:
+    def __init__(self, width: int, height: int, caption: str, vsync: bool = False, driver: str = None) -> None:
+        self._size = (width, height)
+        self._caption = caption
+
+        # The driver is looked up before anything is created, so an unknown one doesn't leave a window behind
+        driver_index = -1
+        if driver is not None:
+            driver_names = [driver_info.name for driver_info in video.get_drivers()]
+            if driver not in driver_names:
+                raise ValueError(f"Unknown render driver '{driver}', available: {', '.join(driver_names)}")
+            driver_index = driver_names.index(driver)
+
+        self._window = video.Window(caption, size=(width, height))
+        self._renderer = video.Renderer(self._window, index=driver_index, vsync=vsync)
+        self._canvas = TextureCanvas(self._renderer, self._size)
+
+
+    """Dispose of the window"""
+    def __del__(self) -> None:
+        # Also called when the constructor has failed
+        if not hasattr(self, "_canvas"):
+            return
+        del self._canvas
+        del self._renderer
+        self._window.destroy()
+
+
+    """Show everything drawn since the last call on the screen"""
+    def present(self) -> None:
+        self._renderer.present()
+
+
+
+    """Returns the canvas everything is drawn onto, which mimics the window's Surface of a GameWindow"""
+    def get_surface(self) -> TextureCanvas:
+        return self._canvas
+
+    def get_renderer(self) -> video.Renderer:
+        return self._renderer
+
+    def get_size(self) -> Tuple[int, int]:
+        return self._size
+
+    def get_caption(self) -> str:
+        return str(self._caption)
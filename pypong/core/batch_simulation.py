@@ -0,0 +1,274 @@
+from typing import Tuple
+import numpy as np
+from pypong.core.game_stats import GameState, PlayerIndex
+from pypong.core.simulation import (BALL_SIZE, BALL_SPEED, PADDLE_SIZE, PADDLE_SPEED,
+                                    PADDLE_X_OFFSET, PaddleDirection, Simulation)
+
+
+"""Class that simulates many independent matches at once
+The state of every match is stored in NumPy arrays (one row per match) instead of
+GameObjects and pygame.Rects, and the rules of Simulation are applied to all of the rows
+using array operations. Stepping N matches therefore costs a handful of NumPy calls
+instead of N Python method calls per object.
+
+The rules mirror Simulation exactly, including the rounding of positions
+into integer collision rectangles, so both produce the same matches."""
+class BatchSimulation:
+    """Create 'match_count' matches played on a field of the provided size
+    'seed' seeds the generator used for the ball launches"""
+    def __init__(self, match_count: int, window_size: Tuple[int, int], seed: int = None) -> None:
+        self._match_count = match_count
+        self._window_size = tuple(window_size)
+        self._rng = np.random.default_rng(seed)
+
+        # Initial positions, computed the same way as in Simulation
+        # The paddles never move horizontally, so their X position is shared by every match
+        self._paddle_x = np.array([
+            0 + PADDLE_SIZE[0] / 2 + PADDLE_X_OFFSET,
+            window_size[0] - PADDLE_SIZE[0] * 1.5 - PADDLE_X_OFFSET
+        ])
+        self._initial_paddle_y = window_size[1] / 2 - PADDLE_SIZE[1] / 2
+        self._initial_ball_position = np.array([
+            window_size[0] / 2 - BALL_SIZE[0] / 2,
+            window_size[1] / 2 - BALL_SIZE[1] / 2
+        ])
+
+        # The collision rect of a paddle never changes its X coordinate either,
+        # so the rounded X and the X of its center can be cached
+        self._paddle_rect_x = np.round(self._paddle_x)
+        self._paddle_center_x = self._paddle_rect_x + PADDLE_SIZE[0] // 2
+        # Bounds of the X coordinate of a ball's rect that overlaps a paddle's rect
+        self._paddle_overlap_min_x = self._paddle_rect_x - BALL_SIZE[0]
+        self._paddle_overlap_max_x = self._paddle_rect_x + PADDLE_SIZE[0]
+
+        # Struct of arrays holding the state of every match
+        self._ball_positions = np.empty((match_count, 2))
+        self._ball_velocities = np.empty((match_count, 2))
+        self._paddle_positions = np.empty((match_count, 2))
+        self._scores = np.empty((match_count, 2), dtype=np.int64)
+        self._game_states = np.empty(match_count, dtype=np.int8)
+        self._players_who_last_scored = np.empty(match_count, dtype=np.int8)
+
+        # Scratch arrays, every step writes its intermediate results into them (using the out= arguments)
+        # instead of allocating new arrays
+        self._active = np.empty(match_count, dtype=bool)
+        self._mask = np.empty(match_count, dtype=bool)
+        self._bound_mask = np.empty(match_count, dtype=bool)
+        self._game_start = np.empty(match_count, dtype=bool)
+        self._round_start = np.empty(match_count, dtype=bool)
+        self._round_end = np.empty(match_count, dtype=bool)
+        self._scored_left = np.empty(match_count, dtype=bool)
+        self._scored_right = np.empty(match_count, dtype=bool)
+        self._scored = np.empty(match_count, dtype=bool)
+        self._values = np.empty(match_count)
+        self._ball_moves = np.empty((match_count, 2))
+        self._rounded_ball_positions = np.empty((match_count, 2))
+        self._rounded_paddle_positions = np.empty((match_count, 2))
+        self._paddle_bounds = np.empty((match_count, 2))
+        self._paddle_overlaps = np.empty((match_count, 2), dtype=bool)
+        self._paddle_overlap_test = np.empty((match_count, 2), dtype=bool)
+
+        self.reset()
+
+
+    """Put the matches back at the start screen with no score
+    'mask' selects which matches are reset, all of them by default.
+    'seed' (if provided) reseeds the generator used for the ball launches"""
+    def reset(self, mask: np.ndarray = None, seed: int = None) -> None:
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        if mask is None:
+            mask = slice(None)
+
+        self._ball_positions[mask] = self._initial_ball_position
+        self._ball_velocities[mask] = 0.0
+        self._paddle_positions[mask] = self._initial_paddle_y
+        self._scores[mask] = 0
+        self._game_states[mask] = GameState.GAME_START.value
+        self._players_who_last_scored[mask] = 0
+
+
+    """Copy the state of a single Simulation into the match at the provided index"""
+    def load_simulation(self, index: int, simulation: Simulation) -> None:
+        game_stats = simulation.get_game_stats()
+
+        self._ball_positions[index] = simulation.get_ball().get_position()
+        self._ball_velocities[index] = simulation.get_ball().velocity
+        self._paddle_positions[index, 0] = simulation.get_player_one().get_y()
+        self._paddle_positions[index, 1] = simulation.get_player_two().get_y()
+        self._scores[index] = game_stats.score
+        self._game_states[index] = game_stats.current_game_state.value
+        self._players_who_last_scored[index] = int(game_stats.player_who_last_scored)
+
+
+    """Advance the matches to their next state, the equivalent of Simulation.advance_state
+    'mask' selects which matches are advanced, all of them by default.
+    Matches with a round in progress are left alone."""
+    def advance_state(self, mask: np.ndarray = None) -> None:
+        game_states = self._game_states
+        game_start = np.equal(game_states, GameState.GAME_START.value, out=self._game_start)
+        round_start = np.equal(game_states, GameState.ROUND_START.value, out=self._round_start)
+        round_end = np.equal(game_states, GameState.ROUND_END.value, out=self._round_end)
+        if mask is not None:
+            game_start &= mask
+            round_start &= mask
+            round_end &= mask
+
+        # Launch the balls the same way Simulation does, where a sign of 0 counts as 1
+        launch_count = np.count_nonzero(round_start)
+        if launch_count > 0:
+            signs = self._rng.integers(-1, 3, size=(launch_count, 2))
+            signs[signs == 0] = 1
+            self._ball_velocities[round_start] = signs * BALL_SPEED
+
+        # Reset all of the objects' positions for the matches starting a new round
+        np.copyto(self._paddle_positions, self._initial_paddle_y, where=round_end[:, None])
+        np.copyto(self._ball_positions, self._initial_ball_position, where=round_end[:, None])
+
+        np.copyto(game_states, GameState.ROUND_START.value, where=game_start)
+        np.copyto(game_states, GameState.ROUND_IN_PROGRESS.value, where=round_start)
+        np.copyto(game_states, GameState.ROUND_START.value, where=round_end)
+
+
+    """Advance the physics of every match with a round in progress by delta_time seconds
+    The directions are arrays with one PaddleDirection value per match
+    Returns a bool array marking the matches in which a point was scored during this step,
+    the array is overwritten by the next step"""
+    def step(self,
+             delta_time: float,
+             player_one_directions: np.ndarray,
+             player_two_directions: np.ndarray) -> np.ndarray:
+        active = np.equal(self._game_states, GameState.ROUND_IN_PROGRESS.value, out=self._active)
+
+        self._move_paddles(active, 0, player_one_directions, delta_time)
+        self._move_paddles(active, 1, player_two_directions, delta_time)
+        self._move_balls(active, delta_time)
+        self._handle_collisions(active)
+        return self._evaluate_scores(active)
+
+
+
+    def get_match_count(self) -> int:
+        return self._match_count
+
+
+    def get_window_size(self) -> Tuple[int, int]:
+        return self._window_size
+
+
+    # The following getters return the underlying arrays themselves (not copies),
+    # one row per match
+
+    def get_ball_positions(self) -> np.ndarray:
+        return self._ball_positions
+
+
+    def get_ball_velocities(self) -> np.ndarray:
+        return self._ball_velocities
+
+
+    """Y positions of the paddles, column 0 is player one and column 1 is player two"""
+    def get_paddle_positions(self) -> np.ndarray:
+        return self._paddle_positions
+
+
+    def get_scores(self) -> np.ndarray:
+        return self._scores
+
+
+    """Values of GameState for every match"""
+    def get_game_states(self) -> np.ndarray:
+        return self._game_states
+
+
+    """Values of PlayerIndex for every match (0 if no one has scored yet)"""
+    def get_players_who_last_scored(self) -> np.ndarray:
+        return self._players_who_last_scored
+
+
+    # Moves one column of paddles in the provided directions,
+    # unless that would move them past the top or bottom edge of the screen
+    def _move_paddles(self, active: np.ndarray, column: int, directions: np.ndarray, delta_time: float) -> None:
+        paddle_y = self._paddle_positions[:, column]
+        speed = PADDLE_SPEED * delta_time
+        moving = self._mask
+        is_within_bounds = self._bound_mask
+
+        # The paddles moving up and the ones moving down are different ones,
+        # so moving the first doesn't affect which of the second can move
+        np.equal(directions, PaddleDirection.UP, out=moving)
+        moving &= active
+        moving &= np.greater(paddle_y, 0, out=is_within_bounds)
+        np.subtract(paddle_y, speed, out=paddle_y, where=moving)
+
+        np.equal(directions, PaddleDirection.DOWN, out=moving)
+        moving &= active
+        paddle_bottom = np.add(paddle_y, PADDLE_SIZE[1], out=self._values)
+        moving &= np.less(paddle_bottom, self._window_size[1], out=is_within_bounds)
+        np.add(paddle_y, speed, out=paddle_y, where=moving)
+
+
+    # Moves the balls and bounces them back from the top and bottom edges of the screen (if necessary)
+    # The left and right edges aren't walls, a ball that gets past a paddle scores
+    def _move_balls(self, active: np.ndarray, delta_time: float) -> None:
+        positions = self._ball_positions
+        velocities = self._ball_velocities
+
+        position_y = positions[:, 1]
+        touches_edge = np.less_equal(position_y, 0, out=self._mask)
+        ball_bottom = np.add(position_y, BALL_SIZE[1], out=self._values)
+        touches_edge |= np.greater_equal(ball_bottom, self._window_size[1], out=self._bound_mask)
+        touches_edge &= active
+        np.negative(velocities[:, 1], out=velocities[:, 1], where=touches_edge)
+
+        # The balls of the matches that aren't in progress have no velocity,
+        # so moving every ball doesn't affect them
+        positions += np.multiply(velocities, delta_time, out=self._ball_moves)
+
+
+    # Bounces the balls back if they collide with a paddle
+    # Uses the same (rounded, integer) rectangles and overlap test as pygame.Rect.colliderect
+    # The rounded coordinates are whole numbers, so moving the sizes to the other side of the comparisons is exact
+    def _handle_collisions(self, active: np.ndarray) -> None:
+        ball_positions = np.round(self._ball_positions, out=self._rounded_ball_positions)
+        # Columns of shape (match_count, 1), compared against both paddles at once
+        ball_x = ball_positions[:, 0:1]
+        ball_y = ball_positions[:, 1:2]
+        paddle_y = np.round(self._paddle_positions, out=self._rounded_paddle_positions)
+        paddle_bounds = self._paddle_bounds
+        overlaps = self._paddle_overlaps
+        overlap_test = self._paddle_overlap_test
+
+        # ball_y < paddle_y + PADDLE_SIZE[1] and paddle_y < ball_y + BALL_SIZE[1]
+        np.less(ball_y, np.add(paddle_y, PADDLE_SIZE[1], out=paddle_bounds), out=overlaps)
+        overlaps &= np.less(np.subtract(paddle_y, BALL_SIZE[1], out=paddle_bounds), ball_y, out=overlap_test)
+        # ball_x < paddle_x + PADDLE_SIZE[0] and paddle_x < ball_x + BALL_SIZE[0]
+        overlaps &= np.less(ball_x, self._paddle_overlap_max_x, out=overlap_test)
+        overlaps &= np.less(self._paddle_overlap_min_x, ball_x, out=overlap_test)
+
+        colliding = np.any(overlaps, axis=1, out=self._mask)
+        colliding &= active
+        np.negative(self._ball_velocities[:, 0], out=self._ball_velocities[:, 0], where=colliding)
+
+
+    # Checks whether the balls have moved to the same level as the paddles
+    # and if so, awards the points and ends the rounds
+    def _evaluate_scores(self, active: np.ndarray) -> np.ndarray:
+        ball_center_x = np.round(self._ball_positions[:, 0], out=self._values)
+        ball_center_x += BALL_SIZE[0] // 2
+
+        scored_left = np.less_equal(ball_center_x, self._paddle_center_x[0], out=self._scored_left)
+        scored_left &= active
+        scored_right = np.greater_equal(ball_center_x, self._paddle_center_x[1], out=self._scored_right)
+        scored_right &= active
+        scored_right &= np.logical_not(scored_left, out=self._mask)
+        scored = np.logical_or(scored_left, scored_right, out=self._scored)
+
+        self._scores[:, 0] += scored_left
+        self._scores[:, 1] += scored_right
+        np.copyto(self._players_who_last_scored, PlayerIndex.PLAYER_TWO, where=scored_left)
+        np.copyto(self._players_who_last_scored, PlayerIndex.PLAYER_ONE, where=scored_right)
+        np.copyto(self._game_states, GameState.ROUND_END.value, where=scored)
+        np.copyto(self._ball_velocities, 0.0, where=scored[:, None])
+
+        return scored
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Hashable
+import pygame.surface
+from pypong.core.game_window import GameWindow
+if TYPE_CHECKING:
+    from pypong.core.accelerated_window import AcceleratedGameWindow
+    from pypong.core.offscreen_window import OffscreenWindow
+
+
+"""Class that keeps pre-rendered, window-sized layers of everything that doesn't move
+A frame is composed by blitting the cached layer of the current scene and drawing only
+the moving objects on top of it, instead of filling the window and drawing (and rasterizing)
+every line, shape and text again. Since the layer covers the whole window, repainting a dirty
+area of the window also restores its background from the layer.
+
+There are two kinds of layers:
+- static layers (eg. the empty court), which are drawn once and kept for as long as the compositor lives
+- scene layers (eg. the court with the prompts of a game state), which are drawn once per scene
+  and kept in a small least recently used cache"""
+class LayeredCompositor:
+    def __init__(self, window: "GameWindow | AcceleratedGameWindow | OffscreenWindow", cache_size: int = 16) -> None:
+        self._window = window
+        self._cache_size = cache_size
+        # dict({key: Hashable=layer identifier, value: Surface=rendered layer})
+        self._static_layers = dict()
+        self._scene_layers = OrderedDict()
+
+
+    """Get the static layer of the provided key
+    'draw' renders the layer onto the provided Surface, it's only called the first time the layer is requested"""
+    def get_static_layer(self, key: Hashable, draw: Callable[[pygame.surface.Surface], None]) -> pygame.surface.Surface:
+        layer = self._static_layers.get(key)
+        if layer is None:
+            layer = self._create_layer(draw)
+            self._static_layers[key] = layer
+        return layer
+
+
+    """Get the layer of the provided scene
+    'draw' renders the layer onto the provided Surface, it's only called if the layer isn't cached"""
+    def get_scene_layer(self, scene: Hashable, draw: Callable[[pygame.surface.Surface], None]) -> pygame.surface.Surface:
+        layer = self._scene_layers.get(scene)
+        if layer is not None:
+            self._scene_layers.move_to_end(scene)
+            return layer
+
+        # The layers are never redrawn once created, since the accelerated rendering
+        # keeps the Textures uploaded from them for as long as they exist
+        layer = self._create_layer(draw)
+        self._scene_layers[scene] = layer
+        if len(self._scene_layers) > self._cache_size:
+            self._scene_layers.popitem(last=False)
+        return layer
+
+
+    """Throw away every cached layer, so that they're drawn again the next time they're requested"""
+    def clear(self) -> None:
+        self._static_layers.clear()
+        self._scene_layers.clear()
+
+
+    # Creates a window-sized Surface and draws the layer onto it
+    # Surfaces are created in the display's pixel format (if there is a display), so blitting them needs no conversion
+    def _create_layer(self, draw: Callable[[pygame.surface.Surface], None]) -> pygame.surface.Surface:
+        layer = pygame.surface.Surface(self._window.get_size())
+        draw(layer)
+        return layer
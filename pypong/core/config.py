@@ -0,0 +1,270 @@
+import argparse
+import json
+import types
+from typing import NamedTuple, Tuple
+from pypong.core.simulation import BALL_SIZE, BALL_SPEED, PADDLE_SIZE, PADDLE_SPEED
+
+
+"""Immutable set of options the game is started with
+Everything that used to be a hard-coded constant (window, game loop, caching, physics, colors, fonts)
+can be tuned per deployment by a profile, loaded from a TOML or JSON file and/or command line flags.
+Create modified copies using _replace() or profile_from_dict()."""
+class GameProfile(NamedTuple):
+    # Window
+    window_width: int = 800
+    window_height: int = 600
+    window_caption: str = "Py-Pong!"
+    vsync: bool = False
+    # Render through SDL's Renderer (see AcceleratedGameWindow) and the SDL render driver it uses
+    accelerated: bool = False
+    render_driver: str | None = None
+    # SDL video driver (eg. "dummy" to run without a display), SDL picks one by default
+    video_driver: str | None = None
+    # Initialize only the display and font subsystems of pygame instead of all of them
+    # (audio, joysticks, ...), which the game doesn't use
+    fast_startup: bool = False
+
+    # Game loop
+    tick_rate: int = 120
+    # Frames per second, None renders after every loop iteration
+    render_rate: int | None = 60
+    # Longest time (in seconds) the loop waits for events while the game is idle
+    idle_timeout: float = 0.5
+    # Step the simulation on its own thread (see ThreadedLoop), so slow frames don't hold up the physics
+    threaded_simulation: bool = False
+
+    # Caching
+    # Amount of rendered Text objects kept by the UIManager
+    text_cache_size: int = 128
+    use_glyph_atlas: bool = False
+    # Amount of pre-rendered scene layers kept by the LayeredCompositor
+    layer_cache_size: int = 16
+
+    # Gameplay
+    # Seed of the ball launches, the current time is used if it isn't provided
+    seed: int | None = None
+    swept_collisions: bool = False
+    paddle_size: Tuple[int, int] = PADDLE_SIZE
+    paddle_speed: float = PADDLE_SPEED
+    ball_size: Tuple[int, int] = BALL_SIZE
+    ball_speed: float = BALL_SPEED
+    # Amount of balls launched every round, the first one to get past a paddle ends the round
+    ball_count: int = 1
+    # Static rects (x, y, width, height) the balls bounce off of
+    obstacles: Tuple[Tuple[int, int, int, int], ...] = ()
+
+    # Colors
+    color_title_card: Tuple[int, int, int] = (255, 237, 38)
+    color_important_prompt: Tuple[int, int, int] = (255, 255, 255)
+    color_prompt: Tuple[int, int, int] = (150, 150, 150)
+    color_game_object: Tuple[int, int, int] = (150, 150, 150)
+    color_score: Tuple[int, int, int] = (77, 77, 77)
+    color_background: Tuple[int, int, int] = (0, 0, 0)
+
+    # Fonts
+    font_path: str = "res/ka1.ttf"
+    title_font_size: int = 72
+    score_font_size: int = 48
+    prompt_font_size: int = 28
+    hud_font_size: int = 16
+
+
+DEFAULT_PROFILE = GameProfile()
+
+"""Predefined profiles, selected by name"""
+PRESETS = {
+    "default": DEFAULT_PROFILE,
+    # Runs without a display and renders as fast as possible, with a fixed seed so that runs are comparable
+    "headless-benchmark": DEFAULT_PROFILE._replace(
+        window_caption="Py-Pong! benchmark",
+        video_driver="dummy",
+        fast_startup=True,
+        render_rate=None,
+        seed=0
+    ),
+    # Keeps the CPU usage of an unattended cabinet low: fewer ticks and frames,
+    # frames synchronized with the display and long waits while nobody is playing
+    # The simulation runs on its own thread, so waiting for the display never holds up the physics
+    "low-power-kiosk": DEFAULT_PROFILE._replace(
+        vsync=True,
+        fast_startup=True,
+        tick_rate=60,
+        render_rate=30,
+        idle_timeout=2.0,
+        threaded_simulation=True,
+        text_cache_size=32,
+        use_glyph_atlas=True
+    ),
+    # Hundreds of small balls bouncing off of each other and a pair of obstacles
+    "chaos": DEFAULT_PROFILE._replace(
+        ball_size=(10, 10),
+        ball_count=200,
+        obstacles=((240, 40, 20, 80), (540, 480, 20, 80))
+    ),
+}
+
+
+"""Create a copy of the 'base' profile with the provided values replaced
+The values are validated (unknown options, wrong types and out of range values raise ValueError),
+lists are accepted in place of tuples since that's what TOML and JSON produce"""
+def profile_from_dict(values: dict, base: GameProfile = DEFAULT_PROFILE) -> GameProfile:
+    replaced = dict()
+    for name, value in values.items():
+        if name not in GameProfile._fields:
+            raise ValueError(f"Unknown profile option '{name}'")
+        replaced[name] = _validate_option(name, value)
+    return base._replace(**replaced)
+
+
+"""Load a profile from a TOML or JSON file (picked by the file's extension)
+The file contains the options to change as top-level keys. If it contains a 'preset' key,
+the options are applied on top of that preset instead of on top of 'base'"""
+def load_profile(path: str, base: GameProfile = DEFAULT_PROFILE) -> GameProfile:
+    if path.endswith(".toml"):
+        # Imported only when needed, most starts don't load a TOML file
+        # tomllib is only a part of the standard library since Python 3.11
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("Loading TOML profiles requires Python 3.11 or newer, use a .json file instead")
+        with open(path, "rb") as profile_file:
+            values = tomllib.load(profile_file)
+    elif path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as profile_file:
+            values = json.load(profile_file)
+    else:
+        raise ValueError(f"Unsupported profile file '{path}', expected a .toml or .json file")
+
+    preset = values.pop("preset", None)
+    if preset is not None:
+        base = get_preset(preset)
+    return profile_from_dict(values, base)
+
+
+def get_preset(name: str) -> GameProfile:
+    if name not in PRESETS:
+        raise ValueError(f"Unknown preset '{name}', available: {', '.join(PRESETS)}")
+    return PRESETS[name]
+
+
+"""Create the parser of the command line flags that select and modify the profile"""
+def create_argument_parser(description: str = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--preset", default="default", choices=PRESETS.keys(),
+                        help="profile the options are applied on top of")
+    parser.add_argument("--config", metavar="PATH", help="TOML or JSON file with the options to change")
+    parser.add_argument("--width", type=int, dest="window_width", help="width of the window")
+    parser.add_argument("--height", type=int, dest="window_height", help="height of the window")
+    parser.add_argument("--tick-rate", type=int, dest="tick_rate", help="game logic updates per second")
+    parser.add_argument("--render-rate", type=int, dest="render_rate", help="frames per second")
+    parser.add_argument("--threaded-simulation", dest="threaded_simulation", action=argparse.BooleanOptionalAction,
+                        help="step the simulation on its own thread, independently of the rendering")
+    parser.add_argument("--vsync", action=argparse.BooleanOptionalAction, help="synchronize frames with the display")
+    parser.add_argument("--accelerated", action=argparse.BooleanOptionalAction,
+                        help="render through SDL's Renderer instead of blitting in software")
+    parser.add_argument("--render-driver", dest="render_driver", help="SDL render driver of the accelerated rendering")
+    parser.add_argument("--video-driver", dest="video_driver", help="SDL video driver (eg. dummy)")
+    parser.add_argument("--fast-startup", dest="fast_startup", action=argparse.BooleanOptionalAction,
+                        help="initialize only the parts of pygame the game uses")
+    parser.add_argument("--seed", type=int, help="seed of the ball launches")
+    parser.add_argument("--set", action="append", default=[], metavar="OPTION=VALUE",
+                        help="change any other option, the value is parsed as JSON if possible (repeatable)")
+    return parser
+
+
+"""Build the profile from the parsed command line flags
+The options are applied in order: the preset, the config file, the flags and finally the --set options"""
+def profile_from_arguments(arguments: argparse.Namespace) -> GameProfile:
+    profile = get_preset(arguments.preset)
+    if arguments.config is not None:
+        profile = load_profile(arguments.config, profile)
+
+    flags = dict()
+    for name in ("window_width", "window_height", "tick_rate", "render_rate", "threaded_simulation", "vsync",
+                 "accelerated", "render_driver", "video_driver", "fast_startup", "seed"):
+        value = getattr(arguments, name)
+        if value is not None:
+            flags[name] = value
+
+    for assignment in arguments.set:
+        name, separator, value = assignment.partition("=")
+        if separator == "":
+            raise ValueError(f"Expected OPTION=VALUE, got '{assignment}'")
+        try:
+            flags[name.strip()] = json.loads(value)
+        except json.JSONDecodeError:
+            flags[name.strip()] = value
+
+    return profile_from_dict(flags, profile)
+
+
+"""Parse the command line arguments into a profile"""
+def parse_profile(argv: list[str] = None, description: str = None) -> GameProfile:
+    parser = create_argument_parser(description)
+    arguments = parser.parse_args(argv)
+    try:
+        return profile_from_arguments(arguments)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+
+# Checks that the value fits the option's type (and range), returns it converted to that type
+def _validate_option(name: str, value):
+    option_type = GameProfile.__annotations__[name]
+    optional = isinstance(option_type, types.UnionType)
+    if optional:
+        if value is None:
+            return None
+        option_type = option_type.__args__[0]
+
+    # Lists of rects
+    if getattr(option_type, "__origin__", None) is tuple and option_type.__args__[-1] is Ellipsis:
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"Option '{name}' must be a list")
+        return tuple(_validate_rect(name, rect) for rect in value)
+
+    if getattr(option_type, "__origin__", None) is tuple:
+        item_count = len(option_type.__args__)
+        if not isinstance(value, (list, tuple)) or len(value) != item_count or \
+           not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+            raise ValueError(f"Option '{name}' must be a list of {item_count} integers")
+        value = tuple(value)
+        # Colors are the only 3 item tuples
+        limit = 255 if item_count == 3 else None
+        if any(item < 0 or (limit is not None and item > limit) for item in value):
+            raise ValueError(f"Option '{name}' is out of range")
+        if item_count == 2 and any(item == 0 for item in value):
+            raise ValueError(f"Option '{name}' must not contain a zero")
+        return value
+
+    if option_type is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"Option '{name}' must be true or false")
+        return value
+    if option_type is float:
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise ValueError(f"Option '{name}' must be a number")
+        value = float(value)
+    elif option_type is int:
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"Option '{name}' must be an integer")
+    elif not isinstance(value, option_type):
+        raise ValueError(f"Option '{name}' must be a {option_type.__name__}")
+
+    # Every numeric option except the seed is a size, a rate or a duration
+    if option_type in (int, float) and name != "seed" and value <= 0:
+        raise ValueError(f"Option '{name}' must be greater than zero")
+    # The seed is stored in the replays as a signed 64-bit integer
+    if name == "seed" and not -2**63 <= value < 2**63:
+        raise ValueError(f"Option '{name}' must fit into a signed 64-bit integer")
+    return value
+
+
+# Checks that the value is a rect (x, y, width, height) with a positive size, returns it as a tuple
+def _validate_rect(name: str, value) -> Tuple[int, int, int, int]:
+    if not isinstance(value, (list, tuple)) or len(value) != 4 or \
+       not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+        raise ValueError(f"Option '{name}' must be a list of rects, each of them a list of 4 integers (x, y, width, height)")
+    if value[2] <= 0 or value[3] <= 0:
+        raise ValueError(f"Option '{name}' contains a rect without a size")
+    return tuple(value)
@@ -0,0 +1,108 @@
+import random
+from pypong.core.game_stats import PlayerIndex
+from pypong.core.simulation import PaddleDirection, Simulation
+
+
+"""Computer-controlled player, usable as a Policy of a HeadlessGame
+or as a controller of either paddle of a GameInstance
+
+Instead of following the ball every tick, it computes where the ball will cross
+its paddle as soon as the ball's velocity changes (a launch or a bounce).
+The ball moves in a straight line between the bounces off of the top and bottom edges
+of the screen, so unfolding those reflections turns its path into a single straight line:
+the crossing point is found by moving the ball along that line and folding the result
+back into the playing field. Between the bounces the player only moves its paddle
+towards the predicted point."""
+class CpuPlayer:
+    """'dead_zone' is how far (in pixels) the paddle's center can be from the predicted point
+    without moving, which keeps the paddle from jittering around the point.
+    'error' is the furthest (in pixels) the predicted point may randomly be off by,
+    an error larger than half of the paddle's height makes the player beatable.
+    'rng' is the generator of the random error, a new one is created if it's None
+    (the player keeps its own generator so that it can be pickled and copied, eg. by a MatchRunner).
+    A MatchRunner reseeds it from the seed of every match (see seed()), so the matches are reproducible
+    no matter which generator the player has been created with"""
+    def __init__(self, dead_zone: float = 8.0, error: float = 0.0, rng: random.Random | None = None) -> None:
+        self._dead_zone = dead_zone
+        self._error = error
+        self._rng = rng if rng is not None else random.Random()
+
+        # Ball velocity and score the prediction was made for,
+        # the prediction is only made again once either of them changes
+        self._predicted_for = None
+        # Y coordinate the center of the paddle is moved towards
+        self._target_y = 0.0
+
+
+    """Reseed the generator of the random error"""
+    def seed(self, seed: int) -> None:
+        self._rng = random.Random(seed)
+
+
+    def __call__(self, simulation: Simulation, player: PlayerIndex) -> PaddleDirection:
+        ball_velocity = simulation.get_ball().velocity
+        # The score is a part of the key because a new round can launch the ball
+        # with the same velocity the previous round has ended with
+        predicted_for = (ball_velocity[0], ball_velocity[1], simulation.get_game_stats().score)
+        if predicted_for != self._predicted_for:
+            self._predicted_for = predicted_for
+            self._target_y = self._predict_target_y(simulation, player)
+
+        paddle = simulation.get_player_one() if player == PlayerIndex.PLAYER_ONE else simulation.get_player_two()
+        offset = self._target_y - (paddle.get_y() + paddle.get_scale()[1] / 2)
+        if offset > self._dead_zone:
+            return PaddleDirection.DOWN
+        if offset < -self._dead_zone:
+            return PaddleDirection.UP
+        return PaddleDirection.NONE
+
+
+    """Predict the Y coordinate of the ball's center once it reaches the player's paddle
+    If the ball isn't heading towards the paddle, the center of the screen is returned instead
+    so that the paddle is in the best position to react to the ball coming back"""
+    @staticmethod
+    def predict_ball_crossing(simulation: Simulation, player: PlayerIndex) -> float:
+        window_size = simulation.get_window_size()
+        ball = simulation.get_ball()
+        ball_size = ball.get_scale()
+        ball_velocity = ball.velocity
+
+        # X coordinate of the ball's origin once it touches the paddle's inner edge
+        if player == PlayerIndex.PLAYER_ONE:
+            paddle = simulation.get_player_one()
+            contact_x = paddle.get_x() + paddle.get_scale()[0]
+            is_heading_towards = ball_velocity[0] < 0
+        else:
+            paddle = simulation.get_player_two()
+            contact_x = paddle.get_x() - ball_size[0]
+            is_heading_towards = ball_velocity[0] > 0
+
+        if not is_heading_towards:
+            return window_size[1] / 2
+
+        time_to_contact = max(0.0, (contact_x - ball.get_x()) / ball_velocity[0])
+        unfolded_y = ball.get_y() + ball_velocity[1] * time_to_contact
+        return _fold(unfolded_y, window_size[1] - ball_size[1]) + ball_size[1] / 2
+
+
+    # Predicts the crossing point and offsets it by the player's random error
+    def _predict_target_y(self, simulation: Simulation, player: PlayerIndex) -> float:
+        target_y = CpuPlayer.predict_ball_crossing(simulation, player)
+        if self._error > 0.0:
+            target_y += self._rng.uniform(-self._error, self._error)
+        return target_y
+
+
+
+    def get_target_y(self) -> float:
+        return self._target_y
+
+
+# Folds a coordinate moving along a straight line back into the range [0, limit],
+# as if it was reflected off of both ends of the range every time it reached them
+def _fold(coordinate: float, limit: float) -> float:
+    if limit <= 0:
+        return 0.0
+
+    coordinate %= 2 * limit
+    return coordinate if coordinate <= limit else 2 * limit - coordinate
@@ -0,0 +1,120 @@
+from typing import Callable, Hashable
+import pygame.display
+import pygame.rect
+from pypong.core.game_window import GameWindow
+
+
+"""Class that repaints only the parts of the window that have changed since the last frame
+Objects that move around (paddles, ball) are tracked by their collision rects. The area they
+covered last frame and the area they cover now are repainted by running the regular drawing
+code once, clipped to the bounding box of all of those areas, and only the areas themselves
+are passed to pygame.display.update.
+
+Everything else on the screen (score, prompts, title card) only changes together with the
+'scene', which is a hashable summary of what's displayed (eg. the game state and the score).
+Whenever the scene changes, the whole window is repainted."""
+class DirtyRectRenderer:
+    # Amount of pixels by which every area of a moving object is grown in each direction
+    # Guards against objects drawn a pixel off from their tracked rects
+    DIRTY_RECT_MARGIN = 1
+    # Highest amount of dirty areas passed to the display one by one
+    # With more of them (eg. lots of balls) updating the whole window at once is cheaper
+    MAX_DIRTY_RECTS = 16
+
+    def __init__(self, window: GameWindow) -> None:
+        self._window = window
+        self._scene = None
+        self._needs_full_repaint = True
+        # dict({key: Hashable=object identifier, value: Rect=area covered by the object})
+        self._previous_areas = dict()
+        self._current_areas = dict()
+        # Areas whose contents have changed this frame, regardless of any object's movement
+        self._changed_areas = []
+
+
+    """Force the whole window to be repainted next frame"""
+    def invalidate(self) -> None:
+        self._needs_full_repaint = True
+
+
+    """Tell the renderer where a moving object is this frame
+    Must be called for every moving object before present()"""
+    def track(self, key: Hashable, rect: pygame.rect.Rect) -> None:
+        self._current_areas[key] = pygame.rect.Rect(rect)
+
+
+    """Tell the renderer that the contents of the provided area have changed this frame
+    (eg. text that's been updated), so that it gets repainted"""
+    def mark_dirty(self, rect: pygame.rect.Rect) -> None:
+        self._changed_areas.append(pygame.rect.Rect(rect))
+
+
+    """Draw the frame and show it on the screen
+    'draw_scene' draws the entire frame (background included), the renderer clips it
+    to the bounding box of the dirty areas unless the whole window has to be repainted"""
+    def present(self, scene: Hashable, draw_scene: Callable[[], None]) -> None:
+        if self._needs_full_repaint or scene != self._scene:
+            draw_scene()
+            self._update_display()
+        else:
+            dirty_rects = self._get_dirty_rects()
+            if len(dirty_rects) > DirtyRectRenderer.MAX_DIRTY_RECTS:
+                draw_scene()
+                self._update_display()
+            elif len(dirty_rects) > 0:
+                # The scene is drawn only once, whatever the amount of dirty areas
+                # Everything between the areas is drawn the same as it was, so it doesn't have to be shown again
+                window_surface = self._window.get_surface()
+                window_surface.set_clip(dirty_rects[0].unionall(dirty_rects[1:]))
+                draw_scene()
+                window_surface.set_clip(None)
+
+                self._update_display(dirty_rects)
+
+        self._scene = scene
+        self._needs_full_repaint = False
+        self._previous_areas, self._current_areas = self._current_areas, self._previous_areas
+        self._current_areas.clear()
+        self._changed_areas.clear()
+
+
+    # Shows the provided areas of the window's Surface on the screen (all of it by default)
+    def _update_display(self, rects: list[pygame.rect.Rect] = None) -> None:
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+
+    # Collects the areas of the objects that have moved (both where they were and where they are now),
+    # clipped to the window
+    def _get_dirty_rects(self) -> list[pygame.rect.Rect]:
+        window_rect = self._window.get_surface().get_rect()
+        margin = DirtyRectRenderer.DIRTY_RECT_MARGIN * 2
+        dirty_rects = []
+
+        for key, current_area in self._current_areas.items():
+            previous_area = self._previous_areas.get(key)
+            if previous_area == current_area:
+                continue
+
+            # Objects only move by a few pixels per frame, so the old and new area
+            # usually overlap and a single rect covering both is the cheapest to repaint
+            dirty_rect = current_area if previous_area is None else current_area.union(previous_area)
+            dirty_rect = dirty_rect.inflate(margin, margin).clip(window_rect)
+            if dirty_rect.width > 0 and dirty_rect.height > 0:
+                dirty_rects.append(dirty_rect)
+
+        # Objects that have disappeared since the last frame
+        for key, previous_area in self._previous_areas.items():
+            if key not in self._current_areas:
+                dirty_rect = previous_area.inflate(margin, margin).clip(window_rect)
+                if dirty_rect.width > 0 and dirty_rect.height > 0:
+                    dirty_rects.append(dirty_rect)
+
+        for changed_area in self._changed_areas:
+            dirty_rect = changed_area.clip(window_rect)
+            if dirty_rect.width > 0 and dirty_rect.height > 0:
+                dirty_rects.append(dirty_rect)
+
+        return dirty_rects
@@ -0,0 +1,309 @@
+import random
+from typing import Callable, Tuple
+import numpy as np
+from pypong.core.batch_simulation import BatchSimulation
+from pypong.core.game_stats import GameState, PlayerIndex
+from pypong.core.headless import Policy
+from pypong.core.simulation import BALL_SIZE, BALL_SPEED, PADDLE_SIZE, PaddleDirection, Simulation
+
+
+# Observation layout, every value is scaled so that it doesn't depend on the window size or the ball speed:
+# ball X, ball Y (relative to the window size), ball X and Y velocity (relative to BALL_SPEED),
+# Y of the agent's paddle, Y of the opponent's paddle (relative to the window height)
+OBSERVATION_SIZE = 6
+
+# Actions: 0 - don't move, 1 - move up, 2 - move down
+ACTION_COUNT = 3
+_ACTION_TO_DIRECTION = np.array([PaddleDirection.NONE, PaddleDirection.UP, PaddleDirection.DOWN], dtype=np.int8)
+
+# How far (in pixels) the opponents' paddle centers can be from the ball's center without moving
+TRACKING_DEAD_ZONE = 8.0
+
+
+"""Signature of the vectorized opponents of a VectorPongEnv
+Receives the batch of matches and the index of the controlled player,
+returns an array with the PaddleDirection value of every match"""
+BatchPolicy = Callable[[BatchSimulation, PlayerIndex], np.ndarray]
+
+
+"""Policy that moves the paddle towards the ball's current height"""
+def track_ball(simulation: Simulation, player: PlayerIndex) -> PaddleDirection:
+    paddle = simulation.get_player_one() if player == PlayerIndex.PLAYER_ONE else simulation.get_player_two()
+    ball = simulation.get_ball()
+    offset = (ball.get_y() + ball.get_scale()[1] / 2) - (paddle.get_y() + paddle.get_scale()[1] / 2)
+    if offset > TRACKING_DEAD_ZONE:
+        return PaddleDirection.DOWN
+    if offset < -TRACKING_DEAD_ZONE:
+        return PaddleDirection.UP
+    return PaddleDirection.NONE
+
+
+"""Vectorized version of track_ball()"""
+def track_ball_batch(batch: BatchSimulation, player: PlayerIndex) -> np.ndarray:
+    offsets = (batch.get_ball_positions()[:, 1] + BALL_SIZE[1] / 2) - \
+              (batch.get_paddle_positions()[:, player - 1] + PADDLE_SIZE[1] / 2)
+    return (offsets > TRACKING_DEAD_ZONE).astype(np.int8) - (offsets < -TRACKING_DEAD_ZONE)
+
+
+"""Environment for training agents to play Pong, modelled after the Gym API
+The agent controls one paddle, the other one is controlled by the opponent Policy.
+It runs on a Simulation, without a window, and the game never waits for SPACE:
+the rounds are started automatically. An episode ends once either player
+has scored 'points_to_win' points or after 'max_episode_steps' steps.
+
+Every step simulates 'frame_skip' ticks, repeating the agent's action in all of them,
+and returns the sum of their rewards (+1 when the agent scores, -1 when the opponent does).
+The observation is written into the same preallocated array every step,
+copy it if it needs to be kept."""
+class PongEnv:
+    def __init__(self,
+                 window_size: Tuple[int, int] = (800, 600),
+                 delta_time: float = 1 / 60,
+                 frame_skip: int = 1,
+                 player: PlayerIndex = PlayerIndex.PLAYER_ONE,
+                 opponent: Policy = track_ball,
+                 points_to_win: int = 1,
+                 max_episode_steps: int = None,
+                 seed: int = None) -> None:
+        self._delta_time = delta_time
+        self._frame_skip = frame_skip
+        self._player = player
+        self._opponent_player = PlayerIndex.PLAYER_TWO if player == PlayerIndex.PLAYER_ONE else PlayerIndex.PLAYER_ONE
+        self._opponent = opponent
+        self._points_to_win = points_to_win
+        self._max_episode_steps = max_episode_steps
+
+        self._rng = random.Random(seed)
+        self._simulation = Simulation(window_size, rng=self._rng)
+        # State at the start screen, every episode starts from it
+        self._initial_snapshot = self._simulation.snapshot()
+
+        self._observation = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        # Scales applied to the state to get the observation
+        self._observation_scale = (1 / window_size[0], 1 / window_size[1], 1 / BALL_SPEED, 1 / window_size[1])
+        self._episode_steps = 0
+        self._info = dict()
+
+
+    """Start a new episode
+    Returns Tuple(observation, info)"""
+    def reset(self, seed: int = None) -> Tuple[np.ndarray, dict]:
+        # Restoring the snapshot would rewind the random number generator as well,
+        # which would make every episode start the same way
+        rng_state = self._rng.getstate()
+        self._simulation.restore(self._initial_snapshot)
+        if seed is not None:
+            self._rng.seed(seed)
+        else:
+            self._rng.setstate(rng_state)
+
+        self._start_round()
+        self._episode_steps = 0
+        return (self._update_observation(), self._info)
+
+
+    """Play a single step with the provided action (see ACTION_COUNT)
+    Returns Tuple(observation, reward, terminated, truncated, info)
+    Once the episode has terminated or has been truncated, reset() has to be called"""
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, dict]:
+        simulation = self._simulation
+        game_stats = simulation.get_game_stats()
+        agent_direction = PaddleDirection(int(_ACTION_TO_DIRECTION[action]))
+        reward = 0.0
+        terminated = False
+
+        for _ in range(self._frame_skip):
+            opponent_direction = self._opponent(simulation, self._opponent_player)
+            if self._player == PlayerIndex.PLAYER_ONE:
+                simulation.step(self._delta_time, agent_direction, opponent_direction)
+            else:
+                simulation.step(self._delta_time, opponent_direction, agent_direction)
+
+            if game_stats.current_game_state == GameState.ROUND_END:
+                reward += 1.0 if game_stats.player_who_last_scored == self._player else -1.0
+                if max(game_stats.score) >= self._points_to_win:
+                    terminated = True
+                    break
+                self._start_round()
+
+        self._episode_steps += 1
+        truncated = not terminated and self._max_episode_steps is not None and \
+                    self._episode_steps >= self._max_episode_steps
+        return (self._update_observation(), reward, terminated, truncated, self._info)
+
+
+
+    def get_simulation(self) -> Simulation:
+        return self._simulation
+
+
+    def get_observation(self) -> np.ndarray:
+        return self._observation
+
+
+    # Presses SPACE until the next round is in progress
+    def _start_round(self) -> None:
+        simulation = self._simulation
+        while simulation.get_game_stats().current_game_state != GameState.ROUND_IN_PROGRESS:
+            simulation.advance_state()
+
+
+    # Writes the current state of the simulation into the observation array
+    def _update_observation(self) -> np.ndarray:
+        simulation = self._simulation
+        ball = simulation.get_ball()
+        ball_velocity = ball.velocity
+        x_scale, y_scale, velocity_scale, paddle_scale = self._observation_scale
+        if self._player == PlayerIndex.PLAYER_ONE:
+            agent_paddle, opponent_paddle = simulation.get_player_one(), simulation.get_player_two()
+        else:
+            agent_paddle, opponent_paddle = simulation.get_player_two(), simulation.get_player_one()
+
+        observation = self._observation
+        observation[0] = ball.get_x() * x_scale
+        observation[1] = ball.get_y() * y_scale
+        observation[2] = ball_velocity[0] * velocity_scale
+        observation[3] = ball_velocity[1] * velocity_scale
+        observation[4] = agent_paddle.get_y() * paddle_scale
+        observation[5] = opponent_paddle.get_y() * paddle_scale
+        return observation
+
+
+"""Vectorized version of PongEnv running 'env_count' environments at once on a BatchSimulation
+The actions, observations (one row per environment), rewards and flags are NumPy arrays.
+Environments whose episode has ended are reset automatically at the end of the step,
+so the returned observation of such an environment is already the first one of its new episode.
+All of the returned arrays are preallocated and overwritten every step, copy them if they need to be kept."""
+class VectorPongEnv:
+    def __init__(self,
+                 env_count: int,
+                 window_size: Tuple[int, int] = (800, 600),
+                 delta_time: float = 1 / 60,
+                 frame_skip: int = 1,
+                 player: PlayerIndex = PlayerIndex.PLAYER_ONE,
+                 opponent: BatchPolicy = track_ball_batch,
+                 points_to_win: int = 1,
+                 max_episode_steps: int = None,
+                 seed: int = None) -> None:
+        self._env_count = env_count
+        self._delta_time = delta_time
+        self._frame_skip = frame_skip
+        self._player = player
+        self._opponent_player = PlayerIndex.PLAYER_TWO if player == PlayerIndex.PLAYER_ONE else PlayerIndex.PLAYER_ONE
+        self._opponent = opponent
+        self._points_to_win = points_to_win
+        self._max_episode_steps = max_episode_steps
+        self._batch = BatchSimulation(env_count, window_size, seed)
+
+        self._observations = np.zeros((env_count, OBSERVATION_SIZE), dtype=np.float32)
+        self._rewards = np.zeros(env_count, dtype=np.float32)
+        self._terminated = np.zeros(env_count, dtype=bool)
+        self._truncated = np.zeros(env_count, dtype=bool)
+        self._agent_directions = np.zeros(env_count, dtype=np.int8)
+        self._episode_steps = np.zeros(env_count, dtype=np.int64)
+        self._observation_scale = np.array([1 / window_size[0], 1 / window_size[1]])
+        self._info = dict()
+
+        # Scratch arrays for the intermediate results of a step, so that stepping doesn't allocate
+        self._agent_scored = np.empty(env_count, dtype=bool)
+        self._other_scored = np.empty(env_count, dtype=bool)
+        self._has_won = np.empty(env_count, dtype=bool)
+        self._ended = np.empty(env_count, dtype=bool)
+        self._highest_scores = np.empty(env_count, dtype=np.int64)
+
+
+    """Start a new episode in every environment
+    Returns Tuple(observations, info)"""
+    def reset(self, seed: int = None) -> Tuple[np.ndarray, dict]:
+        self._batch.reset(seed=seed)
+        self._start_rounds(None)
+        self._episode_steps.fill(0)
+        return (self._update_observations(), self._info)
+
+
+    """Play a single step in every environment with the provided actions (one per environment)
+    Returns Tuple(observations, rewards, terminated, truncated, info)"""
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        batch = self._batch
+        scores = batch.get_scores()
+        players_who_last_scored = batch.get_players_who_last_scored()
+        rewards = self._rewards
+        terminated = self._terminated
+        # Checked upfront, since taking with mode="raise" writes into a temporary copy instead of the output array
+        if np.min(actions) < 0 or np.max(actions) >= ACTION_COUNT:
+            raise IndexError(f"The actions must be between 0 and {ACTION_COUNT - 1}")
+        np.take(_ACTION_TO_DIRECTION, actions, out=self._agent_directions, mode="clip")
+        rewards.fill(0.0)
+        terminated.fill(False)
+
+        for _ in range(self._frame_skip):
+            opponent_directions = self._opponent(batch, self._opponent_player)
+            if self._player == PlayerIndex.PLAYER_ONE:
+                scored = batch.step(self._delta_time, self._agent_directions, opponent_directions)
+            else:
+                scored = batch.step(self._delta_time, opponent_directions, self._agent_directions)
+
+            if not scored.any():
+                continue
+
+            # The rounds of the environments that have terminated stay over until the end of the step,
+            # so the rest of the skipped ticks leave them alone
+            agent_scored = np.equal(players_who_last_scored, self._player, out=self._agent_scored)
+            agent_scored &= scored
+            rewards += agent_scored
+            # For bools, a > b is a & ~b
+            opponent_scored = np.greater(scored, agent_scored, out=self._other_scored)
+            rewards -= opponent_scored
+            highest_scores = np.maximum(scores[:, 0], scores[:, 1], out=self._highest_scores)
+            has_won = np.greater_equal(highest_scores, self._points_to_win, out=self._has_won)
+            has_won &= scored
+            terminated |= has_won
+            # Scored but hasn't won
+            self._start_rounds(np.greater(scored, has_won, out=self._other_scored))
+
+        self._episode_steps += 1
+        truncated = self._truncated
+        if self._max_episode_steps is not None:
+            np.greater_equal(self._episode_steps, self._max_episode_steps, out=truncated)
+            truncated &= np.logical_not(terminated, out=self._ended)
+        ended = np.logical_or(terminated, truncated, out=self._ended)
+        if ended.any():
+            batch.reset(ended)
+            self._start_rounds(ended)
+            np.copyto(self._episode_steps, 0, where=ended)
+
+        return (self._update_observations(), rewards, terminated, truncated, self._info)
+
+
+
+    def get_env_count(self) -> int:
+        return self._env_count
+
+
+    def get_batch_simulation(self) -> BatchSimulation:
+        return self._batch
+
+
+    def get_observations(self) -> np.ndarray:
+        return self._observations
+
+
+    # Presses SPACE in the selected environments until their next round is in progress
+    # (from the start screen that takes two presses, from the end of a round as well)
+    def _start_rounds(self, mask: np.ndarray | None) -> None:
+        self._batch.advance_state(mask)
+        self._batch.advance_state(mask)
+
+
+    # Writes the current state of the batch into the observation array
+    def _update_observations(self) -> np.ndarray:
+        batch = self._batch
+        observations = self._observations
+        paddle_positions = batch.get_paddle_positions()
+        paddle_scale = self._observation_scale[1]
+
+        np.multiply(batch.get_ball_positions(), self._observation_scale, out=observations[:, 0:2])
+        np.multiply(batch.get_ball_velocities(), 1 / BALL_SPEED, out=observations[:, 2:4])
+        np.multiply(paddle_positions[:, self._player - 1], paddle_scale, out=observations[:, 4])
+        np.multiply(paddle_positions[:, self._opponent_player - 1], paddle_scale, out=observations[:, 5])
+        return observations
@@ -0,0 +1,188 @@
+import math
+import multiprocessing
+import multiprocessing.pool
+import os
+import struct
+import zlib
+from collections import deque
+from typing import Callable, Tuple
+import pygame.image
+from pypong.core.config import DEFAULT_PROFILE, GameProfile
+from pypong.core.game_instance import GameInstance
+from pypong.core.replay import Replay, ReplayPlayer
+
+
+# Formats the frames can be exported in and the extensions of their files
+# png: regular PNG images
+# raw: 24-bit RGB pixels, row by row from the top, without any header
+#      (eg. for ffmpeg's "-f rawvideo -pix_fmt rgb24 -s WIDTHxHEIGHT")
+FRAME_FORMATS = {
+    "png": ".png",
+    "raw": ".rgb",
+}
+
+# Options of the profile that affect the physics, replays are always played back with the default ones
+PHYSICS_OPTIONS = ("paddle_size", "paddle_speed", "ball_size", "ball_speed", "ball_count", "obstacles")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+"""Class that renders the frames of a recorded match off-screen and saves them as an image sequence
+
+The frames are rendered by a GameInstance started without a window (see GameInstance.start_offscreen()),
+using the same rendering code as the game itself, so it works with the dummy SDL video driver.
+'frame_rate' is the amount of frames per second of the match's time, frames falling between
+two ticks show the objects at their interpolated positions, same as the game does.
+The look of the frames (colors, fonts) is taken from 'profile', the window size from the replay.
+
+Rasterizing happens in this process, while encoding the frames (PNG compression) and writing them
+to the disk is done by a pool of 'worker_count' processes, so that the two overlap.
+The frames waiting for the workers are held in a bounded queue: once 'max_pending_frames' of them
+are waiting, rendering pauses until the oldest one has been written, which caps the memory used."""
+class FrameExporter:
+    def __init__(self,
+                 profile: GameProfile = DEFAULT_PROFILE,
+                 frame_rate: float = 60,
+                 frame_format: str = "png",
+                 compression_level: int = 6,
+                 worker_count: int = None,
+                 max_pending_frames: int = None) -> None:
+        if frame_format not in FRAME_FORMATS:
+            raise ValueError(f"Unknown frame format '{frame_format}', available: {', '.join(FRAME_FORMATS)}")
+
+        self._profile = profile._replace(**{option: getattr(DEFAULT_PROFILE, option) for option in PHYSICS_OPTIONS})
+        self._frame_rate = frame_rate
+        self._frame_format = frame_format
+        self._compression_level = compression_level
+        # Defaults to the amount of CPU cores
+        self._worker_count = worker_count if worker_count is not None else multiprocessing.cpu_count()
+        # Enough frames to keep every worker busy while the next frames are being rendered
+        self._max_pending_frames = max_pending_frames if max_pending_frames is not None else self._worker_count * 2
+
+
+    """Render the ticks from 'first_tick' up to 'last_tick' (the whole replay by default) into 'output_directory'
+    The frames are saved as frame_000000.png, frame_000001.png, ... (or .rgb for raw frames)
+    'on_frame' is called with the index of every frame once it has been rendered
+    Returns the amount of exported frames"""
+    def export(self,
+               replay: Replay,
+               output_directory: str,
+               first_tick: int = 0,
+               last_tick: int = None,
+               on_frame: Callable[[int], None] = None) -> int:
+        os.makedirs(output_directory, exist_ok=True)
+        tick_count = replay.get_tick_count()
+        last_tick = tick_count if last_tick is None else max(first_tick, min(last_tick, tick_count))
+
+        # No point in spawning processes for a single worker
+        if self._worker_count <= 1:
+            return self._export(replay, output_directory, first_tick, last_tick, on_frame, None)
+
+        # The pool is created before the game, so that the workers don't inherit its resources
+        with multiprocessing.Pool(self._worker_count) as pool:
+            return self._export(replay, output_directory, first_tick, last_tick, on_frame, pool)
+
+
+
+    def get_frame_rate(self) -> float:
+        return self._frame_rate
+
+
+    def get_frame_format(self) -> str:
+        return self._frame_format
+
+
+    # Renders the frames and hands them over to the pool (or writes them right away without one)
+    def _export(self,
+                replay: Replay,
+                output_directory: str,
+                first_tick: int,
+                last_tick: int,
+                on_frame: Callable[[int], None] | None,
+                pool: multiprocessing.pool.Pool | None) -> int:
+        game = GameInstance()
+        game.start_offscreen(self._profile._replace(
+            window_width=replay.window_size[0],
+            window_height=replay.window_size[1],
+            seed=replay.seed,
+            swept_collisions=replay.swept_collisions
+        ))
+        player = ReplayPlayer(replay, simulation=game.get_simulation())
+        player.seek(first_tick)
+
+        window = game.get_window()
+        size = window.get_size()
+        ticks_per_frame = 1 / (self._frame_rate * replay.delta_time)
+        extension = FRAME_FORMATS[self._frame_format]
+        pending_frames = deque()
+
+        frame_index = 0
+        while True:
+            # Moment of the match the frame shows, measured in ticks
+            # (the small tolerance keeps rounding errors from skipping past a tick)
+            frame_position = first_tick + frame_index * ticks_per_frame
+            if frame_position > last_tick + 1e-6:
+                break
+            # The simulation has to be at the first tick at or after the frame's moment
+            frame_tick = math.ceil(frame_position - 1e-6)
+            while player.get_tick() < frame_tick:
+                player.step()
+
+            # How far between the previous tick and the current one the frame is
+            alpha = 1.0 if frame_tick == 0 else min(1.0, max(0.0, frame_position - (frame_tick - 1)))
+            game.render(alpha)
+
+            task = (os.path.join(output_directory, f"frame_{frame_index:06d}{extension}"),
+                    self._frame_format, size, pygame.image.tobytes(window.get_surface(), "RGB"),
+                    self._compression_level)
+            if pool is None:
+                _write_frame(task)
+            else:
+                # Wait for the oldest frame once the queue is full,
+                # which also raises any error that has happened while writing it
+                if len(pending_frames) >= self._max_pending_frames:
+                    pending_frames.popleft().get()
+                pending_frames.append(pool.apply_async(_write_frame, (task,)))
+
+            if on_frame is not None:
+                on_frame(frame_index)
+            frame_index += 1
+
+        while len(pending_frames) > 0:
+            pending_frames.popleft().get()
+        return frame_index
+
+
+# Encodes the frame and writes it to its file inside of a worker process
+# Defined at the top level of the module so that it can be pickled
+def _write_frame(task: tuple) -> None:
+    path, frame_format, size, pixels, compression_level = task
+    if frame_format == "png":
+        pixels = _encode_png(size, pixels, compression_level)
+
+    with open(path, "wb") as frame_file:
+        frame_file.write(pixels)
+
+
+# Encodes 24-bit RGB pixels into a PNG image
+def _encode_png(size: Tuple[int, int], pixels: bytes, compression_level: int) -> bytes:
+    width, height = size
+    stride = width * 3
+
+    # Every row of the image data starts with the type of its filter, 0 (none)
+    image_data = bytearray((stride + 1) * height)
+    for row in range(height):
+        row_start = row * (stride + 1) + 1
+        image_data[row_start:row_start + stride] = pixels[row * stride:(row + 1) * stride]
+
+    # Width, height, bit depth, color type (2 = RGB), compression, filter and interlace method
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return PNG_SIGNATURE + \
+           _png_chunk(b"IHDR", header) + \
+           _png_chunk(b"IDAT", zlib.compress(image_data, compression_level)) + \
+           _png_chunk(b"IEND", b"")
+
+
+# Wraps the data into a PNG chunk (length, type, data, CRC)
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
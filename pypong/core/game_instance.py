@@ -1,67 +1,128 @@
+import os
 import random
 import time
+from typing import TYPE_CHECKING, Tuple
 import pygame
 # Importing everything directly because this file contains the entry point
 # of the entire package (game) and the project is small enough
 # that the extra verbosity of typing out the entire module path
 # is redundant 
+from pypong.core.compositor import LayeredCompositor
+from pypong.core.config import DEFAULT_PROFILE, GameProfile
+from pypong.core.dirty_rect_renderer import DirtyRectRenderer
 from pypong.core.game_stats import GameState, GameStats, PlayerIndex
 from pypong.core.game_window import GameWindow
+from pypong.core.simulation import PaddleDirection, Simulation
+from pypong.core.state_machine import GameStateMachine, StateHandler, UpdatePolicy
 from pypong.core.ui import Text, UIManager
+from pypong.gameplay.ball import Ball
 from pypong.gameplay.game_object import GameObject
-from pypong.gameplay.ball import Ball 
-
-
-# Color constants for each kind of object in the game
-# for ease of use and easy customizability
-COLOR_TITLE_CARD = (255, 237, 38)
-COLOR_IMPORTANT_PROMPT = (255, 255, 255)
-COLOR_PROMPT = (150, 150, 150)
-COLOR_GAME_OBJECT = (150, 150, 150)
-COLOR_SCORE = (77, 77, 77)
-COLOR_BACKGROUND = (0, 0, 0)
-
-
-# Constants for the font sizes used for different kinds
-# of text in the game, again in the name of ease of use,
-# consistency and customizability
-TITLE_TEXT_FONT_SIZE = 72
-SCORE_TEXT_FONT_SIZE = 48
-PROMPT_TEXT_FONT_SIZE = 28
+# The accelerated rendering backend is only imported when it's used (see start()),
+# it pulls in pygame's SDL2 video bindings which most starts don't need
+# The same goes for the optional features (controllers, instrumentation, replays, the simulation thread
+# and the offscreen window), they're imported by the methods that enable them
+if TYPE_CHECKING:
+    from pypong.core.accelerated_window import AcceleratedGameWindow
+    from pypong.core.headless import Policy
+    from pypong.core.instrumentation import FrameProfiler
+    from pypong.core.offscreen_window import OffscreenWindow
+    from pypong.core.replay import Replay, ReplayRecorder
+    from pypong.core.simulation_thread import SimulationThread
+
+
+# The colors, the font sizes and the rest of the customizable options
+# live in the GameProfile (see pypong.core.config)
+
+# Options of the frame time overlay (shown when instrumentation is enabled)
+# The overlay's text is refreshed this many times per second to keep it readable
+HUD_REFRESH_RATE = 4
+# Methods of the Simulation measured by the instrumentation
+# They aren't measured while the simulation runs on its own thread, the stages are timed by the main thread
+SIMULATION_STAGES = ("_move_paddle", "_move_balls", "_move_balls_swept", "_handle_collisions", "_evaluate_score")
 
 
 # Game options
-PADDLE_SIZE = (20, 125)
-PADDLE_SPEED = 200.0
-PADDLE_X_OFFSET = 25
-
-BALL_SIZE = (25, 25)
-BALL_SPEED = 235.0
-
 CENTER_LINE_WIDTH = 3
 
+# Default of the options of start() that are taken from its profile unless they're passed explicitly
+# (None is a meaningful value for some of them, so it can't be used to tell them apart)
+_FROM_PROFILE = object()
+
 
 """Class representing the entry point of the entire package (game)
 Contains the game loop as well as the game logic, along with all parts
 necessary to make it work"""
 class GameInstance:
-    """Initializes the game, window and all of the game's resources, priming it for playing"""
-    def start(self, window_width: int, window_height: int, window_caption: str) -> None:
-        # Init pygame
-        pygame.init()
+    """Initializes the game, window and all of the game's resources, priming it for playing
+    'seed' seeds the ball launches, if it's None the current time is used instead
+    'vsync' synchronizes showing the rendered frames with the display's refresh rate
+    'accelerated' renders the game through SDL's Renderer (see AcceleratedGameWindow) instead of
+    blitting in software, 'render_driver' picks the SDL render driver it uses (eg. "software")
+    'profile' provides the rest of the options (colors, fonts, physics, caching),
+    the window and the arguments above take precedence over its values,
+    the arguments that aren't passed are taken from the profile"""
+    def start(self,
+              window_width: int,
+              window_height: int,
+              window_caption: str,
+              seed: int | None = _FROM_PROFILE,
+              vsync: bool = _FROM_PROFILE,
+              accelerated: bool = _FROM_PROFILE,
+              render_driver: str | None = _FROM_PROFILE,
+              profile: GameProfile = DEFAULT_PROFILE) -> None:
+        overrides = {"seed": seed, "vsync": vsync, "accelerated": accelerated, "render_driver": render_driver}
+        self._profile = profile._replace(
+            window_width=window_width,
+            window_height=window_height,
+            window_caption=window_caption,
+            **{name: value for name, value in overrides.items() if value is not _FROM_PROFILE}
+        )
+        profile = self._profile
+
+        # The video driver has to be picked before the display is initialized
+        if profile.video_driver is not None:
+            os.environ["SDL_VIDEODRIVER"] = profile.video_driver
+
+        # Init pygame, either all of it or just the parts the game uses
+        if profile.fast_startup:
+            pygame.display.init()
+            pygame.font.init()
+        else:
+            pygame.init()
         
         # Create and init window
-        self._window = GameWindow(window_width, window_height, window_caption)
-        
-        # Init game stats
-        self._game_stats = GameStats()
+        if profile.accelerated:
+            from pypong.core.accelerated_window import AcceleratedGameWindow
+            self._window = AcceleratedGameWindow(window_width, window_height, window_caption,
+                                                 profile.vsync, profile.render_driver)
+        else:
+            self._window = GameWindow(window_width, window_height, window_caption, profile.vsync)
         
         # Load the game's resources
-        self._init_resources()
+        self._init_resources(profile.seed)
+
+
+    """Initializes the game with all of the options taken from the provided GameProfile"""
+    def start_from_profile(self, profile: GameProfile) -> None:
+        self.start(profile.window_width, profile.window_height, profile.window_caption, profile.seed,
+                   profile.vsync, profile.accelerated, profile.render_driver, profile)
+
+
+    """Initializes the game without a window, every frame is rendered into the Surface of an OffscreenWindow
+    Only pygame's font subsystem is initialized, so no display is needed (eg. for exporting frames)
+    The options are taken from the provided GameProfile, the ones of the window and the game loop are ignored
+    except for the window's size"""
+    def start_offscreen(self, profile: GameProfile = DEFAULT_PROFILE) -> None:
+        from pypong.core.offscreen_window import OffscreenWindow
+        self._profile = profile
+        pygame.font.init()
+        self._window = OffscreenWindow(profile.window_width, profile.window_height, profile.window_caption)
+        self._init_resources(profile.seed)
 
 
     """Stops the game and cleans up everything"""
     def quit(self) -> None:
+        self.stop_simulation_thread()
         pygame.quit()
 
 
@@ -72,124 +133,346 @@ class GameInstance:
         # or the user pressing ESC) quit out of the game because there's
         # no point in finishing this iteration of the game loop since the game
         # will stop and quit next frame anyway
-        event_result = self._handle_events()
+        event_result = self.process_events()
         if event_result == -1:
             return event_result
 
-        # Cache the window's Surface for rendering purposes 
-        window_surface = self._window.get_surface()
-        
-        # Core game loop
-        # Choose what happens depending on the current state of the game
-        match(self._game_stats.current_game_state):
-            # Display the start screen
-            case GameState.GAME_START:
-                window_surface.fill(COLOR_BACKGROUND)
-                self._render_start_screen()
-            
-            # Display instructions on how to start the round
-            # along with the playing field and score
-            case GameState.ROUND_START:
-                window_surface.fill(COLOR_BACKGROUND)
-                self._render_score_counter()
-                self._render_paddles()
-                self._render_ball()
-                self._render_round_start_prompt()
-
-            # Main game logic. Move the paddles based on player input,
-            # move the ball, see who scored
-            case GameState.ROUND_IN_PROGRESS:
-                self._handle_input(delta_time)
-                self._move_ball(delta_time)
-                self._handle_collisions()
-                self._evaluate_score()
-                window_surface.fill(COLOR_BACKGROUND)
-                self._render_score_counter()
-                self._render_paddles()
-                self._render_ball()
-                pass
-
-            # Display who won the current round and instructions
-            # on how to begin the next round
-            case GameState.ROUND_END:
-                window_surface.fill(COLOR_BACKGROUND)
-                self._render_score_counter()
-                self._render_paddles()
-                self._render_ball()
-                self._render_round_end_prompt()
-                pass
-
-        # Switch swapchain buffers and show rendered Surfaces to the screen
-        pygame.display.update()
+        self.update(delta_time)
+        self.render()
+        return event_result
+
+
+    """Handles pygame's events (quitting, advancing the game using SPACE)
+    If the game is idle (see is_idle()) and there are no events, it waits up to 'wait_timeout'
+    seconds for an event to arrive, instead of returning right away
+    While the simulation runs on its own thread (see start_simulation_thread()), it always waits,
+    since the physics don't depend on it, and the input is forwarded to the thread right away
+    Returns -1 if the game should quit"""
+    def process_events(self, wait_timeout: float = 0.0) -> int:
+        events = pygame.event.get()
+        if len(events) == 0 and wait_timeout > 0.0 and (self._simulation_thread is not None or self.is_idle()):
+            # Sleeps until an event arrives, without using the CPU in the meantime
+            event = pygame.event.wait(max(1, int(wait_timeout * 1000)))
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+
+        event_result = self._handle_events(events)
+        if self._simulation_thread is not None:
+            self._simulation_thread.set_directions(*self._read_keyboard())
         return event_result
 
 
+    """Advances the game logic by delta_time seconds
+    Not available while the simulation runs on its own thread"""
+    def update(self, delta_time: float) -> None:
+        if self._simulation_thread is not None:
+            raise RuntimeError("The game is updated by its simulation thread")
+        self._sync_state()
+
+        # Main game logic. Move the paddles based on player input,
+        # move the ball, see who scored
+        directions = (PaddleDirection.NONE, PaddleDirection.NONE)
+        if self._state_machine.get_handler().update_policy == UpdatePolicy.CONTINUOUS:
+            directions = self._handle_input()
+            self._simulation.step(delta_time, *directions)
+
+        if self._recorder is not None:
+            if delta_time != self._recorder.get_replay().delta_time:
+                raise ValueError("Recording a replay requires updating the game with a fixed delta_time")
+            self._recorder.record_tick(directions[0], directions[1], self._advances_since_update)
+        self._advances_since_update = 0
+
+
+    """Start recording the inputs of every update into a replay
+    The game must be updated with the provided (fixed) delta_time while recording,
+    eg. by a FixedTimestepLoop. The replay starts from the current state of the game,
+    so recording should be started before the first update.
+    Returns the ReplayRecorder, whose replay can be saved at any point"""
+    def start_recording(self, delta_time: float) -> "ReplayRecorder":
+        from pypong.core.replay import ReplayRecorder
+        # Replays don't store the physics options or the layout of the playing field,
+        # they're always played back with the default ones
+        if not self._simulation.has_default_physics():
+            raise ValueError("Only games using the default paddle and ball sizes and speeds, "
+                             "a single ball and no obstacles can be recorded")
+        self._recorder = ReplayRecorder(self._seed, delta_time, self._window.get_size(),
+                                        self._simulation.has_swept_collisions())
+        self._advances_since_update = 0
+        return self._recorder
+
+
+    """Stop recording the replay
+    Returns the recorded Replay (or None if the game wasn't being recorded)"""
+    def stop_recording(self) -> "Replay | None":
+        if self._recorder is None:
+            return None
+
+        replay = self._recorder.get_replay()
+        self._recorder = None
+        return replay
+
+
+    """Renders the current frame and shows it on the screen
+    'alpha' is how far (0.0 - 1.0) between the last two updates the frame is.
+    The moving objects are drawn at the position interpolated between those updates,
+    which keeps the motion smooth when the game is rendered more often than it is updated
+    While the simulation runs on its own thread, the newest state it has published is rendered
+    and 'alpha' is ignored, the time since that state's tick is used instead"""
+    def render(self, alpha: float = 1.0) -> None:
+        self._sync_state()
+        game_state = self._game_stats.current_game_state
+        is_continuous = self._state_machine.get_handler().update_policy == UpdatePolicy.CONTINUOUS
+        if self._simulation_thread is not None:
+            alpha = min(1.0, (time.perf_counter() - self._frame_time) / self._simulation_thread.get_tick_time())
+
+        # The screen of a state that only changes on events has already been shown,
+        # it's only rendered again if something has happened to the window
+        if not is_continuous and not self._needs_redraw:
+            if self._profiler is not None:
+                self._profiler.discard_frame()
+            return
+        self._needs_redraw = False
+
+        # Nothing moves outside of a round, so there's nothing to interpolate
+        self._render_alpha = alpha if is_continuous else 1.0
+
+        # Only repaint the parts of the window that have changed since the last frame
+        # The prompts and the score only change together with the game state or the score,
+        # in which case the renderer repaints the whole window
+        renderer = self._renderer
+        renderer.track("player_one", self._get_render_rect(self._player_one))
+        renderer.track("player_two", self._get_render_rect(self._player_two))
+        for ball_index, ball in enumerate(self._balls):
+            renderer.track(("ball", ball_index), self._get_render_rect(ball))
+        if self._profiler is not None and self._show_overlay:
+            self._update_overlay()
+        renderer.present((game_state, self._game_stats.score), lambda: self._render_scene(game_state))
+
+        if self._profiler is not None:
+            self._profiler.end_frame()
+
+
+    """Start measuring how long each frame and each stage of the game loop takes
+    (events, input, physics, each _render_* method and the display update)
+    'frame_budget' is the time (in seconds) a frame is supposed to take, frames taking
+    longer are counted as dropped. If 'show_overlay' is set, the frame times are drawn
+    in the top left corner of the window.
+    The physics stages aren't measured while the simulation runs on its own thread
+    (see start_simulation_thread()), only the frames of the main thread are.
+    Returns the FrameProfiler holding the measurements"""
+    def enable_instrumentation(self, frame_budget: float = 1 / 60, show_overlay: bool = True) -> "FrameProfiler":
+        if self._profiler is not None:
+            return self._profiler
+
+        from pypong.core.instrumentation import FrameProfiler
+        profiler = FrameProfiler(frame_budget)
+        profiler.instrument(self, (
+            "_handle_events",
+            "_handle_input",
+            "_render_start_screen",
+            "_render_round_start_prompt",
+            "_render_round_end_prompt",
+            "_render_paddles",
+            "_render_balls",
+            "_render_score_counter"
+        ))
+        if self._simulation_thread is None:
+            profiler.instrument(self._simulation, SIMULATION_STAGES)
+        profiler.instrument(self._renderer, ("_update_display",))
+
+        self._profiler = profiler
+        self._show_overlay = show_overlay
+        if show_overlay:
+            self._ui.load_font("hud", self._profile.font_path, self._profile.hud_font_size)
+        return profiler
+
+
+    def get_profiler(self) -> "FrameProfiler | None":
+        return self._profiler
+
+
+    """Whether the game is in a state that only changes in response to events (eg. the start screen)
+    There's nothing to update or render in such a state until an event arrives"""
+    def is_idle(self) -> bool:
+        self._sync_state()
+        # A SPACE press the simulation thread hasn't got to yet is about to change the state
+        if self._simulation_thread is not None and self._simulation_thread.has_pending_advances():
+            return False
+        return self._state_machine.get_handler().update_policy == UpdatePolicy.ON_EVENT
+
+
+    """Step the simulation on its own thread at 'tick_rate' ticks per second (see SimulationThread)
+    From then on the main thread only handles the events, forwards the input to the simulation thread
+    and renders the newest state published by it, so a slow frame never holds up the physics
+    or the input of the next tick. The game has to be driven by a loop that doesn't call update(),
+    eg. a ThreadedLoop, and the Simulation mustn't be touched until the thread is stopped.
+    Returns the running SimulationThread"""
+    def start_simulation_thread(self, tick_rate: int = 120, max_frame_time: float = 0.25) -> "SimulationThread":
+        if self._simulation_thread is not None:
+            return self._simulation_thread
+
+        from pypong.core.simulation_thread import SimulationThread
+        # The frames are rendered from copies of the objects, loaded from the states published by the thread
+        color = self._profile.color_game_object
+        self._player_one = GameObject(self._player_one.get_position(), self._player_one.get_scale(), color)
+        self._player_two = GameObject(self._player_two.get_position(), self._player_two.get_scale(), color)
+        self._balls = [Ball(ball.get_position(), ball.velocity, ball.get_scale(), color) for ball in self._balls]
+        self._ball = self._balls[0]
+        self._game_stats = GameStats()
+
+        # The stages of the simulation would be measured on the simulation thread,
+        # while the main thread is ending the frames they're added to
+        if self._profiler is not None:
+            self._profiler.uninstrument(self._simulation, SIMULATION_STAGES)
+
+        self._simulation_thread = SimulationThread(self._simulation, self._tick_on_simulation_thread,
+                                                   tick_rate, max_frame_time)
+        self._load_newest_frame()
+        self._simulation_thread.start()
+        return self._simulation_thread
+
 
-    def get_window(self) -> GameWindow:
+    """Stop the simulation thread (if it's running) and go back to updating the game in update()"""
+    def stop_simulation_thread(self) -> None:
+        if self._simulation_thread is None:
+            return
+
+        self._simulation_thread.stop()
+        self._simulation_thread = None
+        self._shown_frame = None
+        self._player_one = self._simulation.get_player_one()
+        self._player_two = self._simulation.get_player_two()
+        self._ball = self._simulation.get_ball()
+        self._balls = self._simulation.get_balls()
+        self._game_stats = self._simulation.get_game_stats()
+        if self._profiler is not None:
+            self._profiler.instrument(self._simulation, SIMULATION_STAGES)
+
+
+    """Let the provided Policy (eg. a CpuPlayer) control the player's paddle instead of the keyboard
+    Passing None gives the control back to the keyboard"""
+    def set_controller(self, player: PlayerIndex, controller: "Policy | None") -> None:
+        self._controllers[player - 1] = controller
+
+
+
+    def get_window(self) -> "GameWindow | AcceleratedGameWindow | OffscreenWindow":
         return self._window
 
 
+    """Returns the statistics of the game being shown
+    While the simulation runs on its own thread, that's a copy of the ones of the newest published state"""
     def get_game_stats(self) -> GameStats:
         return self._game_stats
 
 
+    def get_simulation_thread(self) -> "SimulationThread | None":
+        return self._simulation_thread
+
+
+    def get_simulation(self) -> Simulation:
+        return self._simulation
+
+
+    """Seed of the random number generator used for the ball launches"""
+    def get_seed(self) -> int:
+        return self._seed
+
+
+    """Options the game has been started with"""
+    def get_profile(self) -> GameProfile:
+        return self._profile
+
+
     # Creates and initializes all of the resources required by the game to work
-    def _init_resources(self):
-        # Initialize pseudo-random number generator
-        random.seed(time.time() * 1000)
+    def _init_resources(self, seed: int = None):
+        # Initialize the game's own pseudo-random number generator
+        # (instead of seeding the global one) so that several games
+        # can run in the same process without affecting each other
+        self._seed = seed if seed is not None else int(time.time() * 1000)
+        self._rng = random.Random(self._seed)
         
+        profile = self._profile
         # Load the font in all of the desired font sizes 
         # for the different Text objects in the game
         self._ui = UIManager([
-            ("title", "res/ka1.ttf", TITLE_TEXT_FONT_SIZE),
-            ("prompt", "res/ka1.ttf", PROMPT_TEXT_FONT_SIZE), 
-            ("score", "res/ka1.ttf", SCORE_TEXT_FONT_SIZE)
-        ])
+            ("title", profile.font_path, profile.title_font_size),
+            ("prompt", profile.font_path, profile.prompt_font_size), 
+            ("score", profile.font_path, profile.score_font_size)
+        ], profile.text_cache_size, profile.use_glyph_atlas)
         
-        window_size = self._window.get_size()
-        # Player one pos:
-        # Since the left part of the screen is 0, add 1/2 of paddle width
-        # to the border (so that the center of the paddle is properly placed)
-        # and further offset it from the window border by the specified X offset 
-        player_one_pos = [
-            0 + PADDLE_SIZE[0] / 2 + PADDLE_X_OFFSET,
-            window_size[1] / 2 - PADDLE_SIZE[1] / 2    
-        ]
-        # Player two pos:
-        # Since the right part of the screen is the specified screen resolution width,   
-        # subtract 1/2 of paddle width from the right border 
-        # (so that the center of the paddle is properly placed) and further offset it 
-        # by the specified X offset so that there's a bit of space between it 
-        # and the side of the window
-        player_two_pos = [
-            window_size[0] - PADDLE_SIZE[0] * 1.5 - PADDLE_X_OFFSET,
-            window_size[1] / 2 - PADDLE_SIZE[1] / 2    
-        ]
-
-        # Ball pos:
-        # Move the center of the ball Surface (BALL_SIZE / 2) to the center of the screen 
-        ball_pos = [
-            window_size[0] / 2 - BALL_SIZE[0] / 2,
-            window_size[1] / 2 - BALL_SIZE[1] / 2,
-        ]
-
-        # Initialize the actual GameObjects
-        self._player_one = GameObject(player_one_pos, PADDLE_SIZE, COLOR_GAME_OBJECT)
-        self._player_two = GameObject(player_two_pos, PADDLE_SIZE, COLOR_GAME_OBJECT)
-        self._ball = Ball(ball_pos, [0.0, 0.0], BALL_SIZE, COLOR_GAME_OBJECT)
-
-
-    # Handles all of the pygame library events, such as whether to quit the game etc.
+        # Create the paddles and the ball. The physics and the rules of the game
+        # live in the Simulation so that they can also be run without a window
+        self._simulation = Simulation(self._window.get_size(), profile.color_game_object, self._rng,
+                                      profile.swept_collisions, profile.paddle_size, profile.paddle_speed,
+                                      profile.ball_size, profile.ball_speed, profile.ball_count,
+                                      profile.obstacles)
+        self._player_one = self._simulation.get_player_one()
+        self._player_two = self._simulation.get_player_two()
+        self._ball = self._simulation.get_ball()
+        self._balls = self._simulation.get_balls()
+        # Statistics of the game being shown, the Simulation's own ones unless it runs on its own thread
+        self._game_stats = self._simulation.get_game_stats()
+        # Policies controlling the paddles, None means the paddle is controlled by the keyboard
+        self._controllers = [None, None]
+
+        # Thread stepping the simulation, None while the game is updated by update()
+        # (see start_simulation_thread()) and the frame of the thread that's being shown
+        self._simulation_thread = None
+        self._shown_frame = None
+        self._frame_time = 0.0
+
+        # Renderer that keeps track of which parts of the window need to be repainted
+        # (the accelerated and the offscreen windows repaint all of it every frame instead)
+        if isinstance(self._window, GameWindow):
+            self._renderer = DirtyRectRenderer(self._window)
+        else:
+            from pypong.core.texture_renderer import TextureRenderer
+            self._renderer = TextureRenderer(self._window)
+        # Cache of the pre-rendered static parts of the frame
+        self._compositor = LayeredCompositor(self._window, profile.layer_cache_size)
+        self._render_alpha = 1.0
+
+        # Replay recording, disabled until start_recording() is called
+        self._recorder = None
+        # Amount of times the game was advanced (SPACE) since the last update
+        self._advances_since_update = 0
+
+        # What the game does and displays in each of its states
+        # Whether the window has to be rendered again, only used by the states that change on events
+        self._needs_redraw = True
+        self._state_machine = GameStateMachine({
+            GameState.GAME_START: StateHandler(UpdatePolicy.ON_EVENT, self._render_start_screen_layer,
+                                               shows_playing_field=False, on_enter=self._request_redraw),
+            GameState.ROUND_START: StateHandler(UpdatePolicy.ON_EVENT, self._render_round_start_layer,
+                                                on_enter=self._request_redraw),
+            GameState.ROUND_IN_PROGRESS: StateHandler(UpdatePolicy.CONTINUOUS, self._render_round_in_progress_layer),
+            GameState.ROUND_END: StateHandler(UpdatePolicy.ON_EVENT, self._render_round_end_layer,
+                                              on_enter=self._request_redraw)
+        }, self._game_stats.current_game_state)
+
+        # Frame time instrumentation, disabled until enable_instrumentation() is called
+        self._profiler = None
+        self._show_overlay = False
+        self._overlay_lines = []
+        self._overlay_area = pygame.Rect(0, 0, 0, 0)
+        self._overlay_refresh_time = 0.0
+
+
+    # Handles all of the provided pygame library events, such as whether to quit the game etc.
     # Returns the result of pygame events. If pygame.QUIT is encountered, return -1
     # so that the user program knows to stop running the game and exit
-    def _handle_events(self) -> int:
-        # Queue of all events that have occured last frame
-        events = pygame.event.get()
+    def _handle_events(self, events: list[pygame.event.Event]) -> int:
         for event in events:
             match(event.type):
                 # Game window "X" button pressed
                 case pygame.QUIT:
                     return -1
+
+                # The window has been uncovered or restored, its contents have to be shown again
+                case pygame.WINDOWEXPOSED | pygame.WINDOWRESTORED:
+                    self._renderer.invalidate()
+                    self._request_redraw()
                 
                 case pygame.KEYDOWN:
                     match(event.key):
@@ -200,141 +483,226 @@ class GameInstance:
                         # Handle game state switching relative to whichever state
                         # the game is currently in
                         case pygame.K_SPACE:
-                            # Caching the state here to make the following conditionals
-                            # a bit more readable and less cluttered
-                            current_game_state = self._game_stats.current_game_state
-
-                            # Advance the game to the start of the round                            
-                            if current_game_state == GameState.GAME_START:
-                                self._game_stats.current_game_state = GameState.ROUND_START
-                            
-                            # Start the actual gameplay                            
-                            if current_game_state == GameState.ROUND_START:
-                                # Give the ball some velocity so that it actually moves around
-                                # Randomize it a bit so that it always starts a bit unexpectedly
-                                x_velocity_sign = random.randint(-1, 2)
-                                x_velocity_multiplier = 1 if x_velocity_sign == 0 else x_velocity_sign
-                                y_velocity_sign = random.randint(-1, 2)
-                                y_velocity_multiplier = 1 if y_velocity_sign == 0 else y_velocity_sign 
-
-                                self._ball.velocity = [BALL_SPEED * x_velocity_multiplier, BALL_SPEED * y_velocity_multiplier]
-                                self._game_stats.current_game_state = GameState.ROUND_IN_PROGRESS
-
-                            # Reset all of the objects' positions and start a new round
-                            if current_game_state == GameState.ROUND_END:
-                                self._player_one.reset()
-                                self._player_two.reset()
-                                self._ball.reset()
-                                self._game_stats.current_game_state = GameState.ROUND_START
+                            # The simulation thread applies the press in its next tick
+                            if self._simulation_thread is not None:
+                                self._simulation_thread.request_advance()
+                                continue
+
+                            # A replay can only hold so many advances per update,
+                            # any extra presses are ignored to keep the replay in sync
+                            if self._recorder is not None:
+                                from pypong.core.replay import MAX_ADVANCES_PER_TICK
+                                if self._advances_since_update >= MAX_ADVANCES_PER_TICK:
+                                    continue
+                                self._advances_since_update += 1
+
+                            self._simulation.advance_state()
 
         return 1
 
 
-    # Detects and handles player input (both players), moves the respective paddles
-    def _handle_input(self, delta_time: float):
+    # Picks up the changes of the game state made by the Simulation (SPACE, someone scoring)
+    def _sync_state(self) -> None:
+        if self._simulation_thread is not None:
+            self._load_newest_frame()
+        self._state_machine.sync(self._game_stats.current_game_state)
+
+
+    # Loads the newest state published by the simulation thread into the copies of the objects that are rendered
+    def _load_newest_frame(self) -> None:
+        frame = self._simulation_thread.get_newest_frame()
+        # The thread hands out a different frame for every new state
+        if frame is self._shown_frame:
+            return
+        self._shown_frame = frame
+        self._frame_time = frame.time
+
+        self._player_one.load_state(frame.player_one)
+        self._player_two.load_state(frame.player_two)
+        for ball, ball_state in zip(self._balls, frame.balls):
+            ball.load_state(ball_state)
+        self._game_stats.score = frame.game_stats.score
+        self._game_stats.current_game_state = frame.game_stats.current_game_state
+        self._game_stats.player_who_last_scored = frame.game_stats.player_who_last_scored
+
+
+    # Advances the game by a single tick on the simulation thread (see start_simulation_thread())
+    # Does the same as update(), with the keyboard and the SPACE presses forwarded by the main thread
+    def _tick_on_simulation_thread(self,
+                                   delta_time: float,
+                                   keyboard_directions: Tuple[PaddleDirection, PaddleDirection],
+                                   advance_count: int) -> None:
+        simulation = self._simulation
+        # A replay can only hold so many advances per update, any extra presses are ignored
+        if self._recorder is not None:
+            from pypong.core.replay import MAX_ADVANCES_PER_TICK
+            advance_count = min(advance_count, MAX_ADVANCES_PER_TICK)
+        for _ in range(advance_count):
+            simulation.advance_state()
+
+        directions = (PaddleDirection.NONE, PaddleDirection.NONE)
+        if simulation.get_game_stats().current_game_state == GameState.ROUND_IN_PROGRESS:
+            directions = self._apply_controllers(keyboard_directions)
+            simulation.step(delta_time, *directions)
+
+        if self._recorder is not None:
+            if delta_time != self._recorder.get_replay().delta_time:
+                raise ValueError("Recording a replay requires updating the game with a fixed delta_time")
+            self._recorder.record_tick(directions[0], directions[1], advance_count)
+
+
+    # Makes the next render() call render the window, even in the states that change on events only
+    def _request_redraw(self) -> None:
+        self._needs_redraw = True
+
+
+    # Detects player input (both players) and translates it into the directions
+    # in which the respective paddles should move
+    # Paddles with a controller set are moved by the controller instead
+    def _handle_input(self) -> Tuple[PaddleDirection, PaddleDirection]:
+        return self._apply_controllers(self._read_keyboard())
+
+
+    # Translates the pressed keys of both players into the directions of their paddles
+    def _read_keyboard(self) -> Tuple[PaddleDirection, PaddleDirection]:
         pressed_keys = pygame.key.get_pressed()
+        return (
+            # Player one (left paddle)
+            PaddleDirection(pressed_keys[pygame.K_s] - pressed_keys[pygame.K_w]),
+            # Player two (right paddle)
+            PaddleDirection(pressed_keys[pygame.K_DOWN] - pressed_keys[pygame.K_UP])
+        )
 
+
+    # Replaces the directions of the paddles that have a controller set with the directions picked by the controllers
+    def _apply_controllers(self, directions: Tuple[PaddleDirection, PaddleDirection]) -> Tuple[PaddleDirection, PaddleDirection]:
+        player_one_controller, player_two_controller = self._controllers
+        if player_one_controller is None and player_two_controller is None:
+            return directions
+
+        player_one_direction, player_two_direction = directions
+        if player_one_controller is not None:
+            player_one_direction = player_one_controller(self._simulation, PlayerIndex.PLAYER_ONE)
+        if player_two_controller is not None:
+            player_two_direction = player_two_controller(self._simulation, PlayerIndex.PLAYER_TWO)
+        return (player_one_direction, player_two_direction)
+
+
+
+    # Returns the area the GameObject is drawn at in the current frame
+    # (its collision rect moved to the interpolated position)
+    def _get_render_rect(self, game_object: GameObject) -> pygame.Rect:
+        position = game_object.get_interpolated_position(self._render_alpha)
+        scale = game_object.get_scale()
+        return pygame.Rect(round(position[0]), round(position[1]), scale[0], scale[1])
+
+
+    # Renders everything that's displayed in the provided game state to the game window screen
+    # The background and the prompts are taken from the cached layer of the current game state,
+    # only the score, the paddles and the ball are drawn on top of it
+    def _render_scene(self, game_state: GameState) -> None:
+        # Cache the window's Surface for rendering purposes 
+        window_surface = self._window.get_surface()
+        # The round end prompt is the only one that depends on anything but the game state
+        # The score isn't a part of the layer since it changes every round,
+        # which would make every layer of a round usable for that round only
+        scene = (game_state, self._game_stats.player_who_last_scored)
+        state_handler = self._state_machine.get_handler()
+        window_surface.blit(self._compositor.get_scene_layer(scene, state_handler.render_layer), (0, 0))
+
+        # The start screen doesn't show the playing field
+        if state_handler.shows_playing_field:
+            self._render_score_counter(window_surface)
+            self._render_paddles(window_surface)
+            self._render_balls(window_surface)
+
+        if self._show_overlay:
+            self._render_overlay()
+
+
+    # The following methods render the static parts of each state (background and prompts) onto its layer
+    # The prompts never overlap the score, the paddles or the ball, so they can be drawn underneath them
+
+    # Display the start screen
+    def _render_start_screen_layer(self, surface: pygame.Surface) -> None:
+        surface.fill(self._profile.color_background)
+        self._render_start_screen(surface)
+
+
+    # Display instructions on how to start the round along with the playing field
+    def _render_round_start_layer(self, surface: pygame.Surface) -> None:
+        surface.blit(self._compositor.get_static_layer("court", self._render_court), (0, 0))
+        self._render_round_start_prompt(surface)
+
+
+    # Display the playing field
+    def _render_round_in_progress_layer(self, surface: pygame.Surface) -> None:
+        surface.blit(self._compositor.get_static_layer("court", self._render_court), (0, 0))
+
+
+    # Display who won the current round and instructions on how to begin the next round
+    def _render_round_end_layer(self, surface: pygame.Surface) -> None:
+        surface.blit(self._compositor.get_static_layer("court", self._render_court), (0, 0))
+        self._render_round_end_prompt(surface)
+
+
+    # Renders the empty playing field (the background, the line separating the two halves
+    # and the obstacles, which never move) onto the layer
+    def _render_court(self, surface: pygame.Surface) -> None:
         window_size = self._window.get_size()
-        
-        player_one_pos = self._player_one.get_position()
-        player_one_scale = self._player_one.get_scale()
-        
-        player_two_pos = self._player_two.get_position()
-        player_two_scale = self._player_two.get_scale()
-
-        # Player one (left paddle)
-        if pressed_keys[pygame.K_w]:
-            # Ensures that the paddle doesn't go "above" the visible screen
-            if player_one_pos[1] > 0:
-                # Multiply the speed by the current delta_time to ensure
-                # the same speed across all devices, regardless of the game's FPS
-                self._player_one.move((0, -PADDLE_SPEED * delta_time))
-        
-        if pressed_keys[pygame.K_s]:
-            # Ensures that the paddle doesn't go "below" the visible screen
-            # The paddle height must be added on top of the position
-            # because the paddle's origin point is at the top,
-            # not the bottom
-            if player_one_pos[1] + player_one_scale[1] < window_size[1]:
-                self._player_one.move((0, PADDLE_SPEED * delta_time))
-
-        # Player two (right paddle)
-        if pressed_keys[pygame.K_UP]:
-            if player_two_pos[1] > 0:
-                self._player_two.move((0, -PADDLE_SPEED * delta_time))
-        if pressed_keys[pygame.K_DOWN]:
-            if player_two_pos[1] + player_two_scale[1] < window_size[1]:
-                self._player_two.move((0, PADDLE_SPEED * delta_time))
-
-
-    # Moves the ball and ensures that it bounces back from the edges of the screen (if necessary)
-    def _move_ball(self, delta_time: float):
-        window_size = self._window.get_size()
-        ball_pos = self._ball.get_position()
-        # Works as an "alias" for _ball.velocity because it's a reference
-        ball_velocity = self._ball.velocity
-
-        # Revert X velocity if the ball touches either the left or right border of window respectively
-        # (it is necessary to add the ball's width to the right edge check because the origin
-        # of the ball is in the top left corner)
-        if ball_pos[0] <= 0 or ball_pos[0] + BALL_SIZE[0] >= window_size[0]:
-            ball_velocity[0] *= -1
-        # Revert X velocity if the ball touches either the top of bottom edge of window respectively
-        # (same thing for the bottom edge as for the right edge before, just with the ball's height this time)
-        if ball_pos[1] <= 0 or ball_pos[1] + BALL_SIZE[1] >= window_size[1]:
-            ball_velocity[1] *= -1
-
-        # Multiply the velocity by delta_time to make sure that the ball moves by the same speed
-        # across all devices, no matter how fast they are running the game
-        self._ball.move((
-            ball_velocity[0] * delta_time, 
-            ball_velocity[1] * delta_time
-        ))        
-
-
-    # Bounces the ball back if it collides with a paddle
-    def _handle_collisions(self):
-        ball_rect = self._ball.get_rect()
-        if ball_rect.colliderect(self._player_one.get_rect()) or \
-           ball_rect.colliderect(self._player_two.get_rect()):
-           self._ball.velocity[0] *= -1
+        surface.fill(self._profile.color_background)
+
+        # The center line is filled in as a rectangle covering the same pixels as
+        # pygame.draw.line would, because a thick line is rasterized differently
+        # when it's clipped, which would leave seams when repainting dirty areas
+        center_line_rect = pygame.Rect(
+            int(window_size[0] / 2) - (CENTER_LINE_WIDTH - 1) // 2, 0,
+            CENTER_LINE_WIDTH, window_size[1]
+        )
+        surface.fill(self._profile.color_score, center_line_rect)
 
-    
-    # Checks if the ball has moved to the same level as the paddles
-    # If so, it evaluates who has scored a point
-    def _evaluate_score(self):
-        game_stats = self._game_stats
-        score = list(game_stats.score)
-        
-        ball_pos_x = self._ball.get_rect().center[0]
-        player_one_pos_x = self._player_one.get_rect().center[0]
-        player_two_pos_x = self._player_two.get_rect().center[0]
-
-        has_score_changed = False
-        player_who_scored: PlayerIndex = 0
-
-        if ball_pos_x <= player_one_pos_x:
-            score[0] += 1
-            has_score_changed = True
-            player_who_scored = PlayerIndex.PLAYER_TWO
-        elif ball_pos_x >= player_two_pos_x:
-            score[1] += 1
-            has_score_changed = True
-            player_who_scored = PlayerIndex.PLAYER_ONE
-
-        if has_score_changed:
-            game_stats.score = tuple(score)
-            game_stats.player_who_last_scored = player_who_scored
-            game_stats.current_game_state = GameState.ROUND_END
-            self._ball.velocity = [0.0, 0.0]
-
-
-
-    # Renders the start screen to the game window screen
-    def _render_start_screen(self) -> None:
-        title_card: Text = self._ui.draw_text("Py-Pong!", "title", COLOR_TITLE_CARD)
-        space_prompt: Text = self._ui.draw_text("Press SPACE to start", "prompt", COLOR_IMPORTANT_PROMPT)
-        escape_prompt: Text = self._ui.draw_text("Press ESC to quit the game", "prompt", COLOR_IMPORTANT_PROMPT)
+        for obstacle in self._simulation.get_obstacles():
+            surface.blit(obstacle.get_surface(), obstacle.get_rect())
+
+
+    # Refreshes the text of the frame time overlay (a few times per second)
+    # and marks the area it occupies for repainting
+    def _update_overlay(self) -> None:
+        now = time.perf_counter()
+        if now < self._overlay_refresh_time:
+            return
+        self._overlay_refresh_time = now + 1 / HUD_REFRESH_RATE
+
+        frame_statistics = self._profiler.get_frame_statistics()
+        self._overlay_lines = [
+            f"frame {frame_statistics['mean']:.1f} ms",
+            f"p50 {frame_statistics['p50']:.1f} p95 {frame_statistics['p95']:.1f} p99 {frame_statistics['p99']:.1f}",
+            f"dropped {frame_statistics['dropped_frames']}"
+        ]
+
+        # Repaint both the area of the old text and the area of the new one
+        overlay_area = pygame.Rect(0, 0, 0, 0)
+        for line_index, line in enumerate(self._overlay_lines):
+            text = self._ui.draw_text(line, "hud", self._profile.color_prompt)
+            line_area = pygame.Rect((0, line_index * text.line_size), text.size)
+            overlay_area.union_ip(line_area)
+        self._renderer.mark_dirty(self._overlay_area.union(overlay_area))
+        self._overlay_area = overlay_area
+
+
+    # Renders the frame time overlay to the top left corner of the screen
+    def _render_overlay(self) -> None:
+        window_surface = self._window.get_surface()
+        for line_index, line in enumerate(self._overlay_lines):
+            text = self._ui.draw_text(line, "hud", self._profile.color_prompt)
+            window_surface.blit(text.surface, (0, line_index * text.line_size))
+
+
+    # Renders the start screen to the provided Surface
+    def _render_start_screen(self, surface: pygame.Surface) -> None:
+        title_card: Text = self._ui.draw_text("Py-Pong!", "title", self._profile.color_title_card)
+        space_prompt: Text = self._ui.draw_text("Press SPACE to start", "prompt", self._profile.color_important_prompt)
+        escape_prompt: Text = self._ui.draw_text("Press ESC to quit the game", "prompt", self._profile.color_important_prompt)
         
         window_size = self._window.get_size()
         # Center the title card to the middle of the screen and move it up slightly
@@ -356,35 +724,32 @@ class GameInstance:
             space_prompt_pos[1] + space_prompt.line_size
         )
 
-        window_surface = self._window.get_surface()
-        window_surface.blit(title_card.surface, title_card_pos)
-        window_surface.blit(space_prompt.surface, space_prompt_pos)
-        window_surface.blit(escape_prompt.surface, escape_prompt_pos)
+        surface.blit(title_card.surface, title_card_pos)
+        surface.blit(space_prompt.surface, space_prompt_pos)
+        surface.blit(escape_prompt.surface, escape_prompt_pos)
 
 
-    # Renders the start round instruction prompt to the screen
-    def _render_round_start_prompt(self) -> None:
-        window = self._window
-        window_size = window.get_size()
+    # Renders the start round instruction prompt to the provided Surface
+    def _render_round_start_prompt(self, surface: pygame.Surface) -> None:
+        window_size = self._window.get_size()
 
-        prompt = self._ui.draw_text("Press SPACE to start", "prompt", COLOR_IMPORTANT_PROMPT)
+        prompt = self._ui.draw_text("Press SPACE to start", "prompt", self._profile.color_important_prompt)
         # Center the prompt horizontally and place it just above the ball
         prompt_pos = (
             window_size[0] / 2 - prompt.size[0] / 2,
-            self._ball.get_position()[1] - prompt.line_size * 2 
+            self._ball.get_y() - prompt.line_size * 2 
         )
-        window.get_surface().blit(prompt.surface, prompt_pos)
+        surface.blit(prompt.surface, prompt_pos)
     
 
-    # Render who scored and how to start a new round at the end of the current round to the screen
-    def _render_round_end_prompt(self) -> None:
-        window = self._window
-        window_size = window.get_size()
+    # Render who scored and how to start a new round at the end of the current round to the provided Surface
+    def _render_round_end_prompt(self, surface: pygame.Surface) -> None:
+        window_size = self._window.get_size()
         last_player_to_score = self._game_stats.player_who_last_scored
 
-        winner_prompt = self._ui.draw_text(f"Player {int(last_player_to_score)} scored!", "prompt", COLOR_IMPORTANT_PROMPT)
-        space_prompt = self._ui.draw_text("Press SPACE", "prompt", COLOR_PROMPT)
-        new_round_prompt = self._ui.draw_text("to start new round", "prompt", COLOR_PROMPT)
+        winner_prompt = self._ui.draw_text(f"Player {int(last_player_to_score)} scored!", "prompt", self._profile.color_important_prompt)
+        space_prompt = self._ui.draw_text("Press SPACE", "prompt", self._profile.color_prompt)
+        new_round_prompt = self._ui.draw_text("to start new round", "prompt", self._profile.color_prompt)
 
         center_width = window_size[0] / 2
         # Center the winner prompt horizontally and place it slightly above the center of the screen
@@ -403,39 +768,40 @@ class GameInstance:
             space_prompt_pos[1] + space_prompt.line_size
         )
 
-        window.get_surface().blit(winner_prompt.surface, winner_prompt_pos)
-        window.get_surface().blit(space_prompt.surface, space_prompt_pos)
-        window.get_surface().blit(new_round_prompt.surface, new_round_prompt_pos)
+        surface.blit(winner_prompt.surface, winner_prompt_pos)
+        surface.blit(space_prompt.surface, space_prompt_pos)
+        surface.blit(new_round_prompt.surface, new_round_prompt_pos)
 
 
-    # Render the player paddles to the screen, along with the line separating them
-    def _render_paddles(self) -> None:
-        player_one_rect = self._player_one.get_rect()
-        player_two_rect = self._player_two.get_rect()
+    # Render the player paddles to the provided Surface
+    # (the line separating them is a part of the court layer)
+    def _render_paddles(self, surface: pygame.Surface) -> None:
+        player_one_rect = self._get_render_rect(self._player_one)
+        player_two_rect = self._get_render_rect(self._player_two)
         
         player_one_pos = (player_one_rect.x, player_one_rect.y)
         player_two_pos = (player_two_rect.x, player_two_rect.y)
-        
-        window_size = self._window.get_size()
-        window_surface = self._window.get_surface()
 
-        pygame.draw.line(window_surface, COLOR_SCORE, (window_size[0] / 2, 0), (window_size[0] / 2, window_size[1]), CENTER_LINE_WIDTH)
-        window_surface.blit(self._player_one.get_surface(), player_one_pos)
-        window_surface.blit(self._player_two.get_surface(), player_two_pos)
+        surface.blit(self._player_one.get_surface(), player_one_pos)
+        surface.blit(self._player_two.get_surface(), player_two_pos)
 
 
-    # Render the ball to the screen
-    def _render_ball(self) -> None:
-        window_surface = self._window.get_surface()
-        window_surface.blit(self._ball.get_surface(), self._ball.get_position())
+    # Render the balls to the provided Surface
+    def _render_balls(self, surface: pygame.Surface) -> None:
+        # Drawn at the same (rounded) position as the area tracked by the renderer,
+        # blitting at the float position would truncate it and could put the ball
+        # a pixel off from the area that gets repainted
+        for ball in self._balls:
+            ball_rect = self._get_render_rect(ball)
+            surface.blit(ball.get_surface(), (ball_rect.x, ball_rect.y))
 
 
-    # Render the score counter to the screen
-    def _render_score_counter(self) -> None:
+    # Render the score counter to the provided Surface
+    def _render_score_counter(self, surface: pygame.Surface) -> None:
         score = self._game_stats.score
         
-        player_one_score = self._ui.draw_text(str(score[0]), "score", COLOR_SCORE)
-        player_two_score = self._ui.draw_text(str(score[1]), "score", COLOR_SCORE)
+        player_one_score = self._ui.draw_text(str(score[0]), "score", self._profile.color_score)
+        player_two_score = self._ui.draw_text(str(score[1]), "score", self._profile.color_score)
         
         window_size = self._window.get_size()
         # Center the first player's score between the left edge of the screen
@@ -453,6 +819,5 @@ class GameInstance:
             0 + player_two_score.size[1] + player_two_score.line_size
         )
 
-        window_surface = self._window.get_surface()
-        window_surface.blit(player_one_score.surface, player_one_score_pos)
-        window_surface.blit(player_two_score.surface, player_two_score_pos)
\ No newline at end of file
+        surface.blit(player_one_score.surface, player_one_score_pos)
+        surface.blit(player_two_score.surface, player_two_score_pos)
\ No newline at end of file
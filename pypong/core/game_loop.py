@@ -0,0 +1,140 @@
+import time
+from pypong.core.game_instance import GameInstance
+
+
+"""Class that drives a GameInstance with a fixed simulation timestep
+The game logic is always updated in steps of exactly 1 / tick_rate seconds, no matter
+how long the frames take, which keeps the physics the same on every device and stops
+long frames from moving the ball far enough to pass through a paddle.
+Real time is collected in an accumulator and spent on as many ticks as fit into it,
+the leftover fraction of a tick is used to interpolate the rendered positions.
+
+Rendering is capped at 'render_rate' frames per second (None renders after every loop iteration)
+and, unless 'sleep' is disabled, the loop sleeps until the next tick or frame is due
+instead of spinning the CPU.
+
+While the game is idle (eg. on the start screen, waiting for SPACE), the loop stops ticking
+altogether and blocks until an event arrives, waking up at least every 'idle_timeout' seconds."""
+class FixedTimestepLoop:
+    def __init__(self,
+                 game_instance: GameInstance,
+                 tick_rate: int = 120,
+                 render_rate: int = 60,
+                 sleep: bool = True,
+                 max_frame_time: float = 0.25,
+                 idle_timeout: float = 0.5) -> None:
+        self._game_instance = game_instance
+        self._tick_time = 1 / tick_rate
+        self._render_time = 1 / render_rate if render_rate else 0.0
+        self._sleep = sleep
+        # Upper limit of real time (in seconds) that's simulated per loop iteration
+        # Prevents the game from falling further and further behind (and never recovering)
+        # after a hitch, such as the window being dragged around
+        self._max_frame_time = max_frame_time
+        self._idle_timeout = idle_timeout
+
+
+    """Keep running the game until either the window is closed or the player presses ESC"""
+    def run(self) -> None:
+        game_instance = self._game_instance
+        tick_time = self._tick_time
+
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        next_render_time = last_time
+
+        while True:
+            if self._sleep and game_instance.is_idle():
+                if game_instance.process_events(self._idle_timeout) == -1:
+                    return
+
+                # Nothing moves while the game is idle, but the update still has to run
+                # (eg. to record the SPACE presses into a replay)
+                game_instance.update(tick_time)
+                game_instance.render()
+
+                # The time spent waiting isn't simulated
+                accumulator = 0.0
+                last_time = time.perf_counter()
+                next_render_time = last_time
+                continue
+
+            current_time = time.perf_counter()
+            accumulator += min(current_time - last_time, self._max_frame_time)
+            last_time = current_time
+
+            if game_instance.process_events() == -1:
+                return
+
+            # Spend the accumulated time on as many fixed ticks as fit into it
+            while accumulator >= tick_time:
+                game_instance.update(tick_time)
+                accumulator -= tick_time
+
+            if current_time >= next_render_time:
+                game_instance.render(accumulator / tick_time)
+                # Schedule the next frame relative to the previous deadline to keep a steady rate,
+                # unless the game has fallen behind by more than a frame, in which case
+                # the missed frames are skipped
+                next_render_time += self._render_time
+                if next_render_time < current_time:
+                    next_render_time = current_time + self._render_time
+
+            if self._sleep:
+                # Sleep until either the next tick or the next frame is due
+                next_tick_time = last_time + (tick_time - accumulator)
+                sleep_time = min(next_tick_time, next_render_time) - time.perf_counter()
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+
+
+"""Class that drives a GameInstance whose simulation steps on its own thread (see GameInstance.start_simulation_thread())
+The simulation thread ticks at a fixed rate by itself, so this loop only renders the newest state
+published by it at 'render_rate' frames per second (None renders as often as possible)
+and handles the events in the meantime. Between the frames, the loop waits for events instead of sleeping,
+so the input is forwarded to the simulation thread as soon as it arrives rather than once per frame.
+A frame that takes long to render (eg. a slow display update) only delays the following frames,
+the physics keep their pace and the following ticks still get the input.
+
+While the game is idle (eg. on the start screen, waiting for SPACE), nothing is rendered
+and the loop only wakes up for events, at least every 'idle_timeout' seconds."""
+class ThreadedLoop:
+    def __init__(self,
+                 game_instance: GameInstance,
+                 tick_rate: int = 120,
+                 render_rate: int = 60,
+                 max_frame_time: float = 0.25,
+                 idle_timeout: float = 0.5) -> None:
+        self._game_instance = game_instance
+        self._tick_rate = tick_rate
+        self._render_time = 1 / render_rate if render_rate else 0.0
+        # Upper limit of real time (in seconds) the simulation thread catches up on after falling behind
+        self._max_frame_time = max_frame_time
+        self._idle_timeout = idle_timeout
+
+
+    """Keep running the game until either the window is closed or the player presses ESC
+    The simulation thread is started at the beginning and stopped once the loop ends"""
+    def run(self) -> None:
+        game_instance = self._game_instance
+        game_instance.start_simulation_thread(self._tick_rate, self._max_frame_time)
+
+        try:
+            next_render_time = time.perf_counter()
+            while True:
+                current_time = time.perf_counter()
+                if current_time >= next_render_time:
+                    game_instance.render()
+                    # Same scheduling as in FixedTimestepLoop, the missed frames are skipped
+                    next_render_time += self._render_time
+                    if next_render_time < current_time:
+                        next_render_time = current_time + self._render_time
+
+                if game_instance.is_idle():
+                    wait_timeout = self._idle_timeout
+                else:
+                    wait_timeout = max(0.0, next_render_time - time.perf_counter())
+                if game_instance.process_events(wait_timeout) == -1:
+                    return
+        finally:
+            game_instance.stop_simulation_thread()
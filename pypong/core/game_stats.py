@@ -1,4 +1,5 @@
 from enum import Enum, IntEnum
+from typing import Callable, NamedTuple
 
 
 """Enum of the possible states that the game can be in"""
@@ -17,6 +18,34 @@ class PlayerIndex(IntEnum):
     PLAYER_TWO = 2
 
 
+"""IntEnum of the kinds of events a Simulation reports while a match is being played"""
+class MatchEventType(IntEnum):
+    SERVE = 0
+    PADDLE_HIT = 1
+    WALL_BOUNCE = 2
+    POINT = 3
+
+
+"""Single event of a match, as reported by the Simulation to GameStats.event_listener
+'tick' is the amount of ticks played (while a round was in progress) before the event,
+'ball' the index of the ball the event happened to. The meaning of the rest depends on the type:
+- SERVE: 'player' is the player the ball is heading towards, 'x' and 'y' the launch velocity
+- PADDLE_HIT: 'player' owns the paddle, 'x' and 'y' are the center of the ball and 'value' is
+  where the ball hit the paddle, from -1 (its top edge) through 0 (its center) to 1 (its bottom edge)
+- WALL_BOUNCE: 'x' and 'y' are the center of the ball and 'value' the axis of the bounce
+  (0 for the left and right edges of the screen, 1 for the top and bottom ones)
+- POINT: 'player' scored the point, 'x' and 'y' are the center of the ball
+  and 'value' the length of the rally in ticks"""
+class MatchEvent(NamedTuple):
+    event_type: MatchEventType
+    tick: int
+    player: PlayerIndex | int
+    ball: int
+    x: float
+    y: float
+    value: float
+
+
 """Struct containing the current statistics of the game
 Keeps track of the current game state, score etc.
 """
@@ -24,4 +53,7 @@ class GameStats:
     def __init__(self) -> None:
         self.score = (0, 0)
         self.current_game_state = GameState.GAME_START
-        self.player_who_last_scored: PlayerIndex = 0
\ No newline at end of file
+        self.player_who_last_scored: PlayerIndex = 0
+        """Called with every MatchEvent of the match as it happens (eg. EventRecorder.record())
+        Nothing is reported while it's None"""
+        self.event_listener: Callable[[MatchEvent], None] | None = None
\ No newline at end of file
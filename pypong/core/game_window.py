@@ -1,17 +1,25 @@
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
+import pygame.constants
 import pygame.display
 import pygame.surface
+if TYPE_CHECKING:
+    import numpy
 
 
 """Class that represents the window in which the game is taking place"""
 class GameWindow:
     """Initialize the window's surface as pygame's main drawing surface
-    to which all of the subsequent Surfaces are rendered"""
-    def __init__(self, width: int, height: int, caption: str) -> None:
+    to which all of the subsequent Surfaces are rendered
+    VSync is only supported by SDL for scaled (or OpenGL) windows,
+    so enabling it creates a scaled window of the same size"""
+    def __init__(self, width: int, height: int, caption: str, vsync: bool = False) -> None:
         self._size = (width, height)
         self._caption = caption
 
-        self._surface = pygame.display.set_mode((width, height))
+        if vsync:
+            self._surface = pygame.display.set_mode((width, height), pygame.constants.SCALED, vsync=1)
+        else:
+            self._surface = pygame.display.set_mode((width, height))
         pygame.display.set_caption(caption)
 
 
@@ -21,12 +29,26 @@ class GameWindow:
         del self._surface
 
 
+    """Returns the pixels of the window's surface as a NumPy array of shape (height, width, 3) with RGB values
+    The array is a view into the surface's memory, nothing is copied: it shows whatever
+    is currently drawn and writing into it draws onto the window.
+    While the array (or any view of it) exists, the surface stays locked and nothing
+    can be blitted onto it, so it has to be dropped before the next frame is rendered.
+    Requires NumPy"""
+    def get_pixels(self) -> "numpy.ndarray":
+        # Imported here, so that NumPy is only needed when the pixels are requested
+        import pygame.surfarray
+        # surfarray indexes the pixels by column first, the transposition is only a view as well
+        return pygame.surfarray.pixels3d(self._surface).transpose(1, 0, 2)
+
+
 
     def get_surface(self) -> pygame.surface.Surface:
         return self._surface
 
     def get_size(self) -> Tuple[int, int]:
-        return tuple(self._size)
+        # The size is an immutable tuple, so it can be handed out without copying
+        return self._size
 
     def get_caption(self) -> str:
         return str(self._caption)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import random
+from typing import Callable, Sequence, Tuple
+from pypong.core.game_stats import GameState, PlayerIndex
+from pypong.core.simulation import PaddleDirection, Simulation
+
+
+"""Signature of the callables that control a paddle in a headless match
+Receives the simulation and the index of the controlled player,
+returns the direction in which the paddle should move this tick"""
+Policy = Callable[[Simulation, PlayerIndex], PaddleDirection]
+
+
+"""Policy that never moves the paddle"""
+def idle_policy(simulation: Simulation, player: PlayerIndex) -> PaddleDirection:
+    return PaddleDirection.NONE
+
+
+"""Policy that replays a predefined sequence of paddle directions, one per tick
+Once the sequence runs out the paddle stays still, unless 'loop' is set"""
+class ScriptedPolicy:
+    def __init__(self, directions: Sequence[PaddleDirection], loop: bool = False) -> None:
+        self._directions = list(directions)
+        self._loop = loop
+        self._tick = 0
+
+
+    def __call__(self, simulation: Simulation, player: PlayerIndex) -> PaddleDirection:
+        tick = self._tick
+        self._tick += 1
+
+        if self._loop and len(self._directions) > 0:
+            tick %= len(self._directions)
+        if tick < len(self._directions):
+            return self._directions[tick]
+        return PaddleDirection.NONE
+
+
+"""Class that plays matches without a window, fonts or display updates
+Every tick advances the simulation by a fixed delta_time, so the game runs as fast
+as the CPU allows instead of at the speed of the display.
+Whenever the game waits for SPACE, the headless game presses it by itself."""
+class HeadlessGame:
+    def __init__(self,
+                 window_size: Tuple[int, int] = (800, 600),
+                 delta_time: float = 1 / 60,
+                 player_one_policy: Policy = idle_policy,
+                 player_two_policy: Policy = idle_policy,
+                 rng = random) -> None:
+        self._simulation = Simulation(window_size, rng=rng)
+        self._delta_time = delta_time
+        self._player_one_policy = player_one_policy
+        self._player_two_policy = player_two_policy
+        self._tick_count = 0
+        # Length (in ticks) of every finished rally and of the rally currently being played
+        self._rally_lengths = []
+        self._current_rally_length = 0
+
+
+    """Advance the match by a single tick"""
+    def tick(self) -> None:
+        simulation = self._simulation
+        game_stats = simulation.get_game_stats()
+
+        if game_stats.current_game_state != GameState.ROUND_IN_PROGRESS:
+            simulation.advance_state()
+        else:
+            simulation.step(
+                self._delta_time,
+                self._player_one_policy(simulation, PlayerIndex.PLAYER_ONE),
+                self._player_two_policy(simulation, PlayerIndex.PLAYER_TWO)
+            )
+            self._current_rally_length += 1
+
+            # Someone scored, the rally is over
+            if game_stats.current_game_state == GameState.ROUND_END:
+                self._rally_lengths.append(self._current_rally_length)
+                self._current_rally_length = 0
+
+        self._tick_count += 1
+
+
+    """Keep ticking until either of the players reaches 'points_to_win'
+    or until 'max_ticks' ticks have been run (whichever comes first)
+    Returns the amount of ticks that were run"""
+    def run(self, points_to_win: int = 10, max_ticks: int = 1_000_000) -> int:
+        game_stats = self._simulation.get_game_stats()
+        start_tick = self._tick_count
+
+        while self._tick_count - start_tick < max_ticks and max(game_stats.score) < points_to_win:
+            self.tick()
+
+        return self._tick_count - start_tick
+
+
+
+    def get_simulation(self) -> Simulation:
+        return self._simulation
+
+
+    def get_tick_count(self) -> int:
+        return self._tick_count
+
+
+    """Lengths (in ticks) of all of the rallies finished so far"""
+    def get_rally_lengths(self) -> list[int]:
+        return list(self._rally_lengths)
@@ -0,0 +1,135 @@
+import math
+import time
+from collections import deque
+from typing import Callable, Iterable
+
+
+"""Class that measures how long each frame and each stage of the game loop takes
+Stages are measured by wrapping the methods of the measured objects (see instrument()),
+so objects that aren't instrumented pay no cost at all.
+The measurements of the last 'window_size' frames are kept for the statistics."""
+class FrameProfiler:
+    def __init__(self, frame_budget: float = 1 / 60, window_size: int = 600) -> None:
+        """Time (in seconds) a single frame is supposed to take"""
+        self.frame_budget = frame_budget
+        self._window_size = window_size
+
+        self._frame_times = deque(maxlen=window_size)
+        self._last_frame_end = None
+        self._dropped_frames = 0
+        self._frame_count = 0
+
+        # Time spent in each stage during the frame that's currently in progress
+        # dict({key: str=stage name, value: float=seconds})
+        self._current_stage_times = dict()
+        # Time spent in each stage during the last 'window_size' frames
+        # dict({key: str=stage name, value: deque=seconds per frame})
+        self._stage_times = dict()
+
+
+    """Replace the provided methods of the object with versions that measure their run time
+    Every method is measured as a stage named after the method (without the leading underscores)"""
+    def instrument(self, instance: object, method_names: Iterable[str]) -> None:
+        for method_name in method_names:
+            stage = method_name.lstrip("_")
+            setattr(instance, method_name, self.wrap(stage, getattr(instance, method_name)))
+
+
+    """Give the object back the methods replaced by instrument() and stop measuring their stages"""
+    def uninstrument(self, instance: object, method_names: Iterable[str]) -> None:
+        for method_name in method_names:
+            # The measured versions are set on the instance, they hide the methods of its class
+            if method_name in vars(instance):
+                delattr(instance, method_name)
+            stage = method_name.lstrip("_")
+            self._current_stage_times.pop(stage, None)
+            self._stage_times.pop(stage, None)
+
+
+    """Wrap the function so that its run time is added to the provided stage"""
+    def wrap(self, stage: str, function: Callable) -> Callable:
+        self._current_stage_times.setdefault(stage, 0.0)
+        self._stage_times.setdefault(stage, deque(maxlen=self._window_size))
+        stage_times = self._current_stage_times
+        perf_counter = time.perf_counter
+
+        def measured_function(*args, **kwargs):
+            start = perf_counter()
+            result = function(*args, **kwargs)
+            stage_times[stage] += perf_counter() - start
+            return result
+
+        return measured_function
+
+
+    """Finish the current frame, should be called once the frame has been shown on the screen
+    The frame's time is measured from the end of the previous frame"""
+    def end_frame(self) -> None:
+        now = time.perf_counter()
+
+        if self._last_frame_end is not None:
+            frame_time = now - self._last_frame_end
+            self._frame_times.append(frame_time)
+            self._frame_count += 1
+            # Amount of times the display could've shown a new frame, but there wasn't one ready yet
+            self._dropped_frames += max(0, round(frame_time / self.frame_budget) - 1)
+        self._last_frame_end = now
+
+        for stage, stage_time in self._current_stage_times.items():
+            self._stage_times[stage].append(stage_time)
+            self._current_stage_times[stage] = 0.0
+
+
+    """Drop the current frame without recording it, eg. when there was nothing to render
+    The time until the next frame has been spent waiting rather than working, so the next frame
+    isn't recorded either and only starts the measurements again"""
+    def discard_frame(self) -> None:
+        self._last_frame_end = None
+        for stage in self._current_stage_times:
+            self._current_stage_times[stage] = 0.0
+
+
+    """Returns the statistics of the frame times (in milliseconds) over the recent frames
+    Format: dict(mean, p50, p95, p99, max, frames, dropped_frames)
+    'frames' and 'dropped_frames' count all of the frames since the profiler was created"""
+    def get_frame_statistics(self) -> dict:
+        statistics = _get_statistics(self._frame_times)
+        statistics["frames"] = self._frame_count
+        statistics["dropped_frames"] = self._dropped_frames
+        return statistics
+
+
+    """Returns the statistics of the time spent in each stage per frame (in milliseconds)
+    Format: dict({key: str=stage name, value: dict(mean, p50, p95, p99, max)})"""
+    def get_stage_statistics(self) -> dict:
+        return {stage: _get_statistics(stage_times) for stage, stage_times in self._stage_times.items()}
+
+
+    """Returns a histogram of the recent frame times
+    Format: dict({key: int=lower bound of the bucket (in milliseconds), value: int=amount of frames})"""
+    def get_frame_time_histogram(self, bucket_width: float = 1.0) -> dict:
+        histogram = dict()
+        for frame_time in self._frame_times:
+            bucket = int(frame_time * 1000 // bucket_width * bucket_width)
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        return dict(sorted(histogram.items()))
+
+
+# Calculates the statistics of the provided times (in seconds) and converts them to milliseconds
+# Percentiles use the nearest-rank method
+def _get_statistics(times: Iterable[float]) -> dict:
+    sorted_times = sorted(times)
+    if len(sorted_times) == 0:
+        return dict(mean=0.0, p50=0.0, p95=0.0, p99=0.0, max=0.0)
+
+    def percentile(fraction: float) -> float:
+        index = max(0, math.ceil(fraction * len(sorted_times)) - 1)
+        return sorted_times[index] * 1000
+
+    return dict(
+        mean=sum(sorted_times) / len(sorted_times) * 1000,
+        p50=percentile(0.50),
+        p95=percentile(0.95),
+        p99=percentile(0.99),
+        max=sorted_times[-1] * 1000
+    )
@@ -0,0 +1,172 @@
+import copy
+import multiprocessing
+import random
+from typing import Callable, Iterator, Tuple
+from pypong.core.headless import HeadlessGame, Policy, idle_policy
+from pypong.core.telemetry import EventRecorder
+
+
+"""Struct containing the outcome of a single headless match"""
+class MatchResult:
+    def __init__(self,
+                 match_index: int,
+                 seed: int,
+                 score: Tuple[int, int],
+                 rally_lengths: list[int],
+                 tick_count: int,
+                 events: EventRecorder = None) -> None:
+        """Position of the match in the order in which the matches were scheduled"""
+        self.match_index = match_index
+        """Seed of the match's own pseudo-random number generator"""
+        self.seed = seed
+        """Final GameStats.score of the match"""
+        self.score = tuple(score)
+        """Length (in ticks) of every finished rally"""
+        self.rally_lengths = list(rally_lengths)
+        """Total amount of ticks the match took"""
+        self.tick_count = tick_count
+        """Events of the match, only recorded if the MatchRunner has been asked to (None otherwise)
+        They can be appended to a telemetry store by TelemetryWriter.append()"""
+        self.events = events
+
+
+"""Struct containing the merged results of many matches
+Only contains sums, counts and maximums, so the summary is the same
+no matter in which order the results are added"""
+class MatchSummary:
+    def __init__(self) -> None:
+        self.match_count = 0
+        self.tick_count = 0
+        """Amount of matches won by player one and player two respectively
+        (the player with the higher score wins, equal scores are draws)"""
+        self.wins = (0, 0)
+        self.draws = 0
+        """Sum of the scores of all of the matches"""
+        self.points = (0, 0)
+        self.rally_count = 0
+        self.rally_tick_count = 0
+        self.longest_rally = 0
+        """Dictionary of rally length (in ticks) to the amount of rallies of that length"""
+        self.rally_length_histogram = dict()
+
+
+    """Merge the result of a single match into the summary"""
+    def add(self, result: MatchResult) -> None:
+        score = result.score
+
+        self.match_count += 1
+        self.tick_count += result.tick_count
+        self.points = (self.points[0] + score[0], self.points[1] + score[1])
+        if score[0] > score[1]:
+            self.wins = (self.wins[0] + 1, self.wins[1])
+        elif score[1] > score[0]:
+            self.wins = (self.wins[0], self.wins[1] + 1)
+        else:
+            self.draws += 1
+
+        for rally_length in result.rally_lengths:
+            self.rally_count += 1
+            self.rally_tick_count += rally_length
+            self.longest_rally = max(self.longest_rally, rally_length)
+            self.rally_length_histogram[rally_length] = self.rally_length_histogram.get(rally_length, 0) + 1
+
+
+    def get_mean_rally_length(self) -> float:
+        return self.rally_tick_count / self.rally_count if self.rally_count > 0 else 0.0
+
+
+"""Class that plays many independent headless matches, sharded across a pool of processes
+Every match gets its own pseudo-random number generator seeded from a single root seed
+based only on the match's index, which makes the results reproducible
+regardless of how many worker processes are used.
+
+The policies are sent to the worker processes, so they must be picklable
+(eg. functions defined at the top level of a module or instances of such classes).
+Every match receives its own copy of the policies. Copies that have a seed(seed) method
+(eg. CpuPlayer) are seeded from the match's seed, so their randomness is reproducible as well.
+
+With 'record_events' every MatchResult carries the events of its match (see MatchEvent),
+collected in the worker processes and sent back along with the rest of the result."""
+class MatchRunner:
+    def __init__(self,
+                 player_one_policy: Policy = idle_policy,
+                 player_two_policy: Policy = idle_policy,
+                 window_size: Tuple[int, int] = (800, 600),
+                 delta_time: float = 1 / 60,
+                 points_to_win: int = 10,
+                 max_ticks: int = 1_000_000,
+                 worker_count: int = None,
+                 record_events: bool = False) -> None:
+        self._match_settings = (player_one_policy, player_two_policy, tuple(window_size),
+                                delta_time, points_to_win, max_ticks, record_events)
+        # Defaults to the amount of CPU cores
+        self._worker_count = worker_count if worker_count is not None else multiprocessing.cpu_count()
+
+
+    """Play 'match_count' matches and yield their results as soon as they finish
+    The results can arrive in any order, use MatchResult.match_index to tell them apart"""
+    def iter_results(self, match_count: int, root_seed: int) -> Iterator[MatchResult]:
+        # The seeds are derived in the scheduling process up front,
+        # so the seed of a match never depends on which worker plays it
+        seed_rng = random.Random(root_seed)
+        tasks = ((match_index, seed_rng.getrandbits(64), self._match_settings)
+                 for match_index in range(match_count))
+
+        # No point in spawning processes for a single worker
+        if self._worker_count <= 1:
+            for task in tasks:
+                yield _play_match(task)
+            return
+
+        # Send the matches in chunks to keep the inter-process overhead down
+        # while still spreading the work evenly across the workers
+        chunk_size = max(1, match_count // (self._worker_count * 4))
+        with multiprocessing.Pool(self._worker_count) as pool:
+            for result in pool.imap_unordered(_play_match, tasks, chunk_size):
+                yield result
+
+
+    """Play 'match_count' matches and merge their results into a MatchSummary
+    'on_result' is called with every MatchResult as it arrives"""
+    def run(self,
+            match_count: int,
+            root_seed: int,
+            on_result: Callable[[MatchResult], None] = None) -> MatchSummary:
+        summary = MatchSummary()
+        for result in self.iter_results(match_count, root_seed):
+            summary.add(result)
+            if on_result is not None:
+                on_result(result)
+
+        return summary
+
+
+# Plays a single match inside of a worker process
+# Defined at the top level of the module so that it can be pickled
+def _play_match(task: tuple) -> MatchResult:
+    match_index, seed, match_settings = task
+    player_one_policy, player_two_policy, window_size, delta_time, points_to_win, max_ticks, record_events = match_settings
+
+    player_one_policy = _seed_policy(copy.deepcopy(player_one_policy), seed, 1)
+    player_two_policy = _seed_policy(copy.deepcopy(player_two_policy), seed, 2)
+    game = HeadlessGame(window_size, delta_time, player_one_policy, player_two_policy, random.Random(seed))
+    events = None
+    if record_events:
+        events = EventRecorder()
+        game.get_simulation().get_game_stats().event_listener = events.record
+    game.run(points_to_win, max_ticks)
+
+    return MatchResult(match_index,
+                       seed,
+                       game.get_simulation().get_game_stats().score,
+                       game.get_rally_lengths(),
+                       game.get_tick_count(),
+                       events)
+
+
+# Seeds the policy's own randomness (if it has any) from the seed of the match
+# Both players get a different seed, which is also different from the seed of the match's generator
+def _seed_policy(policy: Policy, match_seed: int, player: int) -> Policy:
+    if hasattr(policy, "seed"):
+        policy.seed(random.Random(f"{match_seed}:{player}").getrandbits(64))
+    return policy
@@ -0,0 +1,37 @@
+from typing import TYPE_CHECKING, Tuple
+import pygame.surface
+if TYPE_CHECKING:
+    import numpy
+
+
+"""Class that stands in for the game's window when the frames are rendered without being shown
+Has the same interface as GameWindow, but everything is drawn into a plain Surface instead of
+the display's one, so it needs neither a window nor an initialized display (any SDL video driver,
+"dummy" included, works). The last rendered frame stays in the Surface until the next one is drawn."""
+class OffscreenWindow:
+    def __init__(self, width: int, height: int, caption: str = "") -> None:
+        self._size = (width, height)
+        self._caption = caption
+        self._surface = pygame.surface.Surface(self._size)
+
+
+    """Kept for compatibility with AcceleratedGameWindow, the frame is already in the Surface"""
+    def present(self) -> None:
+        pass
+
+
+    """Returns the pixels of the surface as a NumPy view of shape (height, width, 3), see GameWindow.get_pixels()"""
+    def get_pixels(self) -> "numpy.ndarray":
+        import pygame.surfarray
+        return pygame.surfarray.pixels3d(self._surface).transpose(1, 0, 2)
+
+
+
+    def get_surface(self) -> pygame.surface.Surface:
+        return self._surface
+
+    def get_size(self) -> Tuple[int, int]:
+        return self._size
+
+    def get_caption(self) -> str:
+        return str(self._caption)
@@ -0,0 +1,125 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from pypong.core.game_window import GameWindow
+if TYPE_CHECKING:
+    from pypong.core.offscreen_window import OffscreenWindow
+
+
+# Weights of the red, green and blue channels in the grayscale frames (ITU-R BT.601 luma)
+GRAYSCALE_WEIGHTS = (0.299, 0.587, 0.114)
+
+
+"""Class that turns the rendered frames of a window into observations for agents learning from pixels
+
+Every capture() reads the window's pixels through a view (see GameWindow.get_pixels()),
+without copying the frame, and writes the observation straight into a preallocated buffer:
+- 'grayscale' converts the RGB pixels into a single luminance channel
+- 'downscale' shrinks the frame by an integer factor, every observed pixel is the average
+  of a downscale x downscale block of the window's pixels (so thin lines don't disappear)
+- 'stack_size' keeps the last observed frames, get_stack() returns them from the oldest to the newest
+
+No arrays are allocated once the observation is created. The frames are kept in a ring buffer
+that holds every frame twice, at its index and 'stack_size' places after it, so the stack
+is always a contiguous slice of the buffer and can be returned as a view, without reordering it.
+The returned arrays are overwritten by the following captures, copy them if they need to be kept.
+Requires NumPy"""
+class PixelObservation:
+    def __init__(self,
+                 window: "GameWindow | OffscreenWindow",
+                 grayscale: bool = True,
+                 downscale: int = 1,
+                 stack_size: int = 1) -> None:
+        width, height = window.get_size()
+        if downscale < 1 or width % downscale != 0 or height % downscale != 0:
+            raise ValueError(f"The window size {width}x{height} isn't divisible by the downscale factor {downscale}")
+        if stack_size < 1:
+            raise ValueError(f"The stack size has to be at least 1, not {stack_size}")
+
+        self._window = window
+        self._grayscale = grayscale
+        self._downscale = downscale
+        self._stack_size = stack_size
+
+        self._frame_shape = (height // downscale, width // downscale) if grayscale \
+                            else (height // downscale, width // downscale, 3)
+        self._frames = np.zeros((stack_size * 2,) + self._frame_shape, dtype=np.uint8)
+        # Index of the most recently captured frame in the first half of the ring buffer
+        self._frame_index = stack_size - 1
+
+        # Buffers the frame is accumulated in before being rounded into the ring buffer,
+        # not needed when the pixels are only copied
+        self._accumulator = None
+        self._scratch = None
+        if grayscale or downscale > 1:
+            self._accumulator = np.zeros(self._frame_shape, dtype=np.float32)
+            self._scratch = np.zeros(self._frame_shape, dtype=np.float32)
+        # Every pixel of a block contributes to the average, so the weights are split between them
+        block_area = downscale * downscale
+        self._channel_weights = tuple(weight / block_area for weight in GRAYSCALE_WEIGHTS)
+        self._block_weight = 1 / block_area
+
+
+    """Observe the frame currently rendered in the window
+    Returns the observed frame, of shape (height, width) for grayscale frames
+    or (height, width, 3) for RGB ones, with the size divided by 'downscale'"""
+    def capture(self) -> np.ndarray:
+        self._frame_index = (self._frame_index + 1) % self._stack_size
+        # The frame is written into the second half first, the newest frame of the stack is always there
+        frame = self._frames[self._frame_index + self._stack_size]
+
+        pixels = self._window.get_pixels()
+        if self._accumulator is None:
+            np.copyto(frame, pixels)
+        else:
+            self._accumulate(pixels)
+            np.rint(self._accumulator, out=self._accumulator)
+            np.copyto(frame, self._accumulator, casting="unsafe")
+        # Unlocks the window's surface, so that the next frame can be rendered into it
+        del pixels
+
+        self._frames[self._frame_index] = frame
+        return frame
+
+
+    """Clear the stacked frames, eg. at the start of an episode"""
+    def reset(self) -> None:
+        self._frames.fill(0)
+        self._frame_index = self._stack_size - 1
+
+
+
+    """Returns the last 'stack_size' observed frames, from the oldest to the newest
+    Frames that haven't been observed yet (after creating or resetting the observation) are black"""
+    def get_stack(self) -> np.ndarray:
+        first_index = self._frame_index + 1
+        return self._frames[first_index:first_index + self._stack_size]
+
+
+    def get_frame(self) -> np.ndarray:
+        return self._frames[self._frame_index + self._stack_size]
+
+    def get_frame_shape(self) -> tuple:
+        return self._frame_shape
+
+    def get_stack_size(self) -> int:
+        return self._stack_size
+
+
+    # Sums the weighted pixels of every block into the accumulator
+    # Each offset within the blocks is a strided view of the pixels, so the sum needs no temporary arrays
+    def _accumulate(self, pixels: np.ndarray) -> None:
+        accumulator = self._accumulator
+        scratch = self._scratch
+        downscale = self._downscale
+        accumulator.fill(0)
+
+        for row_offset in range(downscale):
+            for column_offset in range(downscale):
+                block_pixels = pixels[row_offset::downscale, column_offset::downscale]
+                if self._grayscale:
+                    for channel, weight in enumerate(self._channel_weights):
+                        np.multiply(block_pixels[:, :, channel], weight, out=scratch)
+                        np.add(accumulator, scratch, out=accumulator)
+                else:
+                    np.multiply(block_pixels, self._block_weight, out=scratch)
+                    np.add(accumulator, scratch, out=accumulator)
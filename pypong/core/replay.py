@@ -0,0 +1,231 @@
+import random
+import struct
+from typing import Tuple
+from pypong.core.simulation import PaddleDirection, Simulation
+
+
+# Replay file format (all numbers are little-endian):
+# Header: magic bytes, format version, flags, seed (signed), delta_time, window width and height, tick count
+# Body: runs of identical ticks, each run is stored as a varint run length followed by the tick byte
+# Tick byte: bits 0-1 player one's input, bits 2-3 player two's input,
+#            bits 4-5 how many times the game was advanced (SPACE) before the tick
+REPLAY_MAGIC = b"PYRP"
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct("<4sBBqdHHI")
+
+# Header flags
+FLAG_SWEPT_COLLISIONS = 0b1
+
+# Highest amount of advances a single tick can hold
+MAX_ADVANCES_PER_TICK = 3
+
+# Paddle inputs as stored in the tick bytes
+_DIRECTION_TO_BITS = {PaddleDirection.NONE: 0, PaddleDirection.UP: 1, PaddleDirection.DOWN: 2}
+_BITS_TO_DIRECTION = (PaddleDirection.NONE, PaddleDirection.UP, PaddleDirection.DOWN, PaddleDirection.NONE)
+
+
+"""Struct containing a recorded match: everything needed to recreate it from scratch
+The inputs are stored as one byte per tick (see the tick byte format above)"""
+class Replay:
+    def __init__(self,
+                 seed: int,
+                 delta_time: float,
+                 window_size: Tuple[int, int],
+                 swept_collisions: bool = False,
+                 ticks: bytearray = None) -> None:
+        """Seed of the random number generator used for the ball launches"""
+        self.seed = seed
+        """Time (in seconds) every tick advances the simulation by"""
+        self.delta_time = delta_time
+        self.window_size = tuple(window_size)
+        self.swept_collisions = swept_collisions
+        self.ticks = ticks if ticks is not None else bytearray()
+
+
+    """Encode the replay into its compact binary form"""
+    def to_bytes(self) -> bytes:
+        flags = FLAG_SWEPT_COLLISIONS if self.swept_collisions else 0
+        encoded = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, flags, self.seed, self.delta_time,
+                                               self.window_size[0], self.window_size[1], len(self.ticks)))
+
+        # Players hold the same keys for many ticks in a row,
+        # so the ticks are stored as runs of identical bytes
+        ticks = self.ticks
+        run_start = 0
+        while run_start < len(ticks):
+            run_end = run_start + 1
+            while run_end < len(ticks) and ticks[run_end] == ticks[run_start]:
+                run_end += 1
+
+            _write_varint(encoded, run_end - run_start)
+            encoded.append(ticks[run_start])
+            run_start = run_end
+
+        return bytes(encoded)
+
+
+    """Decode a replay from its binary form created by to_bytes()
+    Raises ValueError if the data isn't a replay or if it's cut off or corrupted"""
+    @staticmethod
+    def from_bytes(data: bytes) -> "Replay":
+        if len(data) < REPLAY_HEADER.size:
+            raise ValueError("Truncated replay")
+        magic, version, flags, seed, delta_time, width, height, tick_count = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("Not a replay of a supported version")
+
+        ticks = bytearray()
+        offset = REPLAY_HEADER.size
+        while len(ticks) < tick_count:
+            run_length, offset = _read_varint(data, offset)
+            if offset >= len(data):
+                raise ValueError("Truncated replay")
+            # The runs have to add up to the tick count exactly
+            if run_length == 0 or len(ticks) + run_length > tick_count:
+                raise ValueError("Corrupt replay")
+            ticks.extend(data[offset:offset + 1] * run_length)
+            offset += 1
+
+        return Replay(seed, delta_time, (width, height), bool(flags & FLAG_SWEPT_COLLISIONS), ticks)
+
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+
+    @staticmethod
+    def load(path: str) -> "Replay":
+        with open(path, "rb") as replay_file:
+            return Replay.from_bytes(replay_file.read())
+
+
+    def get_tick_count(self) -> int:
+        return len(self.ticks)
+
+
+    """Decode the tick at the provided index
+    Returns Tuple(player_one_direction, player_two_direction, advance_count)"""
+    def get_tick(self, index: int) -> Tuple[PaddleDirection, PaddleDirection, int]:
+        tick = self.ticks[index]
+        return (_BITS_TO_DIRECTION[tick & 0b11], _BITS_TO_DIRECTION[(tick >> 2) & 0b11], (tick >> 4) & 0b11)
+
+
+"""Class that records the inputs of a match, tick by tick, into a Replay"""
+class ReplayRecorder:
+    def __init__(self,
+                 seed: int,
+                 delta_time: float,
+                 window_size: Tuple[int, int],
+                 swept_collisions: bool = False) -> None:
+        self._replay = Replay(seed, delta_time, window_size, swept_collisions)
+
+
+    """Record a single tick
+    'advance_count' is how many times the game was advanced (SPACE) before the tick was simulated"""
+    def record_tick(self,
+                    player_one_direction: PaddleDirection,
+                    player_two_direction: PaddleDirection,
+                    advance_count: int = 0) -> None:
+        if advance_count > MAX_ADVANCES_PER_TICK:
+            raise ValueError(f"A tick can hold at most {MAX_ADVANCES_PER_TICK} advances")
+
+        self._replay.ticks.append(_DIRECTION_TO_BITS[player_one_direction]
+                                  | _DIRECTION_TO_BITS[player_two_direction] << 2
+                                  | advance_count << 4)
+
+
+    def get_replay(self) -> Replay:
+        return self._replay
+
+
+"""Class that plays a Replay back by re-simulating it from its seed and inputs
+Snapshots of the simulation are taken every 'snapshot_interval' ticks as the replay is played,
+so seeking only has to re-simulate the ticks since the closest snapshot
+The replay is played on a new Simulation, unless an existing one (eg. the one of a GameInstance) is provided.
+That one must be in its initial state and created the same way: with the replay's window size,
+collisions, the default physics and a random.Random seeded by the replay's seed"""
+class ReplayPlayer:
+    def __init__(self,
+                 replay: Replay,
+                 snapshot_interval: int = 600,
+                 object_color: Tuple[int, int, int] = (255, 255, 255),
+                 simulation: Simulation = None) -> None:
+        self._replay = replay
+        self._snapshot_interval = snapshot_interval
+        if simulation is None:
+            simulation = Simulation(replay.window_size, object_color, random.Random(replay.seed), replay.swept_collisions)
+        self._simulation = simulation
+        self._tick = 0
+        # Snapshot number N holds the state before tick N * snapshot_interval
+        self._snapshots = [self._simulation.snapshot()]
+
+
+    """Play the next tick of the replay
+    Returns False if the replay has already ended"""
+    def step(self) -> bool:
+        if self._tick >= self._replay.get_tick_count():
+            return False
+
+        player_one_direction, player_two_direction, advance_count = self._replay.get_tick(self._tick)
+        simulation = self._simulation
+        for _ in range(advance_count):
+            simulation.advance_state()
+        simulation.step(self._replay.delta_time, player_one_direction, player_two_direction)
+        self._tick += 1
+
+        if self._tick % self._snapshot_interval == 0 and self._tick // self._snapshot_interval == len(self._snapshots):
+            self._snapshots.append(simulation.snapshot())
+        return True
+
+
+    """Move the playback to the state right before the provided tick
+    (a tick equal to the tick count moves it to the end of the replay)"""
+    def seek(self, tick: int) -> None:
+        tick = max(0, min(tick, self._replay.get_tick_count()))
+
+        # Jump to the closest snapshot before the tick, unless playing on from the current tick is shorter
+        snapshot_index = min(tick // self._snapshot_interval, len(self._snapshots) - 1)
+        snapshot_tick = snapshot_index * self._snapshot_interval
+        if not snapshot_tick <= self._tick <= tick:
+            self._simulation.restore(self._snapshots[snapshot_index])
+            self._tick = snapshot_tick
+
+        while self._tick < tick:
+            self.step()
+
+
+    def get_simulation(self) -> Simulation:
+        return self._simulation
+
+
+    def get_tick(self) -> int:
+        return self._tick
+
+
+    def get_replay(self) -> Replay:
+        return self._replay
+
+
+# Appends the unsigned number to the buffer as a LEB128 varint
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+# Reads a LEB128 varint from the data at the offset
+# Returns Tuple(value, offset right after the varint)
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated replay")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (value, offset)
+        shift += 7
@@ -0,0 +1,594 @@
+import math
+import random
+from enum import IntEnum
+from typing import Tuple
+from pypong.core.game_stats import GameState, GameStats, MatchEvent, MatchEventType, PlayerIndex
+from pypong.gameplay.game_object import GameObject
+from pypong.gameplay.ball import Ball
+from pypong.gameplay.collision import sweep_aabb, sweep_bounds
+from pypong.gameplay.spatial_grid import SpatialGrid
+
+
+# Game options
+# (the defaults, a Simulation can be created with different sizes and speeds)
+PADDLE_SIZE = (20, 125)
+PADDLE_SPEED = 200.0
+PADDLE_X_OFFSET = 25
+
+BALL_SIZE = (25, 25)
+BALL_SPEED = 235.0
+
+# Highest amount of bounces the ball can make during a single tick
+# when using swept collisions
+MAX_BOUNCES_PER_TICK = 4
+
+# Size of the cells of the collision grid, relative to the size of the ball
+GRID_CELL_SCALE = 2
+# Distance between the starting positions of the balls (when there are several),
+# relative to the size of the ball
+BALL_SPACING = 2
+
+# Keys of the paddles in the collision grid
+# The obstacles follow them, the balls come after the obstacles
+PLAYER_ONE_KEY = 0
+PLAYER_TWO_KEY = 1
+
+
+"""IntEnum of the directions in which a paddle can be moved during a single tick
+The values are the sign of the paddle's Y movement"""
+class PaddleDirection(IntEnum):
+    UP = -1
+    NONE = 0
+    DOWN = 1
+
+
+"""Class containing the game's physics and rules, separated from any rendering,
+window or pygame event handling
+It can be driven by a GameInstance (keyboard input) or stepped on its own
+without a window (headless) using programmatic inputs"""
+class Simulation:
+    """Create the paddles and the ball for a playing field of the provided size
+    'rng' is the source of randomness for the ball launch, anything with a randint() method works
+    'swept_collisions' computes the exact moment the ball hits a wall or a paddle within a tick
+    and bounces it there (as many times as needed), instead of only checking for overlaps
+    at the end of the tick. This keeps the ball from passing through the paddles
+    even with large delta_time values or high ball speeds, a ball that gets past a paddle
+    scores the moment it crosses the paddle's goal line.
+    The sizes (in pixels) and speeds (in pixels per second) of the paddles and the ball
+    default to the module's constants.
+    'ball_count' balls are launched every round, starting next to each other around the center
+    of the playing field, they bounce off of each other. The first ball to get past a paddle ends the round.
+    'obstacles' are static rects (x, y, width, height) the balls bounce off of
+    The events of the match (serves, paddle hits, wall bounces and points) are reported
+    to the listener of the GameStats, see GameStats.event_listener"""
+    def __init__(self,
+                 window_size: Tuple[int, int],
+                 object_color: Tuple[int, int, int] = (255, 255, 255),
+                 rng = random,
+                 swept_collisions: bool = False,
+                 paddle_size: Tuple[int, int] = PADDLE_SIZE,
+                 paddle_speed: float = PADDLE_SPEED,
+                 ball_size: Tuple[int, int] = BALL_SIZE,
+                 ball_speed: float = BALL_SPEED,
+                 ball_count: int = 1,
+                 obstacles: list[Tuple[int, int, int, int]] = ()) -> None:
+        self._window_size = tuple(window_size)
+        self._rng = rng
+        self._swept_collisions = swept_collisions
+        self._paddle_speed = paddle_speed
+        self._ball_size = tuple(ball_size)
+        self._ball_speed = ball_speed
+        self._game_stats = GameStats()
+        # Amount of ticks played so far and the tick the current rally has started on, used by the events
+        # They're not part of the snapshots, since they don't affect the game
+        self._tick = 0
+        self._rally_start_tick = 0
+
+        # Player one pos:
+        # Since the left part of the screen is 0, add 1/2 of paddle width
+        # to the border (so that the center of the paddle is properly placed)
+        # and further offset it from the window border by the specified X offset
+        player_one_pos = [
+            0 + paddle_size[0] / 2 + PADDLE_X_OFFSET,
+            window_size[1] / 2 - paddle_size[1] / 2
+        ]
+        # Player two pos:
+        # Since the right part of the screen is the specified screen resolution width,
+        # subtract 1/2 of paddle width from the right border
+        # (so that the center of the paddle is properly placed) and further offset it
+        # by the specified X offset so that there's a bit of space between it
+        # and the side of the window
+        player_two_pos = [
+            window_size[0] - paddle_size[0] * 1.5 - PADDLE_X_OFFSET,
+            window_size[1] / 2 - paddle_size[1] / 2
+        ]
+
+        # Ball pos:
+        # Move the center of the ball Surface (ball_size / 2) to the center of the screen
+        # Several balls are laid out in a grid (as close to a square as possible) centered on the screen
+        column_count = math.ceil(math.sqrt(ball_count))
+        row_count = math.ceil(ball_count / column_count)
+        ball_positions = [
+            [
+                window_size[0] / 2 - ball_size[0] / 2 + (index % column_count - (column_count - 1) / 2) * ball_size[0] * BALL_SPACING,
+                window_size[1] / 2 - ball_size[1] / 2 + (index // column_count - (row_count - 1) / 2) * ball_size[1] * BALL_SPACING
+            ]
+            for index in range(ball_count)
+        ]
+
+        # Initialize the actual GameObjects
+        self._player_one = GameObject(player_one_pos, paddle_size, object_color)
+        self._player_two = GameObject(player_two_pos, paddle_size, object_color)
+        self._obstacles = [GameObject([rect[0], rect[1]], (rect[2], rect[3]), object_color) for rect in obstacles]
+        self._balls = [Ball(ball_pos, [0.0, 0.0], ball_size, object_color) for ball_pos in ball_positions]
+        # The first ball, the only one in a regular game
+        self._ball = self._balls[0]
+
+        # Everything the balls can collide with, indexed by their keys in the collision grid
+        self._colliders = [self._player_one, self._player_two] + self._obstacles + self._balls
+        self._first_ball_key = 2 + len(self._obstacles)
+        # A single ball can only collide with the paddles, checking those directly
+        # is cheaper than keeping the grid up to date
+        self._grid = None
+        # Players who have scored with each of the balls during the sweep of the current tick
+        # (swept collisions only), the ball is stopped on the goal line so it can't bounce back
+        self._swept_scorers: list[PlayerIndex | None] = [None] * ball_count
+        if ball_count > 1 or len(self._obstacles) > 0:
+            self._grid = SpatialGrid(max(ball_size) * GRID_CELL_SCALE)
+            for key, collider in enumerate(self._colliders):
+                self._grid.insert(key, collider.get_position(), collider.get_scale())
+
+
+    """Advance the game to its next state, the equivalent of the player pressing SPACE
+    Does nothing while a round is in progress"""
+    def advance_state(self) -> None:
+        # Caching the state here to make the following conditionals
+        # a bit more readable and less cluttered
+        current_game_state = self._game_stats.current_game_state
+
+        # Advance the game to the start of the round
+        if current_game_state == GameState.GAME_START:
+            self._game_stats.current_game_state = GameState.ROUND_START
+
+        # Start the actual gameplay
+        if current_game_state == GameState.ROUND_START:
+            self._launch_ball()
+            self._game_stats.current_game_state = GameState.ROUND_IN_PROGRESS
+
+        # Reset all of the objects' positions and start a new round
+        if current_game_state == GameState.ROUND_END:
+            self._player_one.reset()
+            self._player_two.reset()
+            for ball in self._balls:
+                ball.reset()
+            self._game_stats.current_game_state = GameState.ROUND_START
+
+
+    """Advance the physics by delta_time seconds using the provided paddle directions
+    Does nothing unless a round is in progress"""
+    def step(self,
+             delta_time: float,
+             player_one_direction: PaddleDirection = PaddleDirection.NONE,
+             player_two_direction: PaddleDirection = PaddleDirection.NONE) -> None:
+        if self._game_stats.current_game_state != GameState.ROUND_IN_PROGRESS:
+            return
+
+        self._tick += 1
+        self._player_one.store_previous_position()
+        self._player_two.store_previous_position()
+        for ball in self._balls:
+            ball.store_previous_position()
+
+        self._move_paddle(self._player_one, player_one_direction, delta_time)
+        self._move_paddle(self._player_two, player_two_direction, delta_time)
+        if self._swept_collisions:
+            self._move_balls_swept(delta_time)
+        else:
+            self._move_balls(delta_time)
+        if self._grid is not None:
+            self._update_grid()
+        self._handle_collisions()
+        self._evaluate_score()
+
+
+
+    """Capture the complete state of the simulation (objects, game stats and the state
+    of the random number generator) so that it can later be restored by restore()
+    The snapshot is an opaque tuple and doesn't share any mutable data with the simulation"""
+    def snapshot(self) -> tuple:
+        game_stats = self._game_stats
+        return (
+            self._player_one.save_state(),
+            self._player_two.save_state(),
+            tuple(ball.save_state() for ball in self._balls),
+            game_stats.score,
+            game_stats.current_game_state,
+            game_stats.player_who_last_scored,
+            self._rng.getstate()
+        )
+
+
+    """Restore the state captured by snapshot()"""
+    def restore(self, snapshot: tuple) -> None:
+        player_one_state, player_two_state, ball_states, score, game_state, player_who_last_scored, rng_state = snapshot
+
+        self._player_one.load_state(player_one_state)
+        self._player_two.load_state(player_two_state)
+        for ball, ball_state in zip(self._balls, ball_states):
+            ball.load_state(ball_state)
+
+        game_stats = self._game_stats
+        game_stats.score = score
+        game_stats.current_game_state = game_state
+        game_stats.player_who_last_scored = player_who_last_scored
+        self._rng.setstate(rng_state)
+
+
+
+    def get_game_stats(self) -> GameStats:
+        return self._game_stats
+
+
+    def get_window_size(self) -> Tuple[int, int]:
+        return self._window_size
+
+
+    def has_swept_collisions(self) -> bool:
+        return self._swept_collisions
+
+
+    """Whether the sizes and speeds of the paddles and the ball are the default ones (the module's constants)
+    and the game is played with a single ball and no obstacles"""
+    def has_default_physics(self) -> bool:
+        return self._player_one.get_scale() == PADDLE_SIZE and self._paddle_speed == PADDLE_SPEED and \
+               self._ball_size == BALL_SIZE and self._ball_speed == BALL_SPEED and \
+               len(self._balls) == 1 and len(self._obstacles) == 0
+
+
+    def get_player_one(self) -> GameObject:
+        return self._player_one
+
+
+    def get_player_two(self) -> GameObject:
+        return self._player_two
+
+
+    """Returns the first ball, the only one unless the simulation has been created with several"""
+    def get_ball(self) -> Ball:
+        return self._ball
+
+
+    def get_balls(self) -> list[Ball]:
+        return self._balls
+
+
+    def get_obstacles(self) -> list[GameObject]:
+        return self._obstacles
+
+
+    # Give the balls some velocity so that they actually move around
+    # Randomize it a bit so that they always start a bit unexpectedly
+    def _launch_ball(self) -> None:
+        self._rally_start_tick = self._tick
+        for ball_index, ball in enumerate(self._balls):
+            x_velocity_sign = self._rng.randint(-1, 2)
+            x_velocity_multiplier = 1 if x_velocity_sign == 0 else x_velocity_sign
+            y_velocity_sign = self._rng.randint(-1, 2)
+            y_velocity_multiplier = 1 if y_velocity_sign == 0 else y_velocity_sign
+
+            ball.velocity = [self._ball_speed * x_velocity_multiplier, self._ball_speed * y_velocity_multiplier]
+            # The serve reports the velocity instead of the position
+            if self._game_stats.event_listener is not None:
+                self._game_stats.event_listener(MatchEvent(
+                    MatchEventType.SERVE,
+                    self._tick,
+                    PlayerIndex.PLAYER_ONE if x_velocity_multiplier < 0 else PlayerIndex.PLAYER_TWO,
+                    ball_index,
+                    ball.velocity[0],
+                    ball.velocity[1],
+                    0.0
+                ))
+
+
+    # Moves the paddle in the provided direction, unless that would move it past
+    # the top or bottom edge of the screen
+    def _move_paddle(self, paddle: GameObject, direction: PaddleDirection, delta_time: float) -> None:
+        paddle_y = paddle.get_y()
+
+        if direction == PaddleDirection.UP:
+            # Ensures that the paddle doesn't go "above" the visible screen
+            if paddle_y > 0:
+                # Multiply the speed by the current delta_time to ensure
+                # the same speed across all devices, regardless of the game's FPS
+                paddle.move((0, -self._paddle_speed * delta_time))
+        elif direction == PaddleDirection.DOWN:
+            # Ensures that the paddle doesn't go "below" the visible screen
+            # The paddle height must be added on top of the position
+            # because the paddle's origin point is at the top,
+            # not the bottom
+            if paddle_y + paddle.get_scale()[1] < self._window_size[1]:
+                paddle.move((0, self._paddle_speed * delta_time))
+
+
+    # Moves the balls and ensures that they bounce back from the top and bottom edges of the screen (if necessary)
+    def _move_balls(self, delta_time: float) -> None:
+        window_size = self._window_size
+        ball_size = self._ball_size
+
+        for ball_index, ball in enumerate(self._balls):
+            ball_y = ball.get_y()
+
+            # Revert Y velocity if the ball touches either the top of bottom edge of window respectively
+            # (it is necessary to add the ball's height to the bottom edge check because the origin
+            # of the ball is in the top left corner)
+            # The left and right edges aren't walls, a ball that gets past a paddle scores
+            if ball_y <= 0 or ball_y + ball_size[1] >= window_size[1]:
+                ball.reverse_velocity(1)
+                self._report_event(MatchEventType.WALL_BOUNCE, 0, ball_index, 1.0)
+
+            # Multiply the velocity by delta_time to make sure that the ball moves by the same speed
+            # across all devices, no matter how fast they are running the game
+            ball_velocity = ball.velocity
+            ball.move((
+                ball_velocity[0] * delta_time,
+                ball_velocity[1] * delta_time
+            ))
+
+
+    # Moves every ball along its path for the whole tick (see _move_ball_swept())
+    def _move_balls_swept(self, delta_time: float) -> None:
+        # The goal lines run through the centers of the paddles, same as in _evaluate_score()
+        goal_lines = (self._player_one.get_rect().center[0], self._player_two.get_rect().center[0])
+        for ball_index, ball in enumerate(self._balls):
+            self._swept_scorers[ball_index] = self._move_ball_swept(ball, ball_index, delta_time, goal_lines)
+
+
+    # Moves the ball along its path for the whole tick, bouncing it off of the top and bottom edges
+    # of the screen, the paddles and the obstacles at the exact moment it touches them
+    # If the center of the ball crosses one of the goal lines first, the ball is stopped there
+    # and the player who has scored is returned (None otherwise)
+    # The balls don't sweep against each other, they bounce off of each other in _handle_collisions()
+    def _move_ball_swept(self,
+                         ball: Ball,
+                         ball_index: int,
+                         delta_time: float,
+                         goal_lines: Tuple[int, int]) -> PlayerIndex | None:
+        # Bounced in place and written back to the ball at the end of the tick
+        ball_velocity = list(ball.velocity)
+        remaining_time = delta_time
+        # The paddles and the obstacles
+        static_colliders = self._colliders[:self._first_ball_key]
+
+        for _ in range(MAX_BOUNCES_PER_TICK):
+            ball_pos = ball.get_position()
+
+            # Find the first thing the ball hits during the rest of the tick
+            # Only the top and bottom edges are walls, the ball leaves through the sides
+            impact = sweep_bounds(ball_pos, self._ball_size, ball_velocity, self._window_size, remaining_time, axes=(1,))
+            # Key of the collider the ball hits, None for the edges of the screen
+            impact_key = None
+            for key, collider in enumerate(static_colliders):
+                collider_impact = sweep_aabb(ball_pos, self._ball_size, ball_velocity,
+                                             collider.get_position(), collider.get_scale(),
+                                             remaining_time)
+                if collider_impact is not None and (impact is None or collider_impact[0] < impact[0]):
+                    impact = collider_impact
+                    impact_key = key
+
+            # The ball scores if it reaches a goal line before hitting anything else
+            goal = self._sweep_goal_lines(ball_pos, ball_velocity[0], goal_lines)
+            if goal is not None and goal[0] <= remaining_time and (impact is None or goal[0] < impact[0]):
+                time_to_goal, player_who_scored = goal
+                ball.move((ball_velocity[0] * time_to_goal, ball_velocity[1] * time_to_goal))
+                ball.velocity = ball_velocity
+                return player_who_scored
+
+            if impact is None:
+                break
+
+            # Move the ball up to the point of contact and bounce it off
+            time_of_impact, axis = impact
+            ball.move((ball_velocity[0] * time_of_impact, ball_velocity[1] * time_of_impact))
+            ball_velocity[axis] *= -1
+            remaining_time -= time_of_impact
+
+            if impact_key is None:
+                self._report_event(MatchEventType.WALL_BOUNCE, 0, ball_index, float(axis))
+            elif impact_key == PLAYER_ONE_KEY:
+                self._report_paddle_hit(PlayerIndex.PLAYER_ONE, ball_index)
+            elif impact_key == PLAYER_TWO_KEY:
+                self._report_paddle_hit(PlayerIndex.PLAYER_TWO, ball_index)
+
+        ball.move((ball_velocity[0] * remaining_time, ball_velocity[1] * remaining_time))
+        ball.velocity = ball_velocity
+        return None
+
+
+    # Computes when the center of the ball moving at 'velocity_x' reaches the goal line it's heading towards
+    # Returns Tuple(time, player_who_scored), a ball that's already past the line reaches it immediately
+    def _sweep_goal_lines(self,
+                          ball_pos: Tuple[float, float],
+                          velocity_x: float,
+                          goal_lines: Tuple[int, int]) -> Tuple[float, PlayerIndex] | None:
+        ball_center_x = ball_pos[0] + self._ball_size[0] / 2
+        if velocity_x < 0:
+            return (max((goal_lines[0] - ball_center_x) / velocity_x, 0.0), PlayerIndex.PLAYER_TWO)
+        if velocity_x > 0:
+            return (max((goal_lines[1] - ball_center_x) / velocity_x, 0.0), PlayerIndex.PLAYER_ONE)
+        return None
+
+
+    # Brings the collision grid up to date with the positions of the paddles and the balls
+    # Done every tick (instead of on every move) so that moves made from outside
+    # of the simulation are picked up as well
+    def _update_grid(self) -> None:
+        grid = self._grid
+        colliders = self._colliders
+        grid.move(PLAYER_ONE_KEY, self._player_one.get_position())
+        grid.move(PLAYER_TWO_KEY, self._player_two.get_position())
+        for key in range(self._first_ball_key, len(colliders)):
+            grid.move(key, colliders[key].get_position())
+
+
+    # Bounces the balls back if they collide with a paddle, an obstacle or another ball
+    # Only the objects sharing a cell of the collision grid with a ball are checked against it
+    def _handle_collisions(self) -> None:
+        grid = self._grid
+        if grid is None:
+            self._bounce_off_paddles(self._ball, 0)
+            return
+
+        colliders = self._colliders
+        first_ball_key = self._first_ball_key
+
+        for ball_key in range(first_ball_key, len(colliders)):
+            ball = colliders[ball_key]
+            neighbors = grid.get_neighbors(ball_key)
+            if PLAYER_ONE_KEY in neighbors or PLAYER_TWO_KEY in neighbors:
+                self._bounce_off_paddles(ball, ball_key - first_ball_key)
+
+            # The neighbors are checked in the order of their keys, which keeps the outcome
+            # independent of the order in which they were added to the grid
+            for key in sorted(neighbors):
+                if key > ball_key:
+                    self._bounce_off_ball(ball, colliders[key])
+                elif PLAYER_TWO_KEY < key < first_ball_key:
+                    self._bounce_off_obstacle(ball, colliders[key])
+
+
+    # Bounces the ball back if it collides with a paddle
+    def _bounce_off_paddles(self, ball: Ball, ball_index: int) -> None:
+        ball_rect = ball.get_rect()
+        ball_velocity = ball.velocity
+
+        if self._swept_collisions:
+            # The ball has already been bounced off of the paddles it ran into,
+            # so this only catches a paddle moving into the ball from above or below
+            # The ball is only bounced if it's heading towards the paddle, otherwise
+            # it'd keep flipping its direction every tick while the two overlap
+            if ball_velocity[0] < 0 and ball_rect.colliderect(self._player_one.get_rect()):
+                ball.reverse_velocity(0)
+                self._report_paddle_hit(PlayerIndex.PLAYER_ONE, ball_index)
+            elif ball_velocity[0] > 0 and ball_rect.colliderect(self._player_two.get_rect()):
+                ball.reverse_velocity(0)
+                self._report_paddle_hit(PlayerIndex.PLAYER_TWO, ball_index)
+            return
+
+        if ball_rect.colliderect(self._player_one.get_rect()):
+            ball.reverse_velocity(0)
+            self._report_paddle_hit(PlayerIndex.PLAYER_ONE, ball_index)
+        elif ball_rect.colliderect(self._player_two.get_rect()):
+            ball.reverse_velocity(0)
+            self._report_paddle_hit(PlayerIndex.PLAYER_TWO, ball_index)
+
+
+    # Bounces the ball back if it collides with the obstacle
+    # The ball is bounced along the axis it has entered the obstacle the least on
+    # and only if it's heading into the obstacle, so that it doesn't keep flipping its direction
+    # every tick while the two overlap
+    def _bounce_off_obstacle(self, ball: Ball, obstacle: GameObject) -> None:
+        ball_rect = ball.get_rect()
+        obstacle_rect = obstacle.get_rect()
+        if not ball_rect.colliderect(obstacle_rect):
+            return
+
+        overlap_x = min(ball_rect.right, obstacle_rect.right) - max(ball_rect.left, obstacle_rect.left)
+        overlap_y = min(ball_rect.bottom, obstacle_rect.bottom) - max(ball_rect.top, obstacle_rect.top)
+        axis = 0 if overlap_x < overlap_y else 1
+
+        offset = ball_rect.center[axis] - obstacle_rect.center[axis]
+        if ball.velocity[axis] * offset < 0:
+            ball.reverse_velocity(axis)
+
+
+    # Bounces two colliding balls off of each other
+    # The balls have the same mass, so the bounce swaps their velocities along the axis
+    # they overlap the least on. The balls are only bounced if they're heading towards
+    # each other along that axis, so that they don't keep bouncing while they overlap
+    def _bounce_off_ball(self, ball: Ball, other_ball: Ball) -> None:
+        ball_size = self._ball_size
+        offset_x = other_ball.get_x() - ball.get_x()
+        offset_y = other_ball.get_y() - ball.get_y()
+        overlap_x = ball_size[0] - abs(offset_x)
+        overlap_y = ball_size[1] - abs(offset_y)
+        if overlap_x <= 0 or overlap_y <= 0:
+            return
+
+        ball_velocity = ball.velocity
+        other_ball_velocity = other_ball.velocity
+        if overlap_x < overlap_y:
+            if (other_ball_velocity[0] - ball_velocity[0]) * offset_x < 0:
+                ball.velocity = (other_ball_velocity[0], ball_velocity[1])
+                other_ball.velocity = (ball_velocity[0], other_ball_velocity[1])
+        elif (other_ball_velocity[1] - ball_velocity[1]) * offset_y < 0:
+            ball.velocity = (ball_velocity[0], other_ball_velocity[1])
+            other_ball.velocity = (other_ball_velocity[0], ball_velocity[1])
+
+
+    # Checks if a ball has moved to the same level as the paddles (or has crossed a goal line during its sweep)
+    # If so, it evaluates who has scored a point (the first such ball ends the round)
+    def _evaluate_score(self) -> None:
+        game_stats = self._game_stats
+        score = list(game_stats.score)
+
+        player_one_pos_x = self._player_one.get_rect().center[0]
+        player_two_pos_x = self._player_two.get_rect().center[0]
+
+        has_score_changed = False
+        player_who_scored: PlayerIndex = 0
+
+        for ball_index, ball in enumerate(self._balls):
+            ball_pos_x = ball.get_rect().center[0]
+            swept_scorer = self._swept_scorers[ball_index] if self._swept_collisions else None
+
+            if ball_pos_x <= player_one_pos_x or swept_scorer == PlayerIndex.PLAYER_TWO:
+                score[0] += 1
+                has_score_changed = True
+                player_who_scored = PlayerIndex.PLAYER_TWO
+                break
+            elif ball_pos_x >= player_two_pos_x or swept_scorer == PlayerIndex.PLAYER_ONE:
+                score[1] += 1
+                has_score_changed = True
+                player_who_scored = PlayerIndex.PLAYER_ONE
+                break
+
+        if has_score_changed:
+            self._report_event(MatchEventType.POINT, player_who_scored, ball_index,
+                               float(self._tick - self._rally_start_tick))
+            game_stats.score = tuple(score)
+            game_stats.player_who_last_scored = player_who_scored
+            game_stats.current_game_state = GameState.ROUND_END
+            for ball in self._balls:
+                ball.velocity = [0.0, 0.0]
+
+
+    # Reports that the ball has hit the paddle of the player, along with where on the paddle it has hit it
+    def _report_paddle_hit(self, player: PlayerIndex, ball_index: int) -> None:
+        if self._game_stats.event_listener is None:
+            return
+
+        paddle = self._player_one if player == PlayerIndex.PLAYER_ONE else self._player_two
+        paddle_height = paddle.get_scale()[1]
+        ball_center_y = self._balls[ball_index].get_y() + self._ball_size[1] / 2
+        # The ball touches the paddle as long as their centers are less than half of their heights apart
+        reach = (paddle_height + self._ball_size[1]) / 2
+        offset = (ball_center_y - (paddle.get_y() + paddle_height / 2)) / reach
+        self._report_event(MatchEventType.PADDLE_HIT, player, ball_index, min(1.0, max(-1.0, offset)))
+
+
+    # Passes the event that has happened to the ball to the listener of the GameStats (if there is one)
+    def _report_event(self, event_type: MatchEventType, player: PlayerIndex | int, ball_index: int, value: float) -> None:
+        listener = self._game_stats.event_listener
+        if listener is None:
+            return
+
+        ball = self._balls[ball_index]
+        listener(MatchEvent(
+            event_type,
+            self._tick,
+            player,
+            ball_index,
+            ball.get_x() + self._ball_size[0] / 2,
+            ball.get_y() + self._ball_size[1] / 2,
+            value
+        ))
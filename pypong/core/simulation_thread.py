@@ -0,0 +1,223 @@
+import threading
+import time
+from typing import Callable, Tuple
+from pypong.core.game_stats import GameState, GameStats
+from pypong.core.simulation import PaddleDirection, Simulation
+
+
+"""Signature of the function that advances the game by a single tick on the simulation thread
+Receives the delta_time of the tick, the directions of the paddles forwarded by the main thread
+and the amount of times SPACE has been pressed since the previous tick"""
+TickFunction = Callable[[float, Tuple[PaddleDirection, PaddleDirection], int], None]
+
+
+"""Struct holding the state of the simulation after a tick, everything the renderer needs to draw a frame
+The states of the objects are in the format of GameObject.save_state() and include their positions
+at the end of the previous tick, so the frame can be interpolated"""
+class SimulationFrame:
+    def __init__(self, simulation: Simulation) -> None:
+        """Amount of ticks the simulation thread had run when the frame was captured"""
+        self.tick = 0
+        """time.perf_counter() of the moment the frame was captured"""
+        self.time = 0.0
+        self.player_one = simulation.get_player_one().save_state()
+        self.player_two = simulation.get_player_two().save_state()
+        self.balls = [ball.save_state() for ball in simulation.get_balls()]
+        """Copy of the simulation's GameStats (without the event listener)"""
+        self.game_stats = GameStats()
+
+
+    """Copy the current state of the simulation into the frame, reusing its arrays"""
+    def capture(self, simulation: Simulation, tick: int) -> None:
+        self.tick = tick
+        self.time = time.perf_counter()
+        simulation.get_player_one().save_state_into(self.player_one)
+        simulation.get_player_two().save_state_into(self.player_two)
+        for ball, ball_state in zip(simulation.get_balls(), self.balls):
+            ball.save_state_into(ball_state)
+
+        game_stats = simulation.get_game_stats()
+        self.game_stats.score = game_stats.score
+        self.game_stats.current_game_state = game_stats.current_game_state
+        self.game_stats.player_who_last_scored = game_stats.player_who_last_scored
+
+
+"""Class that hands over values from a single writer thread to a single reader thread
+through three preallocated slots, without either of them ever waiting for the other
+
+The writer fills in the back slot and publishes it, which swaps it with the middle slot.
+The reader takes the newest published slot by swapping the middle slot with its front slot.
+The only shared state is the middle slot, swapped under a lock held just for the swap,
+so the slot the reader is holding is never written to and the slot the writer is filling
+is never read, no matter how long either of them takes."""
+class TripleBuffer:
+    def __init__(self, back, middle, front) -> None:
+        self._back = back
+        self._middle = middle
+        self._front = front
+        # Whether the middle slot holds a value the reader hasn't taken yet
+        self._has_new_value = False
+        self._lock = threading.Lock()
+
+
+    """Make the filled in back slot the newest value, the writer gets a new back slot to fill in"""
+    def publish(self) -> None:
+        with self._lock:
+            self._back, self._middle = self._middle, self._back
+            self._has_new_value = True
+
+
+    """Returns the newest published value, or the previously returned one if nothing new has been published
+    The returned value stays untouched until the next call"""
+    def acquire(self):
+        with self._lock:
+            if self._has_new_value:
+                self._middle, self._front = self._front, self._middle
+                self._has_new_value = False
+        return self._front
+
+
+
+    """Returns the slot the writer fills in (only to be used by the writer)"""
+    def get_back(self):
+        return self._back
+
+
+"""Class that steps a Simulation on its own thread at a fixed rate, independently of the rendering
+Every tick is run by the provided TickFunction, with the input forwarded by the main thread
+(see set_directions() and request_advance()), after which the state of the simulation
+is published as a SimulationFrame through a TripleBuffer. The main thread only reads
+the newest frame (see get_newest_frame()) and never touches the simulation while the thread is running.
+
+Ticks happen every 1 / tick_rate seconds of real time, however long the frames take to render.
+If the thread falls behind (eg. when the CPU is busy), it catches up by running the missed ticks
+right away, as long as it's no more than 'max_frame_time' seconds behind.
+While the game is idle (a round isn't in progress), nothing moves, so the thread sleeps
+until SPACE is pressed instead of ticking."""
+class SimulationThread:
+    def __init__(self,
+                 simulation: Simulation,
+                 tick_function: TickFunction,
+                 tick_rate: int = 120,
+                 max_frame_time: float = 0.25) -> None:
+        self._simulation = simulation
+        self._tick_function = tick_function
+        self._tick_time = 1 / tick_rate
+        self._max_frame_time = max_frame_time
+
+        self._frames = TripleBuffer(SimulationFrame(simulation), SimulationFrame(simulation), SimulationFrame(simulation))
+        # The state before the first tick, so that there's something to render right away
+        self._frames.get_back().capture(simulation, 0)
+        self._frames.publish()
+        self._tick_count = 0
+
+        # Input forwarded by the main thread, guarded by the condition
+        # The directions are replaced as a whole, the advances are only subtracted
+        # once the tick they've been applied in has been published
+        self._condition = threading.Condition()
+        self._directions = (PaddleDirection.NONE, PaddleDirection.NONE)
+        self._pending_advances = 0
+        self._is_stopping = False
+        # Exception that has stopped the thread, raised again on the main thread
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run, name="SimulationThread", daemon=True)
+
+
+    """Start ticking the simulation"""
+    def start(self) -> None:
+        self._thread.start()
+
+
+    """Stop ticking and wait for the thread to finish its current tick"""
+    def stop(self) -> None:
+        with self._condition:
+            self._is_stopping = True
+            self._condition.notify()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+    """Set the directions the paddles are moved in by the keyboard from the next tick on"""
+    def set_directions(self, player_one_direction: PaddleDirection, player_two_direction: PaddleDirection) -> None:
+        with self._condition:
+            self._directions = (player_one_direction, player_two_direction)
+
+
+    """Pass a press of SPACE to the next tick, waking the thread up if the game is idle"""
+    def request_advance(self) -> None:
+        with self._condition:
+            self._pending_advances += 1
+            self._condition.notify()
+
+
+
+    """Returns the SimulationFrame of the last tick, it stays untouched until the next call
+    Raises a RuntimeError if the thread has been stopped by an exception"""
+    def get_newest_frame(self) -> SimulationFrame:
+        if self._error is not None:
+            raise RuntimeError("The simulation thread has stopped") from self._error
+        return self._frames.acquire()
+
+
+    """Whether there are SPACE presses that haven't been shown in a published frame yet"""
+    def has_pending_advances(self) -> bool:
+        return self._pending_advances > 0
+
+
+    def get_tick_time(self) -> float:
+        return self._tick_time
+
+
+    def get_tick_count(self) -> int:
+        return self._tick_count
+
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+
+    # Body of the thread, keeps the exception that has stopped it (if any) for the main thread
+    def _run(self) -> None:
+        try:
+            self._tick_loop()
+        except BaseException as error:
+            self._error = error
+
+
+    # Ticks the simulation at the fixed rate until the thread is stopped
+    def _tick_loop(self) -> None:
+        simulation = self._simulation
+        game_stats = simulation.get_game_stats()
+        tick_time = self._tick_time
+        next_tick_time = time.perf_counter()
+
+        while True:
+            with self._condition:
+                # Nothing moves outside of a round, so there's nothing to tick until SPACE is pressed
+                while not self._is_stopping and self._pending_advances == 0 and \
+                      game_stats.current_game_state != GameState.ROUND_IN_PROGRESS:
+                    self._condition.wait()
+                    # The time spent waiting isn't simulated
+                    next_tick_time = time.perf_counter()
+                if self._is_stopping:
+                    return
+                directions = self._directions
+                advance_count = self._pending_advances
+
+            self._tick_function(tick_time, directions, advance_count)
+            self._tick_count += 1
+            self._frames.get_back().capture(simulation, self._tick_count)
+            self._frames.publish()
+            with self._condition:
+                self._pending_advances -= advance_count
+
+            # Schedule the next tick relative to the previous one to keep a steady rate,
+            # unless the thread has fallen too far behind, in which case the missed ticks are dropped
+            next_tick_time += tick_time
+            current_time = time.perf_counter()
+            if current_time - next_tick_time > self._max_frame_time:
+                next_tick_time = current_time
+            sleep_time = next_tick_time - current_time
+            if sleep_time > 0:
+                time.sleep(sleep_time)
@@ -0,0 +1,70 @@
+from enum import Enum
+from typing import Callable
+import pygame.surface
+from pypong.core.game_stats import GameState
+
+
+"""Enum of the ways the game can be updated while it's in a state"""
+class UpdatePolicy(Enum):
+    # Things move every tick, the game is updated and rendered continuously
+    CONTINUOUS = 0
+    # Nothing changes until an event (eg. a key press) arrives, so the game
+    # waits for events and only renders the state once
+    ON_EVENT = 1
+
+
+"""Struct describing how the game behaves and what it displays in a single GameState"""
+class StateHandler:
+    def __init__(self,
+                 update_policy: UpdatePolicy,
+                 render_layer: Callable[[pygame.surface.Surface], None],
+                 shows_playing_field: bool = True,
+                 on_enter: Callable[[], None] = None,
+                 on_exit: Callable[[], None] = None) -> None:
+        self.update_policy = update_policy
+        """Renders everything that doesn't move in the state onto the provided (layer) Surface"""
+        self.render_layer = render_layer
+        """Whether the score, the paddles and the ball are drawn on top of the layer"""
+        self.shows_playing_field = shows_playing_field
+        """Called when the game enters the state"""
+        self.on_enter = on_enter
+        """Called when the game leaves the state"""
+        self.on_exit = on_exit
+
+
+"""Class that keeps track of the GameState the game is in and runs the enter and exit hooks of the states
+The Simulation decides when the state changes (SPACE, someone scoring), the state machine
+picks those changes up whenever it's synchronized with the current state"""
+class GameStateMachine:
+    def __init__(self, handlers: dict[GameState, StateHandler], initial_state: GameState) -> None:
+        self._handlers = handlers
+        self._state = initial_state
+        self._handler = handlers[initial_state]
+
+        if self._handler.on_enter is not None:
+            self._handler.on_enter()
+
+
+    """Switch to the provided state, running the exit hook of the current state and the enter hook of the new one
+    Returns True if the state has changed"""
+    def sync(self, game_state: GameState) -> bool:
+        if game_state == self._state:
+            return False
+
+        if self._handler.on_exit is not None:
+            self._handler.on_exit()
+
+        self._state = game_state
+        self._handler = self._handlers[game_state]
+        if self._handler.on_enter is not None:
+            self._handler.on_enter()
+        return True
+
+
+
+    def get_state(self) -> GameState:
+        return self._state
+
+
+    def get_handler(self) -> StateHandler:
+        return self._handler
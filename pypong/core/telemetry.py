@@ -0,0 +1,200 @@
+import array
+import os
+import struct
+import sys
+from pypong.core.game_stats import MatchEvent
+
+
+# Columns of the event records: name, array typecode and NumPy dtype of the values
+# Every value has a fixed width, the first column is the ID of the match the event belongs to,
+# the rest are the fields of MatchEvent in the same order
+EVENT_COLUMNS = (
+    ("match", "I", "<u4"),
+    ("event_type", "B", "<u1"),
+    ("tick", "I", "<u4"),
+    ("player", "B", "<u1"),
+    ("ball", "H", "<u2"),
+    ("x", "f", "<f4"),
+    ("y", "f", "<f4"),
+    ("value", "f", "<f4"),
+)
+
+# Every column file starts with a header: magic bytes, version of the format and the width of the values
+COLUMN_HEADER = struct.Struct("<8sHH4x")
+COLUMN_MAGIC = b"PYPONGEV"
+COLUMN_VERSION = 1
+COLUMN_EXTENSION = ".col"
+
+
+"""Class that collects the events of a single match in memory, column by column
+Its record() method is meant to be set as the GameStats.event_listener of the match's Simulation,
+the collected events are then handed over to a TelemetryWriter.
+The columns are arrays of plain values, so a recorder is cheap to send between processes."""
+class EventRecorder:
+    def __init__(self) -> None:
+        # One array per column of EVENT_COLUMNS, except for the match ID which is assigned by the writer
+        self._columns = [array.array(typecode) for _, typecode, _ in EVENT_COLUMNS[1:]]
+
+
+    """Add the event to the recorded ones"""
+    def record(self, event: MatchEvent) -> None:
+        for column, value in zip(self._columns, event):
+            column.append(value)
+
+
+    """Throw away every recorded event"""
+    def clear(self) -> None:
+        for column in self._columns:
+            del column[:]
+
+
+
+    def get_event_count(self) -> int:
+        return len(self._columns[0])
+
+
+    """Returns the arrays of the recorded values, in the order of EVENT_COLUMNS (without the match ID)"""
+    def get_columns(self) -> list[array.array]:
+        return self._columns
+
+
+"""Class that appends the events of matches to a telemetry store
+
+The store is a directory with one file per column of EVENT_COLUMNS, every file holds
+the values of its column for all of the events, one after another and without any separators.
+The event at index N is made up of the Nth value of every column, so a column can be read
+(or memory-mapped, see pypong.core.telemetry_query) on its own and at any offset.
+
+The files are only ever appended to: every appended match gets the next match ID and its
+events are written after the existing ones. The events are buffered until 'buffer_size'
+of them are waiting (or until flush() or close() is called).
+Events cut short by a crash during a write (a column holding more values than the others)
+are dropped when the store is opened again."""
+class TelemetryWriter:
+    def __init__(self, directory: str, buffer_size: int = 65536) -> None:
+        self._directory = directory
+        self._buffer_size = buffer_size
+
+        os.makedirs(directory, exist_ok=True)
+        event_count = self._prepare_columns()
+        self._next_match_id = self._read_last_match_id(event_count) + 1 if event_count > 0 else 0
+
+        self._pending_columns = [array.array(typecode) for _, typecode, _ in EVENT_COLUMNS]
+        self._files = [open(get_column_path(directory, name), "ab") for name, _, _ in EVENT_COLUMNS]
+
+
+    """Append the events collected by the recorder as a new match
+    Returns the ID of the match"""
+    def append(self, recorder: EventRecorder) -> int:
+        match_id = self._next_match_id
+        self._next_match_id += 1
+
+        match_column, *pending_columns = self._pending_columns
+        match_column.extend(array.array(match_column.typecode, (match_id,)) * recorder.get_event_count())
+        for pending_column, column in zip(pending_columns, recorder.get_columns()):
+            pending_column.extend(column)
+
+        if len(match_column) >= self._buffer_size:
+            self.flush()
+        return match_id
+
+
+    """Write the buffered events into the files"""
+    def flush(self) -> None:
+        for column_file, pending_column in zip(self._files, self._pending_columns):
+            # The values are always stored as little-endian
+            if sys.byteorder == "big":
+                pending_column.byteswap()
+            pending_column.tofile(column_file)
+            column_file.flush()
+            del pending_column[:]
+
+
+    """Write the buffered events and close the files"""
+    def close(self) -> None:
+        if self._files is None:
+            return
+
+        self.flush()
+        for column_file in self._files:
+            column_file.close()
+        self._files = None
+
+
+    def __enter__(self) -> "TelemetryWriter":
+        return self
+
+
+    def __exit__(self, exception_type, exception, traceback) -> None:
+        self.close()
+
+
+
+    def get_directory(self) -> str:
+        return self._directory
+
+
+    """Returns the amount of matches in the store, including the ones still waiting in the buffer"""
+    def get_match_count(self) -> int:
+        return self._next_match_id
+
+
+    # Creates the missing column files and drops the values of the events
+    # that haven't been written into every column
+    # Returns the amount of events in the store
+    def _prepare_columns(self) -> int:
+        for name, typecode, _ in EVENT_COLUMNS:
+            path = get_column_path(self._directory, name)
+            if not os.path.exists(path):
+                with open(path, "wb") as column_file:
+                    column_file.write(COLUMN_HEADER.pack(COLUMN_MAGIC, COLUMN_VERSION, array.array(typecode).itemsize))
+
+        event_count = read_event_count(self._directory)
+        for name, typecode, _ in EVENT_COLUMNS:
+            path = get_column_path(self._directory, name)
+            column_size = COLUMN_HEADER.size + event_count * array.array(typecode).itemsize
+            if os.path.getsize(path) > column_size:
+                os.truncate(path, column_size)
+        return event_count
+
+
+    # Reads the match ID of the last event in the store
+    def _read_last_match_id(self, event_count: int) -> int:
+        name, typecode, _ = EVENT_COLUMNS[0]
+        item_size = array.array(typecode).itemsize
+        with open(get_column_path(self._directory, name), "rb") as column_file:
+            column_file.seek(COLUMN_HEADER.size + (event_count - 1) * item_size)
+            last_match_id = array.array(typecode, column_file.read(item_size))
+        if sys.byteorder == "big":
+            last_match_id.byteswap()
+        return last_match_id[0]
+
+
+"""Returns the path of the file of the column in the telemetry store"""
+def get_column_path(directory: str, name: str) -> str:
+    return os.path.join(directory, name + COLUMN_EXTENSION)
+
+
+"""Returns the amount of events stored in every column of the telemetry store
+Values of events that haven't been written into every column are not counted
+Raises a ValueError if a column file is missing or isn't a column of the store"""
+def read_event_count(directory: str) -> int:
+    event_count = None
+    for name, typecode, _ in EVENT_COLUMNS:
+        path = get_column_path(directory, name)
+        if not os.path.exists(path):
+            raise ValueError(f"'{directory}' is missing the column '{name}'")
+
+        with open(path, "rb") as column_file:
+            header = column_file.read(COLUMN_HEADER.size)
+        if len(header) < COLUMN_HEADER.size:
+            raise ValueError(f"'{path}' isn't a telemetry column")
+        magic, version, item_size = COLUMN_HEADER.unpack(header)
+        if magic != COLUMN_MAGIC or item_size != array.array(typecode).itemsize:
+            raise ValueError(f"'{path}' isn't a telemetry column")
+        if version != COLUMN_VERSION:
+            raise ValueError(f"'{path}' has an unsupported version {version}")
+
+        column_event_count = (os.path.getsize(path) - COLUMN_HEADER.size) // item_size
+        event_count = column_event_count if event_count is None else min(event_count, column_event_count)
+    return event_count
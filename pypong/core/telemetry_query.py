@@ -0,0 +1,149 @@
+from typing import Iterator, Tuple
+import numpy as np
+from pypong.core.game_stats import MatchEventType, PlayerIndex
+from pypong.core.telemetry import COLUMN_HEADER, EVENT_COLUMNS, get_column_path, read_event_count
+
+
+# Amount of events the aggregates are computed over at once, bounds the memory of their temporary arrays
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+
+"""Class that gives read-only access to the events of a telemetry store (see TelemetryWriter)
+Every column is memory-mapped as a NumPy array, so opening a store doesn't read it:
+the operating system only loads the parts of the files that are actually accessed.
+Events appended to the store after it has been opened aren't visible, open it again to see them.
+Requires NumPy"""
+class TelemetryStore:
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+        self._event_count = read_event_count(directory)
+
+        # dict({key: str=column name, value: numpy.ndarray=values of the column})
+        self._columns = dict()
+        for name, _, dtype in EVENT_COLUMNS:
+            if self._event_count == 0:
+                # Empty files can't be memory-mapped
+                self._columns[name] = np.zeros(0, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(get_column_path(directory, name), dtype=dtype, mode="r",
+                                                offset=COLUMN_HEADER.size, shape=(self._event_count,))
+
+
+    """Returns the ranges (start, stop) of the events in chunks of about 'chunk_size' events
+    The chunks are split right before the serve of a rally, so that no rally is split between two chunks
+    (unless a single rally has more than 'chunk_size' events)"""
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, int]]:
+        event_types = self._columns["event_type"]
+        balls = self._columns["ball"]
+
+        start = 0
+        while start < self._event_count:
+            stop = min(start + chunk_size, self._event_count)
+            if stop < self._event_count:
+                rally_starts = np.flatnonzero(_get_rally_starts(event_types[start + 1:stop], balls[start + 1:stop]))
+                if len(rally_starts) > 0:
+                    stop = start + 1 + int(rally_starts[-1])
+            yield start, stop
+            start = stop
+
+
+
+    def get_directory(self) -> str:
+        return self._directory
+
+
+    def get_event_count(self) -> int:
+        return self._event_count
+
+
+    """Returns the amount of matches in the store (the match IDs go from 0 up to it)"""
+    def get_match_count(self) -> int:
+        return int(self._columns["match"][-1]) + 1 if self._event_count > 0 else 0
+
+
+    """Returns the memory-mapped values of the column, see EVENT_COLUMNS for the available ones"""
+    def get_column(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+
+"""Returns the amount of finished rallies of every length (in ticks), indexed by the length"""
+def rally_length_histogram(store: TelemetryStore, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    histogram = np.zeros(0, dtype=np.int64)
+    for start, stop in store.iter_chunks(chunk_size):
+        event_types = store.get_column("event_type")[start:stop]
+        rally_lengths = store.get_column("value")[start:stop][event_types == MatchEventType.POINT]
+        histogram = _add_histograms(histogram, np.bincount(rally_lengths.astype(np.int64)))
+    return histogram
+
+
+"""Returns the amount of finished rallies with every amount of paddle hits, indexed by the amount"""
+def rally_hit_histogram(store: TelemetryStore, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    histogram = np.zeros(0, dtype=np.int64)
+    for start, stop in store.iter_chunks(chunk_size):
+        event_types = store.get_column("event_type")[start:stop]
+        balls = store.get_column("ball")[start:stop]
+
+        # Number of the rally every event belongs to within the chunk,
+        # events before the first serve of the chunk belong to a rally cut by the chunk (-1)
+        rally_starts = _get_rally_starts(event_types, balls)
+        rally_numbers = np.cumsum(rally_starts, dtype=np.int64) - 1
+        rally_count = int(rally_numbers[-1]) + 1
+
+        is_counted = rally_numbers >= 0
+        hit_counts = np.bincount(rally_numbers[is_counted & (event_types == MatchEventType.PADDLE_HIT)],
+                                 minlength=rally_count)
+        finished_rallies = rally_numbers[is_counted & (event_types == MatchEventType.POINT)]
+        histogram = _add_histograms(histogram, np.bincount(hit_counts[finished_rallies]))
+    return histogram
+
+
+"""Returns the histogram of where the balls have hit the paddles (from -1, the top edge, to 1, the bottom one)
+as the amounts of hits in each of the 'bin_count' equally wide bins and the edges of the bins
+Only the hits of the provided player's paddle are counted, unless it's None"""
+def hit_position_histogram(store: TelemetryStore,
+                           bin_count: int = 20,
+                           player: PlayerIndex = None,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    counts = np.zeros(bin_count, dtype=np.int64)
+    edges = np.linspace(-1.0, 1.0, bin_count + 1)
+    for start, stop in store.iter_chunks(chunk_size):
+        is_hit = store.get_column("event_type")[start:stop] == MatchEventType.PADDLE_HIT
+        if player is not None:
+            is_hit &= store.get_column("player")[start:stop] == player
+        counts += np.histogram(store.get_column("value")[start:stop][is_hit], edges)[0]
+    return counts, edges
+
+
+"""Returns the amount of serves in each direction
+The first index is the horizontal direction (0 - left, 1 - right), the second the vertical one (0 - up, 1 - down)"""
+def serve_direction_counts(store: TelemetryStore, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    counts = np.zeros((2, 2), dtype=np.int64)
+    for start, stop in store.iter_chunks(chunk_size):
+        is_serve = store.get_column("event_type")[start:stop] == MatchEventType.SERVE
+        horizontal = store.get_column("x")[start:stop][is_serve] > 0
+        vertical = store.get_column("y")[start:stop][is_serve] > 0
+        counts += np.bincount(horizontal * 2 + vertical, minlength=4).reshape(2, 2)
+    return counts
+
+
+"""Returns the amount of points scored by player one and player two respectively"""
+def point_counts(store: TelemetryStore, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[int, int]:
+    counts = np.zeros(3, dtype=np.int64)
+    for start, stop in store.iter_chunks(chunk_size):
+        is_point = store.get_column("event_type")[start:stop] == MatchEventType.POINT
+        counts += np.bincount(store.get_column("player")[start:stop][is_point], minlength=3)
+    return int(counts[PlayerIndex.PLAYER_ONE]), int(counts[PlayerIndex.PLAYER_TWO])
+
+
+# Returns a mask of the events starting a rally, the serves of the first ball
+# (every ball is served at the start of a rally)
+def _get_rally_starts(event_types: np.ndarray, balls: np.ndarray) -> np.ndarray:
+    return (event_types == MatchEventType.SERVE) & (balls == 0)
+
+
+# Adds up two histograms of possibly different lengths
+def _add_histograms(histogram: np.ndarray, other_histogram: np.ndarray) -> np.ndarray:
+    if len(other_histogram) > len(histogram):
+        histogram, other_histogram = other_histogram.astype(np.int64), histogram
+    histogram[:len(other_histogram)] += other_histogram
+    return histogram
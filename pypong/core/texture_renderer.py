@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING, Callable, Hashable
+import pygame.rect
+if TYPE_CHECKING:
+    from pypong.core.accelerated_window import AcceleratedGameWindow
+    from pypong.core.offscreen_window import OffscreenWindow
+
+
+"""Class that presents the frames of an AcceleratedGameWindow (or an OffscreenWindow)
+Counterpart of DirtyRectRenderer with the same interface: with Textures, redrawing the whole frame
+is cheaper than keeping track of which parts of it have changed, so every frame is drawn in full
+and the tracked areas are ignored. Frames rendered off-screen are never shown, so they're drawn in full as well."""
+class TextureRenderer:
+    def __init__(self, window: "AcceleratedGameWindow | OffscreenWindow") -> None:
+        self._window = window
+
+
+    """Kept for compatibility with DirtyRectRenderer, every frame is repainted anyway"""
+    def invalidate(self) -> None:
+        pass
+
+
+    """Kept for compatibility with DirtyRectRenderer, the moving objects don't need to be tracked"""
+    def track(self, key: Hashable, rect: pygame.rect.Rect) -> None:
+        pass
+
+
+    """Kept for compatibility with DirtyRectRenderer, every frame is repainted anyway"""
+    def mark_dirty(self, rect: pygame.rect.Rect) -> None:
+        pass
+
+
+    """Draw the frame and show it on the screen
+    'draw_scene' draws the entire frame (background included)"""
+    def present(self, scene: Hashable, draw_scene: Callable[[], None]) -> None:
+        draw_scene()
+        self._update_display()
+
+
+    # Shows the drawn frame on the screen
+    def _update_display(self) -> None:
+        self._window.present()
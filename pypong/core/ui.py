@@ -1,6 +1,8 @@
+from collections import OrderedDict
 from typing import Tuple
 import pygame.surface
 import pygame.font
+import pygame.locals
 
 
 """Struct that represents a single line of text"""
@@ -21,37 +23,162 @@ class Text:
         self.line_size = line_size
 
 
+"""Class that holds the pre-rendered digits 0-9 of a single font in a single color
+Used to build strings made up of digits only (such as the score) by blitting the digits
+next to each other instead of rasterizing the whole string with the font"""
+class GlyphAtlas:
+    GLYPHS = "0123456789"
+
+    def __init__(self, font: pygame.font.Font, color: Tuple[int, int, int]) -> None:
+        self._font = font
+        self._glyphs = dict()
+        for glyph in GlyphAtlas.GLYPHS:
+            self._glyphs[glyph] = font.render(glyph, 0, color)
+
+
+    """Check whether the provided string can be built out of the glyphs in the atlas"""
+    def can_draw(self, text: str) -> bool:
+        return len(text) > 0 and all(glyph in self._glyphs for glyph in text)
+
+
+    """Create a Text object out of the pre-rendered glyphs
+    The provided string must only contain digits"""
+    def draw_text(self, text: str) -> Text:
+        glyph_surfaces = [self._glyphs[glyph] for glyph in text]
+        text_size = (sum(glyph.get_width() for glyph in glyph_surfaces), self._font.get_height())
+
+        # Transparent Surface, same as the ones rendered by the font
+        text_surface = pygame.surface.Surface(text_size, pygame.locals.SRCALPHA)
+        x = 0
+        for glyph in glyph_surfaces:
+            text_surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+        return Text(text_surface, self._font, text_size, self._font.get_linesize())
+
+
 """Class that handles font loading and preparation of Text objects for rendering"""
 class UIManager:
-    """Create UIManager and load the provided list of fonts into memory for use by text rendering
+    """Create UIManager and register the provided list of fonts for use by text rendering
     Format: Tuple(identifier, path_to_font_file, font_size)
     Fonts are stored in a dictionary. The identifier string is used as a key to access the desired font.
+    A font is only loaded into memory once it's first used to draw text, which keeps the start up fast.
+    Rendered Text objects are cached, up to 'cache_size' of the most recently used ones are kept.
+    If 'use_glyph_atlas' is set, strings made up of digits only (such as the score) are built out of
+    pre-rendered digits instead, which is cheap enough for them not to be cached.
     """
-    def __init__(self, fonts_to_load: list[Tuple[str , str, int]]) -> None:
-        self._loaded_fonts = dict()
-
-        # Load every font in the provided list into the dictionary of loaded fonts
-        # following the format described: 
+    def __init__(self,
+                 fonts_to_load: list[Tuple[str , str, int]],
+                 cache_size: int = 128,
+                 use_glyph_atlas: bool = False) -> None:
+        # Fonts that can be used, loaded into the dictionary of loaded fonts on their first use
+        # dict({key: str=identifier, value: Tuple(path_to_font_file, font_size)})
+        self._font_files = dict()
         # dict({key: str=identifier, value: Font=Font(path_to_font_file, font_size)})
+        self._loaded_fonts = dict()
         for font_info in fonts_to_load:
-            self._loaded_fonts[font_info[0]] = pygame.font.Font(font_info[1], font_info[2])
+            self.load_font(*font_info)
+
+        # Least recently used cache of the rendered Text objects
+        # dict({key: Tuple(font_name, text, color), value: Text})
+        # The most recently used Text objects are at the end
+        self._text_cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        self._use_glyph_atlas = use_glyph_atlas
+        # dict({key: Tuple(font_name, color), value: GlyphAtlas})
+        self._glyph_atlases = dict()
+
+
+    """Register a font under the provided identifier, same as the fonts passed to the constructor
+    Replaces the font previously registered under the identifier (the font is loaded on its first use)"""
+    def load_font(self, identifier: str, path_to_font_file: str, font_size: int) -> None:
+        self._font_files[identifier] = (path_to_font_file, font_size)
+        self._loaded_fonts.pop(identifier, None)
 
 
     """Create a Text object from the following string
-    Parameter 'font_name' must correspond to an identifier stored inside of the dictionary of loaded fonts.
-    Text object is only created if a font with the same identifier as provided is found among loaded fonts,
-    otherwise an empty Text object is returned"""
+    Parameter 'font_name' must correspond to an identifier of a registered font.
+    Text object is only created if a font with the same identifier as provided has been registered,
+    otherwise an empty Text object is returned.
+    The returned Text object may be shared with other callers, so it must not be modified"""
     def draw_text(self, 
                   text: str, 
                   font_name:str, 
                   color: Tuple[int, int, int]) -> Text:
-        if font_name in self._loaded_fonts:
-            font = self._loaded_fonts[font_name]
-            # Create the Surface using the provided text str for rendering later
-            text_surface = font.render(text, 0, color)
-            text_size = font.size(text)
-            text_line_size = font.get_linesize()
-            
-            return Text(text_surface, font, text_size, text_line_size)
+        color = tuple(color)
+        if self._use_glyph_atlas and font_name in self._font_files and _is_numeric(text):
+            return self._get_glyph_atlas(font_name, color).draw_text(text)
+
+        cache_key = (font_name, text, color)
+        cached_text = self._text_cache.get(cache_key)
+        if cached_text is not None:
+            self._cache_hits += 1
+            self._text_cache.move_to_end(cache_key)
+            return cached_text
+
+        if font_name in self._font_files:
+            self._cache_misses += 1
+
+            rendered_text = self._render_text(text, font_name, color)
+            self._text_cache[cache_key] = rendered_text
+            # Evict the least recently used Text objects
+            while len(self._text_cache) > self._cache_size:
+                self._text_cache.popitem(last=False)
+
+            return rendered_text
         else:
             return Text()
+
+
+    """Remove all of the Text objects from the cache"""
+    def clear_cache(self) -> None:
+        self._text_cache.clear()
+
+
+    """Returns the amount of cache hits and cache misses of draw_text respectively"""
+    def get_cache_stats(self) -> Tuple[int, int]:
+        return (self._cache_hits, self._cache_misses)
+
+
+    """Returns the amount of glyph atlases created so far (one per font and color used for numeric text)"""
+    def get_glyph_atlas_count(self) -> int:
+        return len(self._glyph_atlases)
+
+
+    # Renders the text using the font
+    # The font must be registered
+    def _render_text(self, text: str, font_name: str, color: Tuple[int, int, int]) -> Text:
+        font = self._get_font(font_name)
+        # Create the Surface using the provided text str for rendering later
+        text_surface = font.render(text, 0, color)
+        text_size = font.size(text)
+        text_line_size = font.get_linesize()
+
+        return Text(text_surface, font, text_size, text_line_size)
+
+
+    # Returns the glyph atlas of the registered font in the color, creating it on its first use
+    def _get_glyph_atlas(self, font_name: str, color: Tuple[int, int, int]) -> GlyphAtlas:
+        atlas_key = (font_name, color)
+        atlas = self._glyph_atlases.get(atlas_key)
+        if atlas is None:
+            atlas = GlyphAtlas(self._get_font(font_name), color)
+            self._glyph_atlases[atlas_key] = atlas
+        return atlas
+
+
+    # Returns the registered font, loading it into memory on its first use
+    def _get_font(self, font_name: str) -> pygame.font.Font:
+        font = self._loaded_fonts.get(font_name)
+        if font is None:
+            font = pygame.font.Font(*self._font_files[font_name])
+            self._loaded_fonts[font_name] = font
+        return font
+
+
+# Whether the string is made up of the digits 0-9 only (str.isdigit() accepts other digits as well)
+def _is_numeric(text: str) -> bool:
+    return len(text) > 0 and text.isascii() and text.isdigit()
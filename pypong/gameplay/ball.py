@@ -3,12 +3,38 @@ from pypong.gameplay.game_object import GameObject
 
 
 """Class representing the ball
-Contains the ball's velocity used for movement calculations"""
+Contains the ball's velocity used for movement calculations
+The velocity is stored in the same array as the ball's position"""
 class Ball(GameObject):
-    def __init__(self, 
-                 position: list[float, float] = [0.0, 0.0], 
+    __slots__ = ()
+
+    # Indexes of the velocity in the ball's state array
+    VELOCITY_X = 6
+    VELOCITY_Y = 7
+
+    def __init__(self,
+                 position: list[float, float] = [0.0, 0.0],
                  velocity: list[float, float] = [0.0, 0.0],
-                 scale: Tuple[int, int] = (1, 1), 
+                 scale: Tuple[int, int] = (1, 1),
                  color: Tuple[int, int, int] = (255, 255, 255)) -> None:
         super().__init__(position, scale, color)
-        self.velocity = list(velocity)
\ No newline at end of file
+        self._state.extend((velocity[0], velocity[1]))
+
+
+    """Reverse the direction of the ball along the provided axis (0 - X, 1 - Y)"""
+    def reverse_velocity(self, axis: int) -> None:
+        self._state[Ball.VELOCITY_X + axis] *= -1
+
+
+    """Returns a copy of the velocity, assign to the property to change it"""
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        state = self._state
+        return (state[Ball.VELOCITY_X], state[Ball.VELOCITY_Y])
+
+
+    @velocity.setter
+    def velocity(self, velocity: list[float, float]) -> None:
+        state = self._state
+        state[Ball.VELOCITY_X] = velocity[0]
+        state[Ball.VELOCITY_Y] = velocity[1]
@@ -0,0 +1,71 @@
+import math
+from typing import Tuple
+
+
+"""Compute when a box moving at a constant velocity first touches a static box
+Both boxes are given by their top left corner and size, the velocity is in pixels per second.
+Returns Tuple(time_of_impact, axis) where axis is 0 if the moving box hits
+a vertical side (left/right) of the static box and 1 if it hits a horizontal side (top/bottom),
+or None if the boxes don't touch within 'max_time' seconds.
+Boxes that already overlap are not reported, since there's no single point of contact."""
+def sweep_aabb(position: Tuple[float, float],
+               size: Tuple[float, float],
+               velocity: Tuple[float, float],
+               box_position: Tuple[float, float],
+               box_size: Tuple[float, float],
+               max_time: float) -> Tuple[float, int] | None:
+    entry_times = [0.0, 0.0]
+    exit_times = [0.0, 0.0]
+
+    for axis in (0, 1):
+        near = box_position[axis] - (position[axis] + size[axis])
+        far = box_position[axis] + box_size[axis] - position[axis]
+
+        if velocity[axis] > 0:
+            entry_times[axis] = near / velocity[axis]
+            exit_times[axis] = far / velocity[axis]
+        elif velocity[axis] < 0:
+            entry_times[axis] = far / velocity[axis]
+            exit_times[axis] = near / velocity[axis]
+        # Not moving along this axis, the boxes either always or never overlap on it
+        elif near < 0 and far > 0:
+            entry_times[axis] = -math.inf
+            exit_times[axis] = math.inf
+        else:
+            return None
+
+    entry_time = max(entry_times)
+    exit_time = min(exit_times)
+    if entry_time > exit_time or entry_time < 0 or entry_time > max_time:
+        return None
+
+    return (entry_time, 0 if entry_times[0] > entry_times[1] else 1)
+
+
+"""Compute when a box moving at a constant velocity reaches the edges of the area
+spanning from (0, 0) to 'bounds'
+Returns Tuple(time_of_impact, axis) of the first edge that's reached, where axis is 0 for
+the left/right edges and 1 for the top/bottom edges, or None if no edge is reached
+within 'max_time' seconds. A box that's already past an edge and still moving outwards
+reaches it immediately. Only the edges along 'axes' are checked."""
+def sweep_bounds(position: Tuple[float, float],
+                 size: Tuple[float, float],
+                 velocity: Tuple[float, float],
+                 bounds: Tuple[float, float],
+                 max_time: float,
+                 axes: Tuple[int, ...] = (0, 1)) -> Tuple[float, int] | None:
+    impact = None
+
+    for axis in axes:
+        if velocity[axis] > 0:
+            time_of_impact = (bounds[axis] - (position[axis] + size[axis])) / velocity[axis]
+        elif velocity[axis] < 0:
+            time_of_impact = -position[axis] / velocity[axis]
+        else:
+            continue
+
+        time_of_impact = max(time_of_impact, 0.0)
+        if time_of_impact <= max_time and (impact is None or time_of_impact < impact[0]):
+            impact = (time_of_impact, axis)
+
+    return impact
@@ -1,3 +1,4 @@
+from array import array
 from typing import Tuple
 import pygame.surface
 import pygame.rect
@@ -5,66 +6,147 @@ import pygame.rect
 
 """Class that represents a movable and interactable object in the game
 Should be used as a base for other objects
+
+The object is kept compact since simulations can hold a very large amount of them:
+its attributes are declared in __slots__ (no per-object dict) and all of its coordinates
+are stored in a single array of doubles, which is updated in place.
+The collision rect and the renderable Surface are only created once they're first requested,
+so objects that are never rendered (eg. in headless simulations) never allocate a Surface.
+Subclasses should declare __slots__ as well.
 """
 class GameObject:
+    __slots__ = ("_state", "_scale", "_color", "_surface", "_rect", "_is_rect_outdated")
+
+    # Indexes of the values stored in the object's state array
+    X = 0
+    Y = 1
+    # Position at the end of the previous simulation tick
+    # Used to interpolate the object's position when rendering between ticks
+    PREVIOUS_X = 2
+    PREVIOUS_Y = 3
+    # Position where the object was first created
+    INITIAL_X = 4
+    INITIAL_Y = 5
+
     """Create a new GameObject of the provided scale at the provided position"""
-    def __init__(self, 
-                 position: list[float, float] = [0.0, 0.0], 
+    def __init__(self,
+                 position: list[float, float] = [0.0, 0.0],
                  scale: Tuple[int, int] = (1, 1),
                  color: Tuple[int, int, int] = (255, 255, 255)) -> None:
-        # Renderable Surface of this object
-        self._surface = pygame.surface.Surface(scale)
-        self._surface.fill(color)
-        # Collision rectangle of this object
-        self._rect = pygame.rect.Rect(round(position[0]), round(position[1]), scale[0], scale[1])
-        
-        # Calling list() and tuple() class constructors here to copy values
-        # of position and scale into a new list/tuple respectively so that
-        # overwriting eg. self._position doesn't affect self._initial_position
-        # ----
-        # Using a separate _position attribute for enhanced precision (float)
+        # Using floats for the position for enhanced precision
         # pygame.Rect operate using ints, so using its positional attributes
         # directly isn't well suited for movement and the like
-        self._position = list(position)
-        self._initial_position = list(position)
+        self._state = array("d", (position[0], position[1]) * 3)
         # Size of the object (in pixels)
+        # Calling the tuple() class constructor here to copy the values
+        # so that the object can safely hand out its (immutable) scale
         self._scale = tuple(scale)
+        self._color = tuple(color)
+
+        # Renderable Surface of this object (created on demand)
+        self._surface = None
+        # Collision rectangle of this object (created on demand)
+        self._rect = None
+        self._is_rect_outdated = False
 
 
 
     """Move the GameObject by the provided speed"""
     def move(self, speed: Tuple[float, float]):
-        self._position[0] += speed[0]
-        self._position[1] += speed[1]
-        # pygame.Rect operates using int
-        # Doing a simple assignment here would lead 
-        # to an implicit loss of numbers past the decimal mark,
-        # which'd mean a potential loss of data
-        # and a possibly different position of the collision rect
-        # relative to the object's actual position in space
-        self._rect.x = round(self._position[0])
-        self._rect.y = round(self._position[1])
-    
+        state = self._state
+        state[GameObject.X] += speed[0]
+        state[GameObject.Y] += speed[1]
+        # The collision rect is only brought up to date once it's requested
+        self._is_rect_outdated = True
+
 
     """Resets the GameObject's position to the position where it was first created"""
     def reset(self) -> None:
-        self._position = list(self._initial_position)
-        self._rect.x = round(self._position[0])
-        self._rect.y = round(self._position[1])
+        state = self._state
+        state[GameObject.X] = state[GameObject.PREVIOUS_X] = state[GameObject.INITIAL_X]
+        state[GameObject.Y] = state[GameObject.PREVIOUS_Y] = state[GameObject.INITIAL_Y]
+        self._is_rect_outdated = True
+
+
+    """Remember the current position as the position at the end of the previous tick
+    Should be called at the start of every simulation tick"""
+    def store_previous_position(self) -> None:
+        state = self._state
+        state[GameObject.PREVIOUS_X] = state[GameObject.X]
+        state[GameObject.PREVIOUS_Y] = state[GameObject.Y]
+
+
+    """Get the position between the previous tick and the current one
+    'alpha' of 0.0 is the previous position, 1.0 is the current position"""
+    def get_interpolated_position(self, alpha: float) -> Tuple[float, float]:
+        state = self._state
+        previous_x = state[GameObject.PREVIOUS_X]
+        previous_y = state[GameObject.PREVIOUS_Y]
+        return (
+            previous_x + (state[GameObject.X] - previous_x) * alpha,
+            previous_y + (state[GameObject.Y] - previous_y) * alpha
+        )
+
+
+
+    """Returns a copy of the object's state (position, previous and initial position and
+    any values added by subclasses) that can later be restored by load_state()"""
+    def save_state(self) -> array:
+        return array("d", self._state)
+
+
+    """Copy the object's state into an array previously returned by save_state(), instead of creating a new one"""
+    def save_state_into(self, state: array) -> None:
+        state[:] = self._state
+
+
+    """Restore a state previously returned by save_state()"""
+    def load_state(self, state: array) -> None:
+        # Assigning to the slice copies the values into the existing array instead of replacing it
+        self._state[:] = state
+        self._is_rect_outdated = True
 
 
 
     def get_surface(self) -> pygame.surface.Surface:
+        if self._surface is None:
+            self._surface = pygame.surface.Surface(self._scale)
+            self._surface.fill(self._color)
         return self._surface
 
-    
+
     def get_rect(self) -> pygame.rect.Rect:
+        state = self._state
+        if self._rect is None:
+            self._rect = pygame.rect.Rect(round(state[GameObject.X]), round(state[GameObject.Y]),
+                                          self._scale[0], self._scale[1])
+        elif self._is_rect_outdated:
+            # pygame.Rect operates using int
+            # Doing a simple assignment here would lead
+            # to an implicit loss of numbers past the decimal mark,
+            # which'd mean a potential loss of data
+            # and a possibly different position of the collision rect
+            # relative to the object's actual position in space
+            self._rect.x = round(state[GameObject.X])
+            self._rect.y = round(state[GameObject.Y])
+        self._is_rect_outdated = False
         return self._rect
 
-    
+
     def get_position(self) -> Tuple[float, float]:
-        return (self._position[0], self._position[1])
+        state = self._state
+        return (state[GameObject.X], state[GameObject.Y])
+
+
+    # Single coordinate getters for hot loops, they don't allocate a tuple
+
+    def get_x(self) -> float:
+        return self._state[GameObject.X]
+
+
+    def get_y(self) -> float:
+        return self._state[GameObject.Y]
 
 
     def get_scale(self) -> Tuple[int, int]:
-        return tuple(self._scale)
\ No newline at end of file
+        return self._scale
@@ -0,0 +1,122 @@
+import math
+from typing import Tuple
+
+
+"""Uniform grid that sorts objects into square cells by the area they cover
+Used as the broadphase of the collision detection: an object only has to be checked
+against the objects sharing a cell with it, instead of against every other object.
+
+Objects are identified by integer keys and described by their position (top left corner) and size.
+The grid is kept up to date incrementally, move() only touches the cells of an object
+once it has moved into a different set of cells, which for objects moving a few pixels
+per tick is rarely the case."""
+class SpatialGrid:
+    # Amount of pixels by which the area of every object is grown in each direction
+    # Objects collide using their rounded (pygame.Rect) positions, which can be
+    # up to half a pixel off from the actual ones
+    MARGIN = 1.0
+
+    def __init__(self, cell_size: float) -> None:
+        self._cell_size = cell_size
+        # dict({key: Tuple(column, row), value: set[int]=keys of the objects in the cell})
+        self._cells = dict()
+        # dict({key: int=object key, value: Tuple(first_column, first_row, last_column, last_row)})
+        self._object_cells = dict()
+        # dict({key: int=object key, value: Tuple(width, height)})
+        self._object_sizes = dict()
+
+
+    """Add an object of the provided size at the provided position to the grid"""
+    def insert(self, key: int, position: Tuple[float, float], size: Tuple[float, float]) -> None:
+        self._object_sizes[key] = (size[0], size[1])
+        cell_range = self._get_cell_range(position, size)
+        self._object_cells[key] = cell_range
+        self._add_to_cells(key, cell_range)
+
+
+    """Update the position of an object in the grid
+    Only the cells the object has left or entered are changed"""
+    def move(self, key: int, position: Tuple[float, float]) -> None:
+        cell_range = self._get_cell_range(position, self._object_sizes[key])
+        previous_cell_range = self._object_cells[key]
+        if cell_range == previous_cell_range:
+            return
+
+        self._remove_from_cells(key, previous_cell_range)
+        self._add_to_cells(key, cell_range)
+        self._object_cells[key] = cell_range
+
+
+    """Remove an object from the grid"""
+    def remove(self, key: int) -> None:
+        self._remove_from_cells(key, self._object_cells.pop(key))
+        del self._object_sizes[key]
+
+
+    """Returns the keys of all of the objects sharing at least one cell with the object (itself excluded)
+    These are the only objects the object can be colliding with"""
+    def get_neighbors(self, key: int) -> set[int]:
+        neighbors = self._collect_keys(self._object_cells[key])
+        neighbors.discard(key)
+        return neighbors
+
+
+    """Returns the keys of all of the objects in the cells covering the provided area"""
+    def query(self, position: Tuple[float, float], size: Tuple[float, float]) -> set[int]:
+        return self._collect_keys(self._get_cell_range(position, size))
+
+
+
+    def get_cell_size(self) -> float:
+        return self._cell_size
+
+
+    def get_object_count(self) -> int:
+        return len(self._object_cells)
+
+
+    # Returns the first and last column and row of the cells covered by the area
+    def _get_cell_range(self, position: Tuple[float, float], size: Tuple[float, float]) -> Tuple[int, int, int, int]:
+        cell_size = self._cell_size
+        margin = SpatialGrid.MARGIN
+        return (
+            math.floor((position[0] - margin) / cell_size),
+            math.floor((position[1] - margin) / cell_size),
+            math.floor((position[0] + size[0] + margin) / cell_size),
+            math.floor((position[1] + size[1] + margin) / cell_size)
+        )
+
+
+    # Adds the key to every cell in the range
+    def _add_to_cells(self, key: int, cell_range: Tuple[int, int, int, int]) -> None:
+        cells = self._cells
+        for column in range(cell_range[0], cell_range[2] + 1):
+            for row in range(cell_range[1], cell_range[3] + 1):
+                cell = cells.get((column, row))
+                if cell is None:
+                    cells[(column, row)] = {key}
+                else:
+                    cell.add(key)
+
+
+    # Removes the key from every cell in the range, dropping the cells that become empty
+    def _remove_from_cells(self, key: int, cell_range: Tuple[int, int, int, int]) -> None:
+        cells = self._cells
+        for column in range(cell_range[0], cell_range[2] + 1):
+            for row in range(cell_range[1], cell_range[3] + 1):
+                cell = cells[(column, row)]
+                cell.discard(key)
+                if len(cell) == 0:
+                    del cells[(column, row)]
+
+
+    # Returns the keys of all of the objects in the cells in the range
+    def _collect_keys(self, cell_range: Tuple[int, int, int, int]) -> set[int]:
+        cells = self._cells
+        keys = set()
+        for column in range(cell_range[0], cell_range[2] + 1):
+            for row in range(cell_range[1], cell_range[3] + 1):
+                cell = cells.get((column, row))
+                if cell is not None:
+                    keys |= cell
+        return keys
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Tuple
+from pypong.core.game_stats import PlayerIndex
+from pypong.core.simulation import PaddleDirection
+from pypong.net.protocol import (INPUT_PAYLOAD, WELCOME_PAYLOAD, MatchState, MessageType,
+                                 apply_state_delta, encode_frame, read_frame)
+
+
+"""Class that connects to a PongServer as one of the players of a room
+Keeps a copy of the match's state, updated by the state deltas sent by the server"""
+class PongClient:
+    def __init__(self) -> None:
+        self._reader = None
+        self._writer = None
+        self._player_index = None
+        self._window_size = (0, 0)
+        self._tick_rate = 0
+        self._state = MatchState()
+
+
+    """Connect to the server and join the room
+    Returns the PlayerIndex the client plays as
+    Raises ConnectionError if the room is already full"""
+    async def connect(self, host: str, port: int, room_id: str) -> PlayerIndex:
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write(encode_frame(MessageType.JOIN, room_id.encode("utf-8")))
+        await self._writer.drain()
+
+        message_type, payload = await read_frame(self._reader)
+        if message_type != MessageType.WELCOME:
+            await self.close()
+            raise ConnectionError(f"Couldn't join room '{room_id}'")
+
+        player_index, width, height, self._tick_rate = WELCOME_PAYLOAD.unpack(payload)
+        self._player_index = PlayerIndex(player_index)
+        self._window_size = (width, height)
+
+        # The welcome is always followed by the whole state of the match
+        await self.receive()
+        return self._player_index
+
+
+    """Disconnect from the server"""
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+
+
+    """Tell the server which direction to move the player's paddle in
+    The paddle keeps moving in that direction until another input is sent"""
+    async def send_input(self, direction: PaddleDirection) -> None:
+        self._writer.write(encode_frame(MessageType.INPUT, INPUT_PAYLOAD.pack(direction)))
+        await self._writer.drain()
+
+
+    """Advance the game, the equivalent of pressing SPACE"""
+    async def send_advance(self) -> None:
+        self._writer.write(encode_frame(MessageType.ADVANCE))
+        await self._writer.drain()
+
+
+    """Wait for the next message from the server and apply it
+    Returns the type of the received message"""
+    async def receive(self) -> MessageType:
+        message_type, payload = await read_frame(self._reader)
+        if message_type == MessageType.STATE:
+            apply_state_delta(self._state, payload)
+        return message_type
+
+
+    """Keep receiving messages until the state of the provided server tick (or a later one) arrives"""
+    async def wait_for_tick(self, tick: int) -> None:
+        while self._state.tick < tick:
+            await self.receive()
+
+
+
+    def get_player_index(self) -> PlayerIndex:
+        return self._player_index
+
+
+    def get_window_size(self) -> Tuple[int, int]:
+        return self._window_size
+
+
+    def get_tick_rate(self) -> int:
+        return self._tick_rate
+
+
+    def get_state(self) -> MatchState:
+        return self._state
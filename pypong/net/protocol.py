@@ -0,0 +1,130 @@
+import asyncio
+import struct
+from enum import IntEnum
+from typing import Tuple
+from pypong.core.game_stats import GameState
+from pypong.core.simulation import Simulation
+
+
+# Every message is sent as a frame: a header with the length of the payload
+# and the type of the message, followed by the payload itself
+FRAME_HEADER = struct.Struct("<HB")
+MAX_PAYLOAD_SIZE = 0xFFFF
+
+
+"""IntEnum of the types of messages sent between the server and the clients"""
+class MessageType(IntEnum):
+    # Client -> server
+    # Payload: room identifier (UTF-8)
+    JOIN = 1
+    # Payload: PaddleDirection (int8), held until the next INPUT message
+    INPUT = 2
+    # No payload, the equivalent of pressing SPACE
+    ADVANCE = 3
+
+    # Server -> client
+    # Payload: see WELCOME_PAYLOAD
+    WELCOME = 4
+    # Payload: state delta, see encode_state_delta()
+    STATE = 5
+    # No payload, the room already has two players, the connection is closed afterwards
+    ROOM_FULL = 6
+
+
+# Player index (PlayerIndex), window width and height, server tick rate
+WELCOME_PAYLOAD = struct.Struct("<BHHH")
+INPUT_PAYLOAD = struct.Struct("<b")
+
+# State delta: tick number and a bitmask of the fields that follow, in the order of the bits
+STATE_HEADER = struct.Struct("<IB")
+FIELD_BALL_POSITION = 1 << 0
+FIELD_BALL_VELOCITY = 1 << 1
+FIELD_PLAYER_ONE = 1 << 2
+FIELD_PLAYER_TWO = 1 << 3
+FIELD_SCORE = 1 << 4
+FIELD_GAME_STATE = 1 << 5
+_STATE_FIELDS = (
+    (FIELD_BALL_POSITION, "ball_position", struct.Struct("<ff")),
+    (FIELD_BALL_VELOCITY, "ball_velocity", struct.Struct("<ff")),
+    (FIELD_PLAYER_ONE, "player_one_y", struct.Struct("<f")),
+    (FIELD_PLAYER_TWO, "player_two_y", struct.Struct("<f")),
+    (FIELD_SCORE, "score", struct.Struct("<HH")),
+    # Game state and the player who last scored
+    (FIELD_GAME_STATE, "game_state", struct.Struct("<BB")),
+)
+
+
+"""Struct containing the state of a match as it is sent over the network
+Every field is a tuple, so that it can be packed and compared as a whole"""
+class MatchState:
+    def __init__(self) -> None:
+        """Number of the server tick this state belongs to"""
+        self.tick = 0
+        self.ball_position = (0.0, 0.0)
+        self.ball_velocity = (0.0, 0.0)
+        self.player_one_y = (0.0,)
+        self.player_two_y = (0.0,)
+        self.score = (0, 0)
+        """Tuple(GameState value, PlayerIndex value of the player who last scored)"""
+        self.game_state = (GameState.GAME_START.value, 0)
+
+
+    """Capture the current state of the simulation"""
+    @staticmethod
+    def from_simulation(simulation: Simulation, tick: int) -> "MatchState":
+        game_stats = simulation.get_game_stats()
+        ball = simulation.get_ball()
+
+        state = MatchState()
+        state.tick = tick
+        state.ball_position = ball.get_position()
+        state.ball_velocity = (ball.velocity[0], ball.velocity[1])
+        state.player_one_y = (simulation.get_player_one().get_y(),)
+        state.player_two_y = (simulation.get_player_two().get_y(),)
+        state.score = game_stats.score
+        state.game_state = (game_stats.current_game_state.value, int(game_stats.player_who_last_scored))
+        return state
+
+
+"""Pack a message into a frame"""
+def encode_frame(message_type: MessageType, payload: bytes = b"") -> bytes:
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        raise ValueError("Payload is too large to fit into a single frame")
+    return FRAME_HEADER.pack(len(payload), message_type) + payload
+
+
+"""Read a single frame from the stream
+Returns Tuple(message_type, payload)
+Raises asyncio.IncompleteReadError once the other side closes the connection"""
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[MessageType, bytes]:
+    header = await reader.readexactly(FRAME_HEADER.size)
+    payload_size, message_type = FRAME_HEADER.unpack(header)
+    payload = await reader.readexactly(payload_size) if payload_size > 0 else b""
+    return (MessageType(message_type), payload)
+
+
+"""Encode only the fields of 'current' that differ from 'previous'
+If 'previous' is None, every field is encoded.
+Returns None if nothing has changed"""
+def encode_state_delta(previous: MatchState | None, current: MatchState) -> bytes | None:
+    field_mask = 0
+    fields = []
+    for field_bit, field_name, field_struct in _STATE_FIELDS:
+        value = getattr(current, field_name)
+        if previous is None or getattr(previous, field_name) != value:
+            field_mask |= field_bit
+            fields.append(field_struct.pack(*value))
+
+    if field_mask == 0:
+        return None
+    return STATE_HEADER.pack(current.tick, field_mask) + b"".join(fields)
+
+
+"""Apply a state delta created by encode_state_delta() to the state (in place)"""
+def apply_state_delta(state: MatchState, payload: bytes) -> None:
+    state.tick, field_mask = STATE_HEADER.unpack_from(payload)
+    offset = STATE_HEADER.size
+    for field_bit, field_name, field_struct in _STATE_FIELDS:
+        if field_mask & field_bit:
+            setattr(state, field_name, field_struct.unpack_from(payload, offset))
+            offset += field_struct.size
@@ -0,0 +1,261 @@
+import heapq
+import random
+import struct
+import time
+from typing import Callable, Tuple
+from pypong.core.game_stats import PlayerIndex
+from pypong.core.simulation import PaddleDirection, Simulation
+
+
+# Inputs of a single player for consecutive ticks, sent every frame until the other side acknowledges them
+# so that lost messages are made up for by the following ones
+# Header: number of the first remote tick whose input hasn't arrived yet (acknowledges the ticks before it),
+# number of the tick of the first input and the amount of inputs that follow
+INPUT_MESSAGE_HEADER = struct.Struct("<IIB")
+# Input of a single tick: PaddleDirection and how many times the player has advanced the game (SPACE) before the tick
+TICK_INPUT = struct.Struct("<bb")
+
+# Input assumed for ticks the remote player's input hasn't arrived for yet
+_NO_INPUT = (PaddleDirection.NONE, 0)
+
+
+"""Class that delivers messages between two endpoints in the same process after a simulated delay
+Used to test networked play without a network"""
+class LoopbackTransport:
+    def __init__(self,
+                 latency: float = 0.1,
+                 jitter: float = 0.0,
+                 clock: Callable[[], float] = time.perf_counter,
+                 rng: random.Random = random,
+                 loss: float = 0.0) -> None:
+        """One-way delay (in seconds) of every message"""
+        self._latency = latency
+        """Highest random delay (in seconds) added on top of the latency, can reorder messages"""
+        self._jitter = jitter
+        """Probability of a message being lost"""
+        self._loss = loss
+        self._clock = clock
+        self._rng = rng
+        self._peer = None
+        # Heap of the messages sent to this endpoint: Tuple(delivery time, sequence number, message)
+        self._in_flight = []
+        self._sequence = 0
+
+
+    """Create two endpoints connected to each other"""
+    @staticmethod
+    def create_pair(latency: float = 0.1,
+                    jitter: float = 0.0,
+                    clock: Callable[[], float] = time.perf_counter,
+                    rng: random.Random = random,
+                    loss: float = 0.0) -> Tuple["LoopbackTransport", "LoopbackTransport"]:
+        first = LoopbackTransport(latency, jitter, clock, rng, loss)
+        second = LoopbackTransport(latency, jitter, clock, rng, loss)
+        first._peer = second
+        second._peer = first
+        return (first, second)
+
+
+    def send(self, message: bytes) -> None:
+        if self._loss > 0.0 and self._rng.random() < self._loss:
+            return
+
+        peer = self._peer
+        delivery_time = self._clock() + self._latency
+        if self._jitter > 0.0:
+            delivery_time += self._rng.uniform(0.0, self._jitter)
+
+        heapq.heappush(peer._in_flight, (delivery_time, peer._sequence, message))
+        peer._sequence += 1
+
+
+    """Returns every message that has arrived since the last call"""
+    def receive(self) -> list[bytes]:
+        in_flight = self._in_flight
+        now = self._clock()
+        messages = []
+        while in_flight and in_flight[0][0] <= now:
+            messages.append(heapq.heappop(in_flight)[2])
+        return messages
+
+
+"""Class that runs a match between a local and a remote player with rollback netcode
+Both players run the same deterministic simulation (same seed and delta_time) and only exchange
+their inputs. The local player's inputs are applied right away, the remote player is predicted
+to keep holding their last known input. Once the remote player's actual input for a tick arrives
+and differs from the prediction, the simulation is rolled back to the snapshot taken before
+that tick and the ticks since are simulated again.
+The snapshots and inputs of the last 'max_rollback_ticks' ticks are kept in ring buffers,
+if the remote player falls further behind than that, the local player has to wait for them.
+Messages may be lost: every message carries all of the local inputs the remote player
+hasn't acknowledged yet, and is sent every frame (even while waiting) until they're acknowledged."""
+class RollbackSession:
+    def __init__(self,
+                 simulation: Simulation,
+                 local_player: PlayerIndex,
+                 transport: LoopbackTransport,
+                 delta_time: float,
+                 max_rollback_ticks: int = 8) -> None:
+        self._simulation = simulation
+        self._transport = transport
+        self._delta_time = delta_time
+        self._max_rollback_ticks = max_rollback_ticks
+        # Index of each player's input in the per-tick input lists
+        self._local_slot = local_player - 1
+        self._remote_slot = 1 - self._local_slot
+
+        # Ring buffers, tick N is stored at index N % size
+        # Snapshot of the simulation taken right before the tick
+        self._snapshots = [None] * (max_rollback_ticks + 1)
+        # Inputs (Tuple(PaddleDirection, advance count)) of both players the tick was simulated with
+        self._inputs = [[_NO_INPUT, _NO_INPUT] for _ in range(max_rollback_ticks + 1)]
+
+        """Number of the next tick to be simulated"""
+        self._tick = 0
+        """The remote player's inputs are known for all of the ticks before this one"""
+        self._confirmed_tick = 0
+        # Remote inputs that have arrived but haven't been confirmed yet (they arrived out of order
+        # or belong to ticks that haven't been simulated yet), keyed by their tick
+        self._received_inputs = dict()
+        # Direction of the last confirmed remote input, the remote player is predicted to keep holding it
+        self._predicted_direction = PaddleDirection.NONE
+        # Local inputs the remote player hasn't acknowledged yet, the first one is the input of tick _acknowledged_tick
+        self._unacknowledged_inputs = []
+        self._acknowledged_tick = 0
+
+        self._rollback_count = 0
+        self._resimulated_tick_count = 0
+
+
+    """Simulate the next tick with the local player's input
+    Returns False if the tick couldn't be simulated yet since the remote player is too far behind,
+    in which case the same input should be provided again next frame"""
+    def advance_frame(self, local_direction: PaddleDirection, local_advance_count: int = 0) -> bool:
+        self._poll_remote_inputs()
+        if self._tick - self._confirmed_tick >= self._max_rollback_ticks:
+            # The inputs the remote player is missing might have been lost
+            self._send_local_inputs()
+            return False
+
+        tick = self._tick
+        local_input = (local_direction, local_advance_count)
+        self._unacknowledged_inputs.append(local_input)
+        self._send_local_inputs()
+
+        # The remote input for this tick might have already arrived
+        if self._confirmed_tick == tick and tick in self._received_inputs:
+            remote_input = self._confirm_remote_input(self._received_inputs.pop(tick))
+        else:
+            remote_input = (self._predicted_direction, 0)
+
+        inputs = self._inputs[tick % len(self._inputs)]
+        inputs[self._local_slot] = local_input
+        inputs[self._remote_slot] = remote_input
+        self._simulate_tick(tick)
+        self._tick += 1
+        return True
+
+
+    """Process the remote inputs that have arrived without simulating a new tick
+    and send the local inputs again if the remote player hasn't acknowledged them yet
+    Useful to catch up with the remote player once the local player stops simulating new ticks"""
+    def poll(self) -> None:
+        self._poll_remote_inputs()
+        if self._unacknowledged_inputs:
+            self._send_local_inputs()
+
+
+    # Sends the local inputs the remote player hasn't acknowledged yet, along with the acknowledgement of the remote inputs
+    def _send_local_inputs(self) -> None:
+        unacknowledged_inputs = self._unacknowledged_inputs
+        # Inputs that don't fit into a single message are sent once the first ones have been acknowledged
+        input_count = min(len(unacknowledged_inputs), 255)
+        self._transport.send(
+            INPUT_MESSAGE_HEADER.pack(self._confirmed_tick, self._acknowledged_tick, input_count) +
+            b"".join(TICK_INPUT.pack(*tick_input) for tick_input in unacknowledged_inputs[:input_count])
+        )
+
+
+    # Confirms the remote inputs that have arrived and rolls back if any of them were mispredicted
+    def _poll_remote_inputs(self) -> None:
+        received_inputs = self._received_inputs
+        for message in self._transport.receive():
+            acknowledged_tick, first_tick, input_count = INPUT_MESSAGE_HEADER.unpack_from(message)
+            # Messages can arrive out of order, an older one acknowledges less
+            if acknowledged_tick > self._acknowledged_tick:
+                del self._unacknowledged_inputs[:acknowledged_tick - self._acknowledged_tick]
+                self._acknowledged_tick = acknowledged_tick
+
+            for index in range(input_count):
+                tick = first_tick + index
+                if tick >= self._confirmed_tick:
+                    direction, advance_count = TICK_INPUT.unpack_from(message, INPUT_MESSAGE_HEADER.size + index * TICK_INPUT.size)
+                    received_inputs[tick] = (PaddleDirection(direction), advance_count)
+
+        ring_size = len(self._inputs)
+        rollback_tick = None
+        # Only ticks that have already been simulated, inputs of future ticks are used once they're simulated
+        while self._confirmed_tick < self._tick and self._confirmed_tick in received_inputs:
+            tick = self._confirmed_tick
+            remote_input = self._confirm_remote_input(received_inputs.pop(tick))
+
+            inputs = self._inputs[tick % ring_size]
+            if inputs[self._remote_slot] != remote_input:
+                inputs[self._remote_slot] = remote_input
+                if rollback_tick is None:
+                    rollback_tick = tick
+
+        if rollback_tick is not None:
+            self._rollback(rollback_tick)
+
+
+    # Marks the remote input as the input of the first unconfirmed tick
+    def _confirm_remote_input(self, remote_input: Tuple[PaddleDirection, int]) -> Tuple[PaddleDirection, int]:
+        self._predicted_direction = remote_input[0]
+        self._confirmed_tick += 1
+        return remote_input
+
+
+    # Restores the snapshot taken before the tick and simulates the ticks since again
+    def _rollback(self, rollback_tick: int) -> None:
+        self._simulation.restore(self._snapshots[rollback_tick % len(self._snapshots)])
+
+        ring_size = len(self._inputs)
+        predicted_input = (self._predicted_direction, 0)
+        for tick in range(rollback_tick, self._tick):
+            # The ticks whose remote input is still unknown are predicted again from the newest confirmed input
+            if tick >= self._confirmed_tick:
+                self._inputs[tick % ring_size][self._remote_slot] = predicted_input
+            self._simulate_tick(tick)
+
+        self._rollback_count += 1
+        self._resimulated_tick_count += self._tick - rollback_tick
+
+
+    # Snapshots the simulation and simulates the tick with the inputs stored for it
+    def _simulate_tick(self, tick: int) -> None:
+        simulation = self._simulation
+        self._snapshots[tick % len(self._snapshots)] = simulation.snapshot()
+
+        player_one_input, player_two_input = self._inputs[tick % len(self._inputs)]
+        for _ in range(player_one_input[1] + player_two_input[1]):
+            simulation.advance_state()
+        simulation.step(self._delta_time, player_one_input[0], player_two_input[0])
+
+
+
+    def get_simulation(self) -> Simulation:
+        return self._simulation
+
+
+    def get_tick(self) -> int:
+        return self._tick
+
+
+    def get_confirmed_tick(self) -> int:
+        return self._confirmed_tick
+
+
+    """Returns Tuple(how many times the session has rolled back, how many ticks were simulated again in total)"""
+    def get_rollback_stats(self) -> Tuple[int, int]:
+        return (self._rollback_count, self._resimulated_tick_count)
@@ -0,0 +1,212 @@
+import asyncio
+import random
+import struct
+from typing import Tuple
+from pypong.core.game_stats import GameState, PlayerIndex
+from pypong.core.simulation import PaddleDirection, Simulation
+from pypong.net.protocol import (INPUT_PAYLOAD, WELCOME_PAYLOAD, MatchState, MessageType,
+                                 encode_frame, encode_state_delta, read_frame)
+
+
+# Clients that have this many bytes waiting to be sent to them are too slow
+# to keep up with the state updates and get disconnected
+MAX_WRITE_BUFFER_SIZE = 64 * 1024
+
+# Highest amount of SPACE presses a room keeps queued, any further presses are ignored
+MAX_PENDING_ADVANCES = 2
+
+
+"""Class representing a single match hosted by the server"""
+class Room:
+    def __init__(self, room_id: str, window_size: Tuple[int, int], seed: int) -> None:
+        self.room_id = room_id
+        self.simulation = Simulation(window_size, rng=random.Random(seed))
+        """Connections of player one and player two (None if the slot is free)"""
+        self.players = [None, None]
+        """Last received paddle direction of each player"""
+        self.directions = [PaddleDirection.NONE, PaddleDirection.NONE]
+        """How many times the players have pressed SPACE, the game is advanced once per tick"""
+        self.pending_advances = 0
+        """State last sent to the players, the next update only contains what has changed since"""
+        self.last_state = None
+
+
+    def is_empty(self) -> bool:
+        return self.players[0] is None and self.players[1] is None
+
+
+"""Class that hosts many matches in a single process using asyncio
+The server is authoritative: it runs the simulation of every room itself, the clients only
+send their paddle inputs and receive the changes of the match's state.
+All of the rooms are stepped by a single task at a fixed tick rate, rooms without
+a round in progress cost (almost) nothing since there's nothing to simulate or send."""
+class PongServer:
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 tick_rate: int = 60,
+                 window_size: Tuple[int, int] = (800, 600),
+                 seed: int = None) -> None:
+        self._host = host
+        self._port = port
+        self._tick_rate = tick_rate
+        self._window_size = tuple(window_size)
+        # Generates the seeds of the individual rooms
+        self._seed_rng = random.Random(seed)
+
+        self._rooms = dict()
+        self._tick = 0
+        self._server = None
+        self._tick_task = None
+
+
+    """Start accepting connections and stepping the rooms
+    Returns the address the server is listening on, Tuple(host, port)"""
+    async def start(self) -> Tuple[str, int]:
+        self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+        self._tick_task = asyncio.create_task(self._run_ticks())
+        return self._server.sockets[0].getsockname()[:2]
+
+
+    """Stop the server and disconnect every client"""
+    async def stop(self) -> None:
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            try:
+                await self._tick_task
+            except asyncio.CancelledError:
+                pass
+            self._tick_task = None
+
+        for room in self._rooms.values():
+            for writer in room.players:
+                if writer is not None:
+                    writer.close()
+        self._rooms.clear()
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+    def get_room_count(self) -> int:
+        return len(self._rooms)
+
+
+    def get_tick(self) -> int:
+        return self._tick
+
+
+    """Advance every room by a single tick and send the changes to the players
+    Called by the server's tick loop, can also be called directly to step the rooms manually"""
+    def tick(self) -> None:
+        self._tick += 1
+        delta_time = 1 / self._tick_rate
+
+        for room in self._rooms.values():
+            simulation = room.simulation
+            advanced = room.pending_advances > 0
+            if advanced:
+                simulation.advance_state()
+                room.pending_advances -= 1
+
+            # Nothing can change while no round is in progress, unless a player has advanced the game
+            if simulation.get_game_stats().current_game_state != GameState.ROUND_IN_PROGRESS and not advanced:
+                continue
+
+            simulation.step(delta_time, room.directions[0], room.directions[1])
+
+            state = MatchState.from_simulation(simulation, self._tick)
+            delta = encode_state_delta(room.last_state, state)
+            room.last_state = state
+            if delta is not None:
+                self._broadcast(room, encode_frame(MessageType.STATE, delta))
+
+
+    # Steps the rooms at the server's tick rate
+    async def _run_ticks(self) -> None:
+        loop = asyncio.get_running_loop()
+        tick_time = 1 / self._tick_rate
+        next_tick_time = loop.time()
+
+        while True:
+            self.tick()
+
+            # Schedule the next tick relative to the previous one to keep a steady rate
+            next_tick_time += tick_time
+            await asyncio.sleep(max(0.0, next_tick_time - loop.time()))
+
+
+    # Serves a single client for as long as it stays connected
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        room = None
+        player_slot = None
+        try:
+            message_type, payload = await read_frame(reader)
+            if message_type != MessageType.JOIN:
+                return
+
+            room, player_slot = self._join_room(payload.decode("utf-8"), writer)
+            if room is None:
+                writer.write(encode_frame(MessageType.ROOM_FULL))
+                await writer.drain()
+                return
+
+            writer.write(encode_frame(MessageType.WELCOME, WELCOME_PAYLOAD.pack(
+                player_slot + 1, self._window_size[0], self._window_size[1], self._tick_rate)))
+            # The new player receives the whole state of the match
+            writer.write(encode_frame(MessageType.STATE, encode_state_delta(
+                None, MatchState.from_simulation(room.simulation, self._tick))))
+            await writer.drain()
+
+            while True:
+                message_type, payload = await read_frame(reader)
+                match(message_type):
+                    case MessageType.INPUT:
+                        room.directions[player_slot] = PaddleDirection(INPUT_PAYLOAD.unpack(payload)[0])
+                    case MessageType.ADVANCE:
+                        room.pending_advances = min(room.pending_advances + 1, MAX_PENDING_ADVANCES)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, struct.error):
+            # The client has disconnected or sent something that's not a valid message
+            pass
+        finally:
+            if room is not None and player_slot is not None:
+                self._leave_room(room, player_slot)
+            writer.close()
+
+
+    # Puts the player into the first free slot of the room, creating the room if necessary
+    # Returns Tuple(room, player slot) or Tuple(None, None) if the room is full
+    def _join_room(self, room_id: str, writer: asyncio.StreamWriter) -> Tuple[Room | None, int | None]:
+        room = self._rooms.get(room_id)
+        if room is None:
+            room = Room(room_id, self._window_size, self._seed_rng.getrandbits(64))
+            self._rooms[room_id] = room
+
+        for player_slot in (PlayerIndex.PLAYER_ONE - 1, PlayerIndex.PLAYER_TWO - 1):
+            if room.players[player_slot] is None:
+                room.players[player_slot] = writer
+                return (room, player_slot)
+        return (None, None)
+
+
+    # Frees the player's slot in the room, the room is closed once both players have left
+    def _leave_room(self, room: Room, player_slot: int) -> None:
+        room.players[player_slot] = None
+        room.directions[player_slot] = PaddleDirection.NONE
+        if room.is_empty():
+            self._rooms.pop(room.room_id, None)
+
+
+    # Sends the frame to both players of the room without waiting for it to be sent
+    def _broadcast(self, room: Room, frame: bytes) -> None:
+        for writer in room.players:
+            if writer is None:
+                continue
+
+            if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER_SIZE:
+                # Closing the connection ends the client's handler, which frees its slot
+                writer.close()
+                continue
+            writer.write(frame)
@@ -0,0 +1,247 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable
+# The benchmark never opens a real window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from pypong.core.config import PRESETS
+from pypong.core.game_instance import GameInstance
+from pypong.core.game_stats import GameState
+from pypong.core.simulation import PaddleDirection
+
+
+# Options of the game in every scenario
+# The video driver set above (or overridden by the environment) is kept
+BENCHMARK_PROFILE = PRESETS["headless-benchmark"]._replace(video_driver=os.environ["SDL_VIDEODRIVER"])
+
+# Fixed time step (in seconds) every benchmark tick advances the game by
+TICK_DELTA_TIME = 1 / 120
+
+# Names of the measured phases of a single tick, in the order in which they happen
+PHASES = ("events", "input", "physics", "render", "display")
+
+
+"""Class that accumulates the time spent in each phase of the game loop
+Functions are wrapped by timed(), which adds their run time to the provided phase"""
+class PhaseTimer:
+    def __init__(self) -> None:
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        # Time spent in nested phases (eg. display inside of render), subtracted from the outer phase
+        self._nested_time = 0.0
+
+
+    """Wrap the function so that its run time is added to the provided phase"""
+    def timed(self, phase: str, function: Callable) -> Callable:
+        def timed_function(*args, **kwargs):
+            nested_time = self._nested_time
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+
+            # Only count the time that wasn't spent inside of other timed functions
+            inner_time = self._nested_time - nested_time
+            self.totals[phase] += elapsed - inner_time
+            self._nested_time = nested_time + elapsed
+            return result
+
+        return timed_function
+
+
+# Scenarios
+# Every scenario receives the started game instance and prepares it,
+# then returns a function that's called before every tick
+# (to feed the game the scenario's input)
+
+# The start screen, nobody presses anything
+def _idle_start_screen(game: GameInstance) -> Callable[[], None]:
+    return lambda: None
+
+
+# A never-ending rally, both paddles follow the ball
+# If someone scores anyway, the next round is started right away
+def _long_rally(game: GameInstance) -> Callable[[], None]:
+    simulation = game.get_simulation()
+    simulation.advance_state()
+    simulation.advance_state()
+
+    def track_ball(paddle) -> PaddleDirection:
+        ball_center = simulation.get_ball().get_y() + simulation.get_ball().get_scale()[1] / 2
+        paddle_center = paddle.get_y() + paddle.get_scale()[1] / 2
+        if ball_center < paddle_center - 5:
+            return PaddleDirection.UP
+        if ball_center > paddle_center + 5:
+            return PaddleDirection.DOWN
+        return PaddleDirection.NONE
+
+    game._handle_input = lambda: (track_ball(simulation.get_player_one()), track_ball(simulation.get_player_two()))
+
+    def before_tick() -> None:
+        if simulation.get_game_stats().current_game_state == GameState.ROUND_END:
+            simulation.advance_state()
+            simulation.advance_state()
+
+    return before_tick
+
+
+# Rounds ending and starting as quickly as possible
+# SPACE is pressed every tick and the ball is put behind player one's paddle
+# as soon as a round starts, so that it's scored on the very next tick
+def _round_cycling(game: GameInstance) -> Callable[[], None]:
+    simulation = game.get_simulation()
+
+    def before_tick() -> None:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        if simulation.get_game_stats().current_game_state == GameState.ROUND_IN_PROGRESS:
+            ball = simulation.get_ball()
+            ball.move((-ball.get_x(), 0.0))
+
+    return before_tick
+
+
+SCENARIOS = {
+    "idle_start_screen": _idle_start_screen,
+    "long_rally": _long_rally,
+    "round_cycling": _round_cycling,
+    # A rally of the "chaos" preset, hundreds of balls bouncing around
+    "chaos_rally": _long_rally,
+}
+
+# Options of the scenarios that aren't played with the BENCHMARK_PROFILE
+SCENARIO_PROFILES = {
+    "chaos_rally": BENCHMARK_PROFILE._replace(
+        ball_size=PRESETS["chaos"].ball_size,
+        ball_count=PRESETS["chaos"].ball_count,
+        obstacles=PRESETS["chaos"].obstacles
+    ),
+}
+
+
+"""Run a single scenario for the provided amount of ticks
+Returns a dictionary of the results, ready to be saved as JSON"""
+def run_scenario(name: str, tick_count: int) -> dict:
+    # Make sure the game of the previous scenario has been destroyed first,
+    # destroying its window shuts down the display
+    gc.collect()
+
+    game = GameInstance()
+    game.start_from_profile(SCENARIO_PROFILES.get(name, BENCHMARK_PROFILE))
+    before_tick = SCENARIOS[name](game)
+
+    # Wrap every phase of the game loop with a timer
+    timer = PhaseTimer()
+    game.process_events = timer.timed("events", game.process_events)
+    game._handle_input = timer.timed("input", game._handle_input)
+    simulation = game.get_simulation()
+    simulation.step = timer.timed("physics", simulation.step)
+    game.render = timer.timed("render", game.render)
+    display_update = pygame.display.update
+    pygame.display.update = timer.timed("display", display_update)
+
+    try:
+        # Measure the speed first, without the overhead of tracing the allocations
+        gc_collections = sum(stats["collections"] for stats in gc.get_stats())
+        allocated_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        for _ in range(tick_count):
+            before_tick()
+            game.process_events()
+            game.update(TICK_DELTA_TIME)
+            game.render()
+        elapsed = time.perf_counter() - start
+        allocated_blocks = sys.getallocatedblocks() - allocated_blocks
+        gc_collections = sum(stats["collections"] for stats in gc.get_stats()) - gc_collections
+
+        # Then count the memory allocated by a tenth of the ticks
+        traced_tick_count = max(1, tick_count // 10)
+        tracemalloc.start()
+        for _ in range(traced_tick_count):
+            before_tick()
+            game.process_events()
+            game.update(TICK_DELTA_TIME)
+            game.render()
+        traced_memory, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        pygame.display.update = display_update
+        game.quit()
+
+    return {
+        "ticks": tick_count,
+        "seconds": elapsed,
+        "ticks_per_second": tick_count / elapsed,
+        "phases": {
+            phase: {
+                "total_seconds": timer.totals[phase],
+                "mean_milliseconds": timer.totals[phase] / tick_count * 1000,
+            }
+            for phase in PHASES
+        },
+        "allocations": {
+            "net_allocated_blocks": allocated_blocks,
+            "gc_collections": gc_collections,
+            "traced_ticks": traced_tick_count,
+            "traced_bytes_retained": traced_memory,
+            "traced_bytes_peak": traced_peak,
+        },
+    }
+
+
+"""Run the provided scenarios and collect their results along with information about the environment"""
+def run_benchmark(scenario_names: list[str], tick_count: int) -> dict:
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        "scenarios": {name: run_scenario(name, tick_count) for name in scenario_names},
+    }
+
+
+"""Print the results, compared against the results of an earlier run if provided"""
+def print_results(results: dict, baseline: dict = None) -> None:
+    for name, scenario in results["scenarios"].items():
+        line = f"{name}: {scenario['ticks_per_second']:.0f} ticks/s"
+
+        if baseline is not None and name in baseline["scenarios"]:
+            baseline_speed = baseline["scenarios"][name]["ticks_per_second"]
+            line += f" ({(scenario['ticks_per_second'] / baseline_speed - 1) * 100:+.1f}% vs baseline)"
+        print(line)
+
+        for phase, timing in scenario["phases"].items():
+            print(f"    {phase:<8} {timing['mean_milliseconds']:.4f} ms/tick")
+        allocations = scenario["allocations"]
+        print(f"    {allocations['traced_bytes_peak']} B peak traced memory over {allocations['traced_ticks']} ticks, "
+              f"{allocations['gc_collections']} gc collections")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the game loop of Py-Pong! using scripted scenarios")
+    parser.add_argument("--ticks", type=int, default=5000, help="amount of ticks to run per scenario")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS.keys(),
+                        help="scenario to run (can be repeated), all of them by default")
+    parser.add_argument("--output", help="path of the JSON file to save the results to")
+    parser.add_argument("--compare", help="path of the JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.scenario or list(SCENARIOS.keys()), args.ticks)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import time
+# Frames are rendered off-screen, no window is ever opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+from pypong.core.config import PRESETS, load_profile
+from pypong.core.frame_exporter import FRAME_FORMATS, FrameExporter
+from pypong.core.replay import Replay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the frames of a Py-Pong! replay into an image sequence")
+    parser.add_argument("replay", help="path of the replay file")
+    parser.add_argument("output", help="directory the frames are saved to")
+    parser.add_argument("--format", default="png", choices=FRAME_FORMATS.keys(), help="format of the frames")
+    parser.add_argument("--frame-rate", type=float, default=60, help="frames per second of the match's time")
+    parser.add_argument("--first-tick", type=int, default=0, help="first tick of the exported part of the match")
+    parser.add_argument("--last-tick", type=int, help="last tick of the exported part of the match")
+    parser.add_argument("--workers", type=int, help="amount of processes encoding the frames, the amount of CPU cores by default")
+    parser.add_argument("--compression", type=int, default=6, choices=range(0, 10), metavar="0-9",
+                        help="compression level of the PNG frames")
+    parser.add_argument("--preset", default="default", choices=PRESETS.keys(), help="profile the look of the frames is taken from")
+    parser.add_argument("--config", metavar="PATH", help="TOML or JSON file changing the look of the frames")
+    args = parser.parse_args()
+
+    profile = PRESETS[args.preset]
+    if args.config is not None:
+        profile = load_profile(args.config, profile)
+
+    replay = Replay.load(args.replay)
+    exporter = FrameExporter(profile, args.frame_rate, args.format, args.compression, args.workers)
+
+    start = time.perf_counter()
+    frame_count = exporter.export(replay, args.output, args.first_tick, args.last_tick)
+    elapsed = time.perf_counter() - start
+    print(f"{frame_count} frames exported to {args.output} in {elapsed:.1f} s ({frame_count / elapsed:.0f} frames/s)")
+    if args.format == "raw":
+        width, height = replay.window_size
+        print(f"raw frames: 24-bit RGB, {width}x{height} (ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height})")
+
+
+if __name__ == "__main__":
+    main()
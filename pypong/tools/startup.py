@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# Startup modes that are measured and whether they use the fast startup (see GameProfile.fast_startup)
+MODES = {
+    "full": False,
+    "fast": True,
+}
+
+# Names of the measured phases of a start, in the order in which they happen
+PHASES = ("import_pygame", "import_game", "init", "first_frame")
+
+
+"""Start the game once and measure how long each phase of the start takes
+Meant to be run in a fresh interpreter (see measure_startup()), nothing may import pygame before it
+Returns a dictionary of the duration (in seconds) of each phase"""
+def run_startup(mode: str) -> dict:
+    timings = dict()
+
+    start = time.perf_counter()
+    import pygame
+    timings["import_pygame"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from pypong.core.config import PRESETS
+    from pypong.core.game_instance import GameInstance
+    timings["import_game"] = time.perf_counter() - start
+
+    # Both modes run without a display, they only differ in what gets initialized
+    profile = PRESETS["headless-benchmark"]._replace(
+        fast_startup=MODES[mode],
+        window_caption="Py-Pong! startup",
+        video_driver=os.environ.get("SDL_VIDEODRIVER", "dummy"),
+        seed=0
+    )
+
+    start = time.perf_counter()
+    game = GameInstance()
+    game.start_from_profile(profile)
+    timings["init"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    game.process_events()
+    game.update(1 / profile.tick_rate)
+    game.render()
+    timings["first_frame"] = time.perf_counter() - start
+
+    game.quit()
+    return timings
+
+
+"""Start the game 'run_count' times in fresh interpreters (so that nothing is imported or cached yet)
+Returns a dictionary of the results, ready to be saved as JSON"""
+def measure_startup(mode: str, run_count: int) -> dict:
+    environment = dict(os.environ)
+    environment.setdefault("SDL_VIDEODRIVER", "dummy")
+    environment.setdefault("SDL_AUDIODRIVER", "dummy")
+    environment["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+    runs = []
+    process_times = []
+    for _ in range(run_count):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "pypong.tools.startup", "--child", mode],
+            env=environment, capture_output=True, text=True, check=True
+        ).stdout
+        process_times.append(time.perf_counter() - start)
+        runs.append(json.loads(output))
+
+    return {
+        "runs": run_count,
+        "phases": {
+            phase: {"median_milliseconds": statistics.median(run[phase] for run in runs) * 1000}
+            for phase in PHASES
+        },
+        # Time to first frame as seen from the outside, the interpreter's own start up and shut down included
+        "process_median_milliseconds": statistics.median(process_times) * 1000,
+    }
+
+
+"""Print the results, comparing every mode against the first one"""
+def print_results(results: dict) -> None:
+    reference = None
+    for mode, result in results.items():
+        line = f"{mode}: {result['process_median_milliseconds']:.1f} ms per process"
+        if reference is not None:
+            line += f" ({(result['process_median_milliseconds'] / reference - 1) * 100:+.1f}% vs {next(iter(results))})"
+        else:
+            reference = result["process_median_milliseconds"]
+        print(line)
+
+        for phase, timing in result["phases"].items():
+            print(f"    {phase:<14} {timing['median_milliseconds']:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure how long Py-Pong! takes to start and show its first frame")
+    parser.add_argument("--runs", type=int, default=10, help="amount of starts to measure per mode")
+    parser.add_argument("--mode", action="append", choices=MODES.keys(),
+                        help="startup mode to measure (can be repeated), all of them by default")
+    parser.add_argument("--output", help="path of the JSON file to save the results to")
+    # Used internally, measures a single start and prints the timings as JSON
+    parser.add_argument("--child", choices=MODES.keys(), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_startup(args.child)))
+        return
+
+    results = {mode: measure_startup(mode, args.runs) for mode in args.mode or list(MODES.keys())}
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import time
+import numpy as np
+from pypong.core.cpu_player import CpuPlayer
+from pypong.core.game_stats import PlayerIndex
+from pypong.core.match_runner import MatchResult, MatchRunner
+from pypong.core.telemetry import TelemetryWriter
+from pypong.core.telemetry_query import TelemetryStore, hit_position_histogram, point_counts, \
+                                        rally_hit_histogram, rally_length_histogram, serve_direction_counts
+
+
+# Amount of pixels the CPU players' predictions are randomly off by, enough for both of them to miss now and then
+CPU_ERROR = 150.0
+
+
+# Plays headless matches between two CPU players and appends their events to the store
+def record(args: argparse.Namespace) -> None:
+    # The CPU players are seeded from the seeds of the matches by the runner
+    runner = MatchRunner(CpuPlayer(error=CPU_ERROR),
+                         CpuPlayer(error=CPU_ERROR),
+                         points_to_win=args.points,
+                         worker_count=args.workers,
+                         record_events=True)
+
+    start = time.perf_counter()
+    with TelemetryWriter(args.store) as writer:
+        def append_events(result: MatchResult) -> None:
+            writer.append(result.events)
+
+        summary = runner.run(args.matches, args.seed, append_events)
+        match_count = writer.get_match_count()
+    elapsed = time.perf_counter() - start
+    print(f"{summary.match_count} matches recorded in {elapsed:.1f} s, the store has {match_count} matches")
+
+
+# Prints the aggregates of all of the events in the store
+def report(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    store = TelemetryStore(args.store)
+    print(f"{store.get_match_count()} matches, {store.get_event_count()} events")
+
+    points = point_counts(store)
+    print(f"points: player one {points[0]}, player two {points[1]}")
+
+    serves = serve_direction_counts(store)
+    print(f"serves: up-left {serves[0, 0]}, down-left {serves[0, 1]}, up-right {serves[1, 0]}, down-right {serves[1, 1]}")
+
+    lengths = rally_length_histogram(store)
+    if lengths.sum() > 0:
+        mean_length = (lengths * np.arange(len(lengths))).sum() / lengths.sum()
+        print(f"rallies: {lengths.sum()}, mean length {mean_length:.1f} ticks, longest {len(lengths) - 1} ticks")
+
+    hits = rally_hit_histogram(store)
+    if hits.sum() > 0:
+        mean_hits = (hits * np.arange(len(hits))).sum() / hits.sum()
+        print(f"paddle hits per rally: mean {mean_hits:.1f}, most {len(hits) - 1}, without any hits {hits[0]}")
+
+    for player in (PlayerIndex.PLAYER_ONE, PlayerIndex.PLAYER_TWO):
+        counts, edges = hit_position_histogram(store, args.bins, player)
+        print(f"hit positions of player {player.value} (top to bottom): " + " ".join(str(count) for count in counts))
+    print(f"queried in {time.perf_counter() - start:.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record and query the events of headless Py-Pong! matches")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="play matches between CPU players and append their events to a store")
+    record_parser.add_argument("store", help="directory of the telemetry store")
+    record_parser.add_argument("--matches", type=int, default=1000, help="amount of matches to play")
+    record_parser.add_argument("--points", type=int, default=10, help="points needed to win a match")
+    record_parser.add_argument("--seed", type=int, default=0, help="root seed of the matches")
+    record_parser.add_argument("--workers", type=int, help="amount of processes playing the matches, the amount of CPU cores by default")
+    record_parser.set_defaults(handler=record)
+
+    report_parser = commands.add_parser("report", help="print the aggregates of the events in a store")
+    report_parser.add_argument("store", help="directory of the telemetry store")
+    report_parser.add_argument("--bins", type=int, default=10, help="amount of bins of the hit position histograms")
+    report_parser.set_defaults(handler=report)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import copy
+import pickle
+import random
+from pypong.core.simulation import Simulation
+from pypong.gameplay.ball import Ball
+
+
+def test_velocity_is_a_tuple():
+    ball = Ball([10.0, 20.0], [3.0, -4.0], (5, 5))
+    assert ball.velocity == (3.0, -4.0)
+
+    ball.reverse_velocity(0)
+    ball.velocity = (ball.velocity[0], 6.0)
+    assert ball.velocity == (-3.0, 6.0)
+    assert ball.get_position() == (10.0, 20.0)
+
+
+def test_ball_can_be_pickled_and_copied():
+    ball = Ball([10.0, 20.0], [3.0, -4.0], (5, 5))
+    for ball_copy in (pickle.loads(pickle.dumps(ball)), copy.deepcopy(ball)):
+        assert ball_copy.velocity == (3.0, -4.0)
+        assert ball_copy.get_position() == (10.0, 20.0)
+        assert ball_copy.get_scale() == (5, 5)
+
+        # The copy doesn't share its state with the original
+        ball_copy.reverse_velocity(1)
+        assert ball.velocity == (3.0, -4.0)
+
+
+def test_simulation_can_be_copied():
+    simulation = Simulation((800, 600), rng=random.Random(0))
+    simulation.advance_state()
+    simulation.advance_state()
+    simulation.step(1 / 60)
+
+    simulation_copy = copy.deepcopy(simulation)
+    assert simulation_copy.snapshot() == simulation.snapshot()
@@ -0,0 +1,70 @@
+import random
+import numpy as np
+from pypong.core.batch_simulation import BatchSimulation
+from pypong.core.game_stats import GameState
+from pypong.core.simulation import PaddleDirection, Simulation
+
+
+WINDOW_SIZE = (800, 600)
+MATCH_COUNT = 64
+TICK_COUNT = 2000
+
+
+# Copies the state of the simulations into arrays laid out like the ones of BatchSimulation
+def gather_state(simulations: list[Simulation]) -> dict:
+    return {
+        "ball_positions": np.array([simulation.get_ball().get_position() for simulation in simulations]),
+        "ball_velocities": np.array([tuple(simulation.get_ball().velocity) for simulation in simulations]),
+        "paddle_positions": np.array([(simulation.get_player_one().get_position()[1], simulation.get_player_two().get_position()[1])
+                                      for simulation in simulations]),
+        "scores": np.array([simulation.get_game_stats().score for simulation in simulations]),
+        "game_states": np.array([simulation.get_game_stats().current_game_state.value for simulation in simulations]),
+        "players_who_last_scored": np.array([int(simulation.get_game_stats().player_who_last_scored)
+                                             for simulation in simulations]),
+    }
+
+
+def assert_same_state(simulations: list[Simulation], batch: BatchSimulation, tick: int) -> None:
+    expected = gather_state(simulations)
+    actual = {
+        "ball_positions": batch.get_ball_positions(),
+        "ball_velocities": batch.get_ball_velocities(),
+        "paddle_positions": batch.get_paddle_positions(),
+        "scores": batch.get_scores(),
+        "game_states": batch.get_game_states(),
+        "players_who_last_scored": batch.get_players_who_last_scored(),
+    }
+    for name, values in expected.items():
+        mismatches = np.flatnonzero(np.any((values != actual[name]).reshape(len(simulations), -1), axis=1))
+        assert len(mismatches) == 0, f"{name} of matches {mismatches.tolist()} differ on tick {tick}"
+
+
+def test_batch_simulation_matches_simulation_every_tick():
+    input_rng = np.random.default_rng(0)
+    simulations = [Simulation(WINDOW_SIZE, rng=random.Random(seed)) for seed in range(MATCH_COUNT)]
+    batch = BatchSimulation(MATCH_COUNT, WINDOW_SIZE, seed=0)
+    assert_same_state(simulations, batch, 0)
+
+    for tick in range(1, TICK_COUNT + 1):
+        # Matches without a round in progress are advanced right away
+        idle = batch.get_game_states() != GameState.ROUND_IN_PROGRESS.value
+        launched = idle & (batch.get_game_states() == GameState.ROUND_START.value)
+        batch.advance_state(idle)
+        for index in np.flatnonzero(idle):
+            simulations[index].advance_state()
+        # Both sides launch the ball in the same way but draw the directions from different generators,
+        # the launches of the simulations are copied over so that the matches can be compared
+        for index in np.flatnonzero(launched):
+            batch.get_ball_velocities()[index] = simulations[index].get_ball().velocity
+
+        # Random paddle inputs and time steps, including ones large enough for the ball to overlap the paddles deeply
+        directions = input_rng.integers(-1, 2, size=(2, MATCH_COUNT))
+        delta_time = float(input_rng.uniform(1 / 240, 1 / 20))
+        batch.step(delta_time, directions[0], directions[1])
+        for index, simulation in enumerate(simulations):
+            simulation.step(delta_time, PaddleDirection(directions[0, index]), PaddleDirection(directions[1, index]))
+
+        assert_same_state(simulations, batch, tick)
+
+    # The comparison is only meaningful if the matches have actually been played
+    assert batch.get_scores().sum() > MATCH_COUNT
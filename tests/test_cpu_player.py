@@ -0,0 +1,30 @@
+import random
+from pypong.core.cpu_player import CpuPlayer
+from pypong.core.match_runner import MatchRunner
+
+
+def run_matches(worker_count: int, rng: random.Random = None) -> list:
+    runner = MatchRunner(CpuPlayer(error=150.0, rng=rng), CpuPlayer(error=150.0),
+                         points_to_win=2, max_ticks=20_000, worker_count=worker_count)
+    return sorted((result.match_index, result.score, result.tick_count, tuple(result.rally_lengths))
+                  for result in runner.iter_results(6, 7))
+
+
+def test_cpu_player_matches_run_across_worker_processes():
+    # The CPU players are pickled for the workers and copied for every match
+    runner = MatchRunner(CpuPlayer(error=150.0), CpuPlayer(error=150.0, rng=random.Random(1)),
+                         points_to_win=2, max_ticks=20_000, worker_count=2)
+    summary = runner.run(4, root_seed=0)
+
+    assert summary.match_count == 4
+    assert summary.tick_count > 0
+    assert summary.rally_count == sum(summary.points)
+
+
+def test_cpu_player_matches_are_reproducible_from_the_root_seed():
+    # The CPU players are reseeded from the matches' seeds, whatever generators they were created with
+    results = run_matches(1)
+    assert run_matches(1, random.Random(5)) == results
+    assert run_matches(3) == results
+    # Every match gets its own random errors
+    assert len({result[1:] for result in results}) > 1
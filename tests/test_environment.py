@@ -0,0 +1,98 @@
+import tracemalloc
+import numpy as np
+from pypong.core.environment import ACTION_COUNT, OBSERVATION_SIZE, PongEnv, VectorPongEnv
+from pypong.core.game_stats import PlayerIndex
+
+
+ENV_COUNT = 16
+STEP_COUNT = 600
+
+
+# Plays the steps with random actions, returns copies of everything the steps have returned
+def play(env: VectorPongEnv, seed: int) -> list:
+    action_rng = np.random.default_rng(seed)
+    results = [(env.reset(seed=seed)[0].copy(),)]
+    for _ in range(STEP_COUNT):
+        observations, rewards, terminated, truncated, _ = env.step(action_rng.integers(0, ACTION_COUNT, size=ENV_COUNT))
+        results.append((observations.copy(), rewards.copy(), terminated.copy(), truncated.copy()))
+    return results
+
+
+def is_same_play(results: list, other_results: list) -> bool:
+    return all(np.array_equal(array, other_array)
+               for step_results, other_step_results in zip(results, other_results)
+               for array, other_array in zip(step_results, other_step_results))
+
+
+def test_vector_env_shapes():
+    env = VectorPongEnv(ENV_COUNT, frame_skip=2, seed=0)
+    observations, info = env.reset()
+    assert observations.shape == (ENV_COUNT, OBSERVATION_SIZE)
+    assert observations.dtype == np.float32
+    assert info == dict()
+
+    observations, rewards, terminated, truncated, _ = env.step(np.ones(ENV_COUNT, dtype=np.int64))
+    assert observations.shape == (ENV_COUNT, OBSERVATION_SIZE)
+    assert rewards.shape == terminated.shape == truncated.shape == (ENV_COUNT,)
+    assert rewards.dtype == np.float32
+    assert terminated.dtype == truncated.dtype == bool
+    # The arrays are preallocated and reused every step
+    assert env.step(np.zeros(ENV_COUNT, dtype=np.int64))[0] is observations
+
+
+def test_vector_env_is_deterministic():
+    def create_env() -> VectorPongEnv:
+        return VectorPongEnv(ENV_COUNT, frame_skip=4, player=PlayerIndex.PLAYER_TWO, points_to_win=2, max_episode_steps=300)
+
+    results = play(create_env(), 7)
+    assert is_same_play(results, play(create_env(), 7))
+    assert not is_same_play(results, play(create_env(), 8))
+
+    # The episodes have both ended with a win and been cut off
+    assert any(terminated.any() for _, _, terminated, _ in results[1:])
+    assert any(truncated.any() for _, _, _, truncated in results[1:])
+    assert any((rewards != 0.0).any() for _, rewards, _, _ in results[1:])
+
+
+# Peak of the memory allocated by the steps of an environment (in bytes)
+def measure_step_memory(env_count: int) -> int:
+    # An opponent that doesn't allocate either, so that only the step itself is measured
+    directions = np.zeros(env_count, dtype=np.int8)
+    env = VectorPongEnv(env_count, opponent=lambda batch, player: directions, seed=0)
+    actions = np.ones(env_count, dtype=np.int64)
+    env.reset()
+    env.step(actions)
+
+    tracemalloc.start()
+    try:
+        # No ball reaches a paddle this early, the rounds are only started at the end of an episode
+        for _ in range(10):
+            env.step(actions)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_vector_env_step_doesnt_allocate_per_env():
+    # NumPy's casting buffers have a fixed size, anything else would grow with the amount of environments
+    assert measure_step_memory(200_000) < measure_step_memory(20_000) + 20_000
+
+
+def test_env_shapes_and_determinism():
+    def play_single(seed: int) -> list:
+        env = PongEnv(frame_skip=2, points_to_win=2, max_episode_steps=500)
+        observation, info = env.reset(seed=seed)
+        assert observation.shape == (OBSERVATION_SIZE,)
+        assert observation.dtype == np.float32
+        results = [observation.tolist()]
+        action_rng = np.random.default_rng(seed)
+        for _ in range(STEP_COUNT):
+            observation, reward, terminated, truncated, _ = env.step(int(action_rng.integers(0, ACTION_COUNT)))
+            assert observation.shape == (OBSERVATION_SIZE,)
+            results.append((observation.tolist(), reward, terminated, truncated))
+            if terminated or truncated:
+                results.append(env.reset()[0].tolist())
+        return results
+
+    assert play_single(3) == play_single(3)
+    assert play_single(3) != play_single(4)
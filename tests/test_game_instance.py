@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from pypong.core.config import PRESETS
+from pypong.core.game_instance import GameInstance
+
+
+# Runs without a display and has a fixed seed
+PROFILE = PRESETS["headless-benchmark"]
+
+
+def start(**kwargs) -> GameInstance:
+    game = GameInstance()
+    game.start(640, 480, "Test", profile=PROFILE, **kwargs)
+    return game
+
+
+def test_start_keeps_the_options_of_the_profile():
+    game = start()
+    try:
+        profile = game.get_profile()
+        assert profile.seed == PROFILE.seed
+        assert profile.vsync == PROFILE.vsync
+        assert profile.accelerated == PROFILE.accelerated
+        assert (profile.window_width, profile.window_height, profile.window_caption) == (640, 480, "Test")
+        assert profile._replace(window_width=PROFILE.window_width, window_height=PROFILE.window_height,
+                                window_caption=PROFILE.window_caption) == PROFILE
+    finally:
+        game.quit()
+
+
+def test_start_arguments_take_precedence_over_the_profile():
+    for seed in (5, None):
+        game = start(seed=seed)
+        try:
+            assert game.get_profile().seed == seed
+        finally:
+            game.quit()
+
+
+def test_optional_features_arent_imported_upfront():
+    # A fresh interpreter, the modules imported by the other tests are already loaded in this one
+    optional_modules = ("pypong.core.headless", "pypong.core.instrumentation", "pypong.core.offscreen_window",
+                        "pypong.core.replay", "pypong.core.simulation_thread", "pypong.core.accelerated_window")
+    result = subprocess.run([sys.executable, "-c", "import sys, pypong.core.game_instance; "
+                             f"print([name for name in {optional_modules!r} if name in sys.modules])"],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.join(os.path.dirname(__file__), ".."))
+    assert result.stdout.splitlines()[-1] == "[]"
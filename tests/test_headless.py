@@ -0,0 +1,42 @@
+import random
+from pypong.core.game_stats import GameState, PlayerIndex
+from pypong.core.headless import HeadlessGame, ScriptedPolicy
+from pypong.core.simulation import PaddleDirection
+
+
+TICK_COUNT = 5000
+
+
+def play(seed: int) -> HeadlessGame:
+    game = HeadlessGame((800, 600), 1 / 60,
+                        ScriptedPolicy([PaddleDirection.UP] * 40 + [PaddleDirection.DOWN] * 40, loop=True),
+                        ScriptedPolicy([PaddleDirection.DOWN] * 25 + [PaddleDirection.NONE] * 30, loop=True),
+                        random.Random(seed))
+    for _ in range(TICK_COUNT):
+        game.tick()
+    return game
+
+
+def test_headless_game_plays_on_its_own():
+    game = play(0)
+    game_stats = game.get_simulation().get_game_stats()
+
+    assert game.get_tick_count() == TICK_COUNT
+    # The game presses SPACE by itself, so rounds get played and finished
+    assert sum(game_stats.score) > 0
+    assert len(game.get_rally_lengths()) == sum(game_stats.score)
+    assert game_stats.player_who_last_scored in (PlayerIndex.PLAYER_ONE, PlayerIndex.PLAYER_TWO)
+
+
+def test_headless_game_is_deterministic_for_a_seed():
+    first, second = play(3), play(3)
+    assert first.get_simulation().snapshot() == second.get_simulation().snapshot()
+    assert first.get_rally_lengths() == second.get_rally_lengths()
+
+
+def test_run_stops_at_points_to_win():
+    game = HeadlessGame(rng=random.Random(1))
+    game.run(points_to_win=3)
+    game_stats = game.get_simulation().get_game_stats()
+    assert max(game_stats.score) == 3
+    assert game_stats.current_game_state == GameState.ROUND_END
@@ -0,0 +1,100 @@
+import gc
+import time
+from pypong.core.config import PRESETS
+from pypong.core.game_instance import GameInstance
+from pypong.core.game_stats import GameState
+
+
+PROFILE = PRESETS["headless-benchmark"]
+DELTA_TIME = 1 / 60
+
+
+# Starts a game in a window of the dummy video driver
+def start_game() -> GameInstance:
+    # The window of a game left over by a previous test quits the display once it's collected
+    gc.collect()
+    game = GameInstance()
+    game.start_from_profile(PROFILE)
+    return game
+
+
+def test_idle_frames_arent_measured():
+    game = start_game()
+    try:
+        profiler = game.enable_instrumentation(frame_budget=0.05, show_overlay=False)
+        # The start screen is shown once, after that there's nothing to render until an event arrives
+        for _ in range(5):
+            game.render()
+            time.sleep(0.1)
+        assert profiler.get_frame_statistics()["frames"] == 0
+
+        game.get_simulation().advance_state()
+        game.get_simulation().advance_state()
+        for _ in range(5):
+            game.update(DELTA_TIME)
+            game.render()
+        assert game.get_game_stats().current_game_state == GameState.ROUND_IN_PROGRESS
+
+        # The time spent waiting on the start screen doesn't end up in the first frame of the round
+        statistics = profiler.get_frame_statistics()
+        assert statistics["frames"] == 4
+        assert statistics["dropped_frames"] == 0
+        assert statistics["max"] < 100
+    finally:
+        game.quit()
+
+
+def test_stages_are_reported_per_section():
+    game = start_game()
+    try:
+        profiler = game.enable_instrumentation(show_overlay=False)
+        game.get_simulation().advance_state()
+        game.get_simulation().advance_state()
+        for _ in range(30):
+            game.process_events()
+            game.update(DELTA_TIME)
+            game.render()
+
+        statistics = profiler.get_stage_statistics()
+        # Every instrumented section has its own entry, even the ones that haven't run (eg. the swept physics)
+        for stage in ("handle_events", "handle_input", "move_paddle", "move_balls", "move_balls_swept",
+                      "handle_collisions", "evaluate_score", "render_paddles", "render_balls",
+                      "render_score_counter", "update_display"):
+            assert set(statistics[stage]) == {"mean", "p50", "p95", "p99", "max"}
+        for stage in ("move_balls", "evaluate_score", "render_balls", "update_display"):
+            assert 0.0 < statistics[stage]["mean"] <= statistics[stage]["max"]
+        assert statistics["move_balls_swept"]["max"] == 0.0
+        # The sections run within the frames
+        frame_statistics = profiler.get_frame_statistics()
+        assert frame_statistics["frames"] == 29
+        assert statistics["render_balls"]["mean"] < frame_statistics["mean"]
+    finally:
+        game.quit()
+
+
+def test_physics_isnt_measured_on_the_simulation_thread():
+    game = start_game()
+    try:
+        profiler = game.enable_instrumentation(show_overlay=False)
+        simulation = game.get_simulation()
+        game.start_simulation_thread(tick_rate=240)
+        # The simulation thread steps the original methods
+        assert "_move_balls" not in vars(simulation)
+        assert "move_balls" not in profiler.get_stage_statistics()
+
+        game.get_simulation_thread().request_advance()
+        game.get_simulation_thread().request_advance()
+        for _ in range(10):
+            game.process_events()
+            game.render()
+            time.sleep(0.01)
+        game.stop_simulation_thread()
+        assert simulation.get_game_stats().current_game_state == GameState.ROUND_IN_PROGRESS
+        assert "render_balls" in profiler.get_stage_statistics()
+
+        # Measured again once the simulation is back on the main thread
+        game.update(DELTA_TIME)
+        game.render()
+        assert profiler.get_stage_statistics()["move_balls"]["max"] > 0.0
+    finally:
+        game.quit()
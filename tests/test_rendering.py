@@ -0,0 +1,134 @@
+import gc
+import numpy as np
+import pygame
+import pytest
+from pypong.core.compositor import LayeredCompositor
+from pypong.core.config import PRESETS
+from pypong.core.game_instance import GameInstance
+from pypong.core.game_stats import GameState, PlayerIndex
+from pypong.core.headless import ScriptedPolicy
+from pypong.core.offscreen_window import OffscreenWindow
+from pypong.core.simulation import PaddleDirection
+
+
+# Runs without a display and has a fixed seed
+PROFILE = PRESETS["headless-benchmark"]
+FRAME_COUNT = 600
+
+
+def control(game: GameInstance) -> None:
+    game.set_controller(PlayerIndex.PLAYER_ONE,
+                        ScriptedPolicy([PaddleDirection.UP] * 50 + [PaddleDirection.DOWN] * 70, loop=True))
+    game.set_controller(PlayerIndex.PLAYER_TWO,
+                        ScriptedPolicy([PaddleDirection.DOWN] * 30 + [PaddleDirection.UP] * 45, loop=True))
+
+
+# Advances the game by a frame, pressing SPACE whenever a round isn't in progress
+# Rendered between the updates, so that the moving objects are drawn at interpolated positions
+def play_frame(game: GameInstance, frame: int) -> None:
+    simulation = game.get_simulation()
+    if frame % 20 == 0 and simulation.get_game_stats().current_game_state != GameState.ROUND_IN_PROGRESS:
+        simulation.advance_state()
+    game.update(1 / 60)
+    game.render((frame % 4) / 3)
+
+
+@pytest.mark.parametrize("ball_count", [1, 5, 12])
+def test_dirty_rects_match_a_full_redraw(ball_count: int):
+    # The window of a game left over by the previous run quits the display once it's collected
+    gc.collect()
+    profile = PROFILE._replace(ball_count=ball_count, obstacles=((300, 120, 40, 40),) if ball_count > 1 else ())
+    # Repaints only the dirty areas and keeps the layers of every scene
+    game = GameInstance()
+    game.start_from_profile(profile)
+    # Draws every frame in full, the layers of a scene are drawn again every time the scene changes
+    reference = GameInstance()
+    reference.start_offscreen(profile._replace(layer_cache_size=1))
+    try:
+        control(game)
+        control(reference)
+        shown_states = set()
+        for frame in range(FRAME_COUNT):
+            play_frame(game, frame)
+            play_frame(reference, frame)
+            shown_states.add(game.get_game_stats().current_game_state)
+
+            pixels = np.array(game.get_window().get_pixels())
+            reference_pixels = np.array(reference.get_window().get_pixels())
+            mismatches = np.argwhere(np.any(pixels != reference_pixels, axis=2))
+            assert len(mismatches) == 0, f"frame {frame} differs at {len(mismatches)} pixels, eg. (y, x) {mismatches[0]}"
+
+        # Every state of a round has been shown, along with several rounds
+        assert GameState.ROUND_END in shown_states
+        assert sum(game.get_game_stats().score) > 1
+    finally:
+        game.quit()
+        reference.quit()
+
+
+def test_texture_rendering_matches_blitting():
+    gc.collect()
+    profile = PROFILE._replace(ball_count=3)
+    # Draws Textures through SDL's software render driver, which needs no GPU
+    game = GameInstance()
+    game.start_from_profile(profile._replace(accelerated=True, render_driver="software"))
+    # Blits Surfaces, the same as a GameWindow does
+    reference = GameInstance()
+    reference.start_offscreen(profile)
+    try:
+        control(game)
+        control(reference)
+        shown_states = set()
+        for frame in range(300):
+            play_frame(game, frame)
+            play_frame(reference, frame)
+            shown_states.add(game.get_game_stats().current_game_state)
+
+            pixels = pygame.surfarray.array3d(game.get_window().get_surface().to_surface()).transpose(1, 0, 2)
+            reference_pixels = np.array(reference.get_window().get_pixels())
+            mismatches = np.argwhere(np.any(pixels != reference_pixels, axis=2))
+            assert len(mismatches) == 0, f"frame {frame} differs at {len(mismatches)} pixels, eg. (y, x) {mismatches[0]}"
+        assert GameState.ROUND_END in shown_states
+    finally:
+        game.quit()
+        reference.quit()
+
+
+def test_unknown_render_driver_is_rejected():
+    gc.collect()
+    try:
+        with pytest.raises(ValueError, match="Unknown render driver 'no-such-driver', available: .*software"):
+            GameInstance().start_from_profile(PROFILE._replace(accelerated=True, render_driver="no-such-driver"))
+    finally:
+        pygame.quit()
+
+
+def test_compositor_draws_layers_once():
+    pygame.font.init()
+    window = OffscreenWindow(64, 48)
+    compositor = LayeredCompositor(window, cache_size=2)
+    draw_counts = dict()
+
+    def draw(color):
+        def draw_layer(surface: pygame.Surface) -> None:
+            draw_counts[color] = draw_counts.get(color, 0) + 1
+            surface.fill(color)
+        return draw_layer
+
+    court = compositor.get_static_layer("court", draw((0, 0, 0)))
+    assert compositor.get_static_layer("court", draw((1, 1, 1))) is court
+    assert court.get_size() == (64, 48)
+
+    red = compositor.get_scene_layer("red", draw((255, 0, 0)))
+    compositor.get_scene_layer("green", draw((0, 255, 0)))
+    # Using the red layer again makes the green one the least recently used
+    assert compositor.get_scene_layer("red", draw((255, 0, 0))) is red
+    compositor.get_scene_layer("blue", draw((0, 0, 255)))
+    compositor.get_scene_layer("green", draw((0, 255, 0)))
+    assert draw_counts == {(0, 0, 0): 1, (255, 0, 0): 1, (0, 255, 0): 2, (0, 0, 255): 1}
+    assert red.get_at((10, 10))[:3] == (255, 0, 0)
+
+    # The static layers are kept regardless of the size of the cache, until the compositor is cleared
+    assert compositor.get_static_layer("court", draw((1, 1, 1))) is court
+    compositor.clear()
+    assert compositor.get_static_layer("court", draw((1, 1, 1))) is not court
@@ -0,0 +1,63 @@
+import random
+import pytest
+from pypong.core.config import profile_from_dict
+from pypong.core.game_stats import GameState
+from pypong.core.replay import Replay, ReplayPlayer, ReplayRecorder
+from pypong.core.simulation import PaddleDirection, Simulation
+
+
+DELTA_TIME = 1 / 120
+
+
+# Plays a match with random inputs while recording it, returns the replay and the final snapshot
+def record_match(seed: int, tick_count: int) -> tuple:
+    simulation = Simulation((800, 600), rng=random.Random(seed))
+    recorder = ReplayRecorder(seed, DELTA_TIME, (800, 600))
+    input_rng = random.Random(1)
+    for _ in range(tick_count):
+        advance_count = 1 if simulation.get_game_stats().current_game_state != GameState.ROUND_IN_PROGRESS else 0
+        directions = (PaddleDirection(input_rng.randint(-1, 1)), PaddleDirection(input_rng.randint(-1, 1)))
+        recorder.record_tick(*directions, advance_count)
+        for _ in range(advance_count):
+            simulation.advance_state()
+        simulation.step(DELTA_TIME, *directions)
+    return recorder.get_replay(), simulation.snapshot()
+
+
+@pytest.mark.parametrize("seed", [0, -1, 2**63 - 1, -2**63, 1_700_000_000_000])
+def test_replay_round_trip(seed: int):
+    replay, final_snapshot = record_match(seed, 2000)
+    decoded = Replay.from_bytes(replay.to_bytes())
+    assert decoded.seed == seed
+    assert decoded.ticks == replay.ticks
+
+    player = ReplayPlayer(decoded)
+    while player.step():
+        pass
+    assert player.get_simulation().snapshot() == final_snapshot
+
+
+def test_profile_seed_must_fit_into_a_replay():
+    assert profile_from_dict({"seed": -1}).seed == -1
+    with pytest.raises(ValueError):
+        profile_from_dict({"seed": 2**63})
+
+
+def test_truncated_replay_is_rejected():
+    data = record_match(0, 2000)[0].to_bytes()
+    # Cut off anywhere, within the header, a run length or right before a tick byte
+    for length in range(len(data)):
+        with pytest.raises(ValueError, match="Truncated replay"):
+            Replay.from_bytes(data[:length])
+
+
+def test_corrupt_replay_is_rejected():
+    replay = Replay(0, DELTA_TIME, (800, 600), ticks=bytearray(b"\x00" * 10))
+    data = replay.to_bytes()
+    header = data[:-2]
+    # A run of no ticks, a run longer than the rest of the replay and a run length that never ends
+    for body in (b"\x00\x01", b"\x0b\x01", b"\x80" * 64):
+        with pytest.raises(ValueError):
+            Replay.from_bytes(header + body)
+    with pytest.raises(ValueError, match="supported version"):
+        Replay.from_bytes(b"PYRQ" + data[4:])
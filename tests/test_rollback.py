@@ -0,0 +1,68 @@
+import random
+from pypong.core.game_stats import PlayerIndex
+from pypong.core.simulation import PaddleDirection, Simulation
+from pypong.net.rollback import LoopbackTransport, RollbackSession
+
+
+DELTA_TIME = 1 / 60
+TICK_COUNT = 1500
+# Upper bound of the frames needed to get through all of the ticks, the test fails instead of hanging
+MAX_FRAME_COUNT = TICK_COUNT * 20
+
+
+"""Clock of the transports, advanced by the test one frame at a time"""
+class FakeClock:
+    def __init__(self) -> None:
+        self.time = 0.0
+
+
+    def __call__(self) -> float:
+        return self.time
+
+
+def play(latency: float, jitter: float, loss: float) -> tuple:
+    clock = FakeClock()
+    first_transport, second_transport = LoopbackTransport.create_pair(latency, jitter, clock, random.Random(1), loss)
+    sessions = (
+        RollbackSession(Simulation((800, 600), rng=random.Random(7)), PlayerIndex.PLAYER_ONE, first_transport, DELTA_TIME),
+        RollbackSession(Simulation((800, 600), rng=random.Random(7)), PlayerIndex.PLAYER_TWO, second_transport, DELTA_TIME),
+    )
+    # Every player holds a direction for a while and now and then presses SPACE
+    input_rngs = (random.Random(2), random.Random(3))
+    inputs = [(PaddleDirection.NONE, 0), (PaddleDirection.NONE, 0)]
+
+    for _ in range(MAX_FRAME_COUNT):
+        for index, session in enumerate(sessions):
+            if session.get_tick() == TICK_COUNT:
+                session.poll()
+                continue
+
+            if session.advance_frame(*inputs[index]):
+                input_rng = input_rngs[index]
+                direction = input_rng.choice(list(PaddleDirection)) if input_rng.random() < 0.1 else inputs[index][0]
+                inputs[index] = (direction, 1 if input_rng.random() < 0.02 else 0)
+
+        if all(session.get_confirmed_tick() == TICK_COUNT for session in sessions):
+            break
+        clock.time += DELTA_TIME
+
+    return sessions
+
+
+def assert_converged(sessions: tuple) -> None:
+    for session in sessions:
+        assert session.get_tick() == TICK_COUNT
+        assert session.get_confirmed_tick() == TICK_COUNT
+        # Otherwise the remote inputs have always been predicted correctly and nothing has been tested
+        assert session.get_rollback_stats()[0] > 0
+    assert sessions[0].get_simulation().snapshot() == sessions[1].get_simulation().snapshot()
+    # The players have actually played
+    assert sum(sessions[0].get_simulation().get_game_stats().score) > 0
+
+
+def test_sessions_converge_under_latency():
+    assert_converged(play(latency=0.08, jitter=0.04, loss=0.0))
+
+
+def test_sessions_converge_under_latency_and_loss():
+    assert_converged(play(latency=0.08, jitter=0.04, loss=0.25))
@@ -0,0 +1,92 @@
+import asyncio
+from pypong.core.game_stats import GameState, PlayerIndex
+from pypong.core.simulation import PaddleDirection
+from pypong.net.client import PongClient
+from pypong.net.protocol import MessageType, encode_frame, read_frame
+from pypong.net.server import PongServer
+
+
+# Fails the test instead of hanging if the server stops responding
+TIMEOUT = 5.0
+
+
+# Joins the room over a raw connection, so that malformed frames can be sent afterwards
+# Tries again while the room is full, the server frees the slots of disconnected players asynchronously
+async def join_raw(host: str, port: int, room_id: str) -> tuple:
+    while True:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode_frame(MessageType.JOIN, room_id.encode("utf-8")))
+        await writer.drain()
+        message_type, _ = await read_frame(reader)
+        if message_type == MessageType.WELCOME:
+            return reader, writer
+        writer.close()
+        await asyncio.sleep(0.01)
+
+
+# Sends the frame and waits for the server to close the connection
+async def send_and_expect_disconnect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, frame: bytes) -> None:
+    writer.write(frame)
+    await writer.drain()
+    # Skips the states sent before the server has read the frame
+    while await reader.read(4096) != b"":
+        pass
+    writer.close()
+
+
+async def wait_until(condition) -> None:
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+async def play_with_malformed_frames() -> None:
+    # Exceptions escaping the server's handlers only get logged by the event loop
+    unhandled_errors = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled_errors.append(context))
+
+    server = PongServer(tick_rate=240, seed=0)
+    host, port = await server.start()
+    try:
+        player_one = PongClient()
+        assert await player_one.connect(host, port, "room") == PlayerIndex.PLAYER_ONE
+
+        # An INPUT without its payload gets the client disconnected and frees its slot
+        reader, writer = await join_raw(host, port, "room")
+        await send_and_expect_disconnect(reader, writer, encode_frame(MessageType.INPUT))
+
+        player_two = PongClient()
+        assert await player_two.connect(host, port, "room") == PlayerIndex.PLAYER_TWO
+        assert server.get_room_count() == 1
+
+        # The room keeps running with valid input, from the start of the game to a round in progress
+        await player_one.send_input(PaddleDirection.DOWN)
+        await player_two.send_advance()
+        await player_one.send_advance()
+        await player_one.wait_for_tick(server.get_tick() + 10)
+        state = player_one.get_state()
+        assert state.game_state[0] == GameState.ROUND_IN_PROGRESS.value
+        assert state.ball_velocity != (0.0, 0.0)
+
+        # An INPUT with too long of a payload or an invalid direction is dropped the same way
+        await player_two.close()
+        for frame in (encode_frame(MessageType.INPUT, b"\x01\x00"), encode_frame(MessageType.INPUT, b"\x05")):
+            reader, writer = await join_raw(host, port, "room")
+            await send_and_expect_disconnect(reader, writer, frame)
+
+        player_two = PongClient()
+        assert await player_two.connect(host, port, "room") == PlayerIndex.PLAYER_TWO
+        await player_two.send_input(PaddleDirection.UP)
+        await player_one.wait_for_tick(server.get_tick() + 10)
+        await player_two.wait_for_tick(server.get_tick())
+
+        # The room is closed once both players have left
+        await player_one.close()
+        await player_two.close()
+        await wait_until(lambda: server.get_room_count() == 0)
+    finally:
+        await server.stop()
+    assert unhandled_errors == []
+
+
+def test_server_survives_malformed_frames():
+    asyncio.run(asyncio.wait_for(play_with_malformed_frames(), TIMEOUT))
@@ -0,0 +1,68 @@
+from pypong.core.game_stats import GameState, MatchEventType, PlayerIndex
+from pypong.core.simulation import Simulation
+
+
+WINDOW_SIZE = (800, 600)
+DELTA_TIME = 0.1
+
+
+# Starts a round with the ball placed at the provided position and moving at the provided velocity
+def serve(simulation: Simulation, position: tuple, velocity: tuple) -> list:
+    simulation.advance_state()
+    simulation.advance_state()
+    # Only the events that follow the serve
+    events = []
+    simulation.get_game_stats().event_listener = events.append
+    ball = simulation.get_ball()
+    ball.move((position[0] - ball.get_x(), position[1] - ball.get_y()))
+    ball.velocity = velocity
+    return events
+
+
+def test_swept_ball_scores_past_the_paddle():
+    simulation = Simulation(WINDOW_SIZE, swept_collisions=True, ball_speed=2000)
+    # Above the left paddle, heading into the left edge of the window within the tick
+    events = serve(simulation, (150, 20), (-2000, 0))
+    simulation.step(DELTA_TIME)
+
+    game_stats = simulation.get_game_stats()
+    assert game_stats.current_game_state == GameState.ROUND_END
+    assert game_stats.score == (1, 0)
+    assert game_stats.player_who_last_scored == PlayerIndex.PLAYER_TWO
+    # The side of the window isn't a wall
+    assert [event.event_type for event in events] == [MatchEventType.POINT]
+
+
+def test_swept_ball_scores_when_crossing_the_goal_line_mid_tick():
+    simulation = Simulation(WINDOW_SIZE, swept_collisions=True)
+    # Bounces off of the bottom edge, then crosses the goal line of the right paddle below it
+    events = serve(simulation, (600, 560), (3000, 1000))
+    simulation.step(DELTA_TIME)
+
+    game_stats = simulation.get_game_stats()
+    assert game_stats.score == (0, 1)
+    assert game_stats.player_who_last_scored == PlayerIndex.PLAYER_ONE
+    assert [event.event_type for event in events] == [MatchEventType.WALL_BOUNCE, MatchEventType.POINT]
+    # The ball has been stopped on the goal line instead of ending up past the window
+    ball_center_x = simulation.get_ball().get_rect().center[0]
+    assert abs(ball_center_x - simulation.get_player_two().get_rect().center[0]) <= 1
+
+
+def test_fast_ball_doesnt_tunnel_through_the_paddle():
+    # The ball travels way further than the width of the paddle during the tick
+    swept_simulation = Simulation(WINDOW_SIZE, swept_collisions=True)
+    paddle_y = swept_simulation.get_player_one().get_y()
+    events = serve(swept_simulation, (300, paddle_y + 50), (-5000, 0))
+    swept_simulation.step(DELTA_TIME)
+
+    assert swept_simulation.get_game_stats().current_game_state == GameState.ROUND_IN_PROGRESS
+    assert swept_simulation.get_game_stats().score == (0, 0)
+    assert swept_simulation.get_ball().velocity[0] > 0
+    assert swept_simulation.get_ball().get_x() >= swept_simulation.get_player_one().get_rect().right
+    assert [(event.event_type, event.player) for event in events] == [(MatchEventType.PADDLE_HIT, PlayerIndex.PLAYER_ONE)]
+
+    # Without the sweep, the ball only gets checked at the end of the tick, when it's already past the paddle
+    simulation = Simulation(WINDOW_SIZE)
+    serve(simulation, (300, paddle_y + 50), (-5000, 0))
+    simulation.step(DELTA_TIME)
+    assert simulation.get_game_stats().score == (1, 0)
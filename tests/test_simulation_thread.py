@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+import pytest
+from pypong.core.game_stats import GameState
+from pypong.core.simulation import Simulation
+from pypong.core.simulation_thread import SimulationThread, TripleBuffer
+
+
+# Amount of parts every value is written in, a reader seeing a slot in between them would see a torn value
+PART_COUNT = 4
+# Fails the test instead of hanging if the thread doesn't respond
+TIMEOUT = 5.0
+
+
+def test_triple_buffer_hands_over_whole_values_and_the_latest_wins():
+    # Every slot holds a value written part by part, a whole value has the same number in every part
+    buffer = TripleBuffer([0] * PART_COUNT, [0] * PART_COUNT, [0] * PART_COUNT)
+    rng = random.Random(0)
+    written_parts = 0
+    last_published = 0
+    last_acquired = buffer.acquire()
+    has_published_since_acquire = False
+
+    # Random interleavings of the writer's and the reader's steps
+    for _ in range(20000):
+        operation = rng.random()
+        if operation < 0.6:
+            # The writer writes the next part of the next value into its back slot
+            back = buffer.get_back()
+            back[written_parts] = last_published + 1
+            written_parts += 1
+            if written_parts == PART_COUNT:
+                buffer.publish()
+                written_parts = 0
+                last_published += 1
+                has_published_since_acquire = True
+        else:
+            value = buffer.acquire()
+            # Never torn, always the newest published value and never the slot the writer is filling in
+            assert value == [last_published] * PART_COUNT
+            assert value is not buffer.get_back()
+            # The same value is only handed out again if nothing newer has been published
+            assert (value is last_acquired) == (not has_published_since_acquire)
+            last_acquired = value
+            has_published_since_acquire = False
+
+    assert last_published > 1000
+
+
+def test_triple_buffer_drops_the_values_nobody_has_read():
+    buffer = TripleBuffer([0], [0], [0])
+    for value in range(1, 6):
+        buffer.get_back()[0] = value
+        buffer.publish()
+    assert buffer.acquire() == [5]
+    # Nothing new, the same value again
+    assert buffer.acquire() == [5]
+    buffer.get_back()[0] = 6
+    buffer.publish()
+    assert buffer.acquire() == [6]
+
+
+def create_thread(tick_function) -> SimulationThread:
+    return SimulationThread(Simulation((800, 600), rng=random.Random(0)), tick_function, tick_rate=1000)
+
+
+def test_simulation_thread_stops_while_idle():
+    ticks = []
+    thread = create_thread(lambda delta_time, directions, advance_count: ticks.append(advance_count))
+    thread.start()
+    # The game is at the start screen, so the thread is waiting for SPACE
+    assert thread.is_running()
+    thread.stop()
+    assert not thread.is_running()
+    assert ticks == []
+    assert thread.get_newest_frame().tick == 0
+
+
+def test_simulation_thread_stops_while_ticking():
+    simulation = Simulation((800, 600), rng=random.Random(0))
+    ticked = threading.Event()
+
+    def tick(delta_time, directions, advance_count):
+        for _ in range(advance_count):
+            simulation.advance_state()
+        simulation.step(delta_time, *directions)
+        if simulation.get_game_stats().current_game_state == GameState.ROUND_IN_PROGRESS:
+            ticked.set()
+
+    thread = SimulationThread(simulation, tick, tick_rate=1000)
+    thread.start()
+    thread.request_advance()
+    thread.request_advance()
+    assert ticked.wait(TIMEOUT)
+
+    stop_time = time.perf_counter()
+    thread.stop()
+    assert time.perf_counter() - stop_time < TIMEOUT
+    assert not thread.is_running()
+
+    # No tick is run after stop() has returned, and the last one has been published
+    tick_count = thread.get_tick_count()
+    time.sleep(0.05)
+    assert thread.get_tick_count() == tick_count
+    assert thread.get_newest_frame().tick == tick_count
+    assert not thread.has_pending_advances()
+    # Stopping again does nothing
+    thread.stop()
+
+
+def test_simulation_thread_reports_the_exception_that_stopped_it():
+    def tick(delta_time, directions, advance_count):
+        raise ZeroDivisionError()
+
+    thread = create_thread(tick)
+    thread.start()
+    thread.request_advance()
+    deadline = time.perf_counter() + TIMEOUT
+    while thread.is_running() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert not thread.is_running()
+    with pytest.raises(RuntimeError) as error:
+        thread.get_newest_frame()
+    assert isinstance(error.value.__cause__, ZeroDivisionError)
+    thread.stop()
@@ -0,0 +1,102 @@
+import itertools
+import random
+import pygame
+from pypong.core.simulation import Simulation
+from pypong.gameplay.spatial_grid import SpatialGrid
+
+
+FIELD_SIZE = (800, 600)
+
+
+# Collision rect of an object, rounded the same way as the ones of the GameObjects
+def get_rect(position: tuple, size: tuple) -> pygame.Rect:
+    return pygame.Rect(round(position[0]), round(position[1]), size[0], size[1])
+
+
+def test_grid_finds_the_same_pairs_as_brute_force():
+    rng = random.Random(0)
+    grid = SpatialGrid(50)
+    positions = dict()
+    sizes = dict()
+    for key in range(150):
+        sizes[key] = (rng.randint(5, 120), rng.randint(5, 120))
+        positions[key] = (rng.uniform(-20, FIELD_SIZE[0]), rng.uniform(-20, FIELD_SIZE[1]))
+        grid.insert(key, positions[key], sizes[key])
+
+    for tick in range(200):
+        # Most of the objects move a bit, some of them jump across the field or leave it for a while
+        for key in positions:
+            if rng.random() < 0.05:
+                positions[key] = (rng.uniform(-20, FIELD_SIZE[0]), rng.uniform(-20, FIELD_SIZE[1]))
+            else:
+                positions[key] = (positions[key][0] + rng.uniform(-6, 6), positions[key][1] + rng.uniform(-6, 6))
+            grid.move(key, positions[key])
+        if tick % 50 == 49:
+            removed_key = rng.choice(list(positions))
+            grid.remove(removed_key)
+            del positions[removed_key]
+
+        rects = {key: get_rect(positions[key], sizes[key]) for key in positions}
+        expected_pairs = {(key, other_key) for key, other_key in itertools.combinations(sorted(rects), 2)
+                          if rects[key].colliderect(rects[other_key])}
+        found_pairs = {(key, other_key) for key in rects for other_key in grid.get_neighbors(key)
+                       if key < other_key and rects[key].colliderect(rects[other_key])}
+        assert found_pairs == expected_pairs, f"tick {tick}"
+        # Otherwise nothing has been compared
+        assert len(expected_pairs) > 0
+
+    assert grid.get_object_count() == len(positions)
+    for key in positions:
+        assert key in grid.query(positions[key], sizes[key])
+
+
+# Starts a round of two balls placed at the provided positions and moving at the provided velocities
+def serve_two_balls(positions: tuple, velocities: tuple) -> Simulation:
+    simulation = Simulation(FIELD_SIZE, ball_count=2)
+    simulation.advance_state()
+    simulation.advance_state()
+    for ball, position, velocity in zip(simulation.get_balls(), positions, velocities):
+        ball.move((position[0] - ball.get_x(), position[1] - ball.get_y()))
+        ball.velocity = velocity
+    return simulation
+
+
+def test_balls_exchange_their_velocities():
+    simulation = serve_two_balls(((300, 280), (400, 290)), ((200, 50), (-100, -30)))
+    balls = simulation.get_balls()
+    for _ in range(30):
+        simulation.step(1 / 60)
+    # The balls have met head on, so they've swapped their X velocities and kept their Y velocities
+    assert balls[0].velocity == (-100, 50)
+    assert balls[1].velocity == (200, -30)
+
+    # The balls move apart right away instead of bouncing back and forth while they overlap
+    overlapping_ticks = 0
+    for _ in range(30):
+        simulation.step(1 / 60)
+        overlapping_ticks += balls[0].get_rect().colliderect(balls[1].get_rect())
+    assert balls[0].velocity == (-100, 50)
+    assert overlapping_ticks == 0
+    assert balls[0].get_rect().right < balls[1].get_rect().left
+
+
+def test_balls_bounce_off_of_each_other_vertically():
+    simulation = serve_two_balls(((400, 200), (405, 300)), ((0, 150), (0, -150)))
+    balls = simulation.get_balls()
+    for _ in range(40):
+        simulation.step(1 / 60)
+    assert balls[0].velocity == (0, -150)
+    assert balls[1].velocity == (0, 150)
+    assert not balls[0].get_rect().colliderect(balls[1].get_rect())
+    assert balls[0].get_y() < balls[1].get_y()
+
+
+def test_overlapping_balls_moving_apart_arent_bounced():
+    # Eg. right after a bounce, or when a launch puts them on top of each other
+    simulation = serve_two_balls(((400, 300), (410, 302)), ((-50, 0), (60, 0)))
+    balls = simulation.get_balls()
+    for _ in range(10):
+        simulation.step(1 / 60)
+    assert balls[0].velocity == (-50, 0)
+    assert balls[1].velocity == (60, 0)
+    assert not balls[0].get_rect().colliderect(balls[1].get_rect())
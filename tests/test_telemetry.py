@@ -0,0 +1,83 @@
+import os
+import random
+import numpy as np
+from pypong.core.game_stats import GameState, MatchEventType, PlayerIndex
+from pypong.core.simulation import PaddleDirection, Simulation
+from pypong.core.telemetry import EVENT_COLUMNS, EventRecorder, TelemetryWriter, get_column_path
+from pypong.core.telemetry_query import TelemetryStore, point_counts, rally_length_histogram
+
+
+# Plays a match with random inputs until 'point_count' points have been scored
+# Returns the recorder holding its events
+def record_match(seed: int, point_count: int) -> EventRecorder:
+    recorder = EventRecorder()
+    simulation = Simulation((800, 600), rng=random.Random(seed))
+    simulation.get_game_stats().event_listener = recorder.record
+    input_rng = random.Random(seed)
+    game_stats = simulation.get_game_stats()
+    while sum(game_stats.score) < point_count:
+        if game_stats.current_game_state != GameState.ROUND_IN_PROGRESS:
+            simulation.advance_state()
+        simulation.step(1 / 60, PaddleDirection(input_rng.randint(-1, 1)), PaddleDirection(input_rng.randint(-1, 1)))
+    return recorder
+
+
+# Values of every column of the recorded matches, the way the store is expected to hold them
+def get_expected_columns(recorders: list[EventRecorder]) -> dict:
+    columns = {"match": np.concatenate([np.full(recorder.get_event_count(), match_id)
+                                        for match_id, recorder in enumerate(recorders)])}
+    for index, (name, _, dtype) in enumerate(EVENT_COLUMNS[1:]):
+        columns[name] = np.concatenate([np.array(recorder.get_columns()[index], dtype=dtype) for recorder in recorders])
+    return columns
+
+
+def test_written_events_can_be_queried(tmp_path):
+    recorders = [record_match(seed, 5) for seed in range(6)]
+    # The matches are split between two writers, the second one appends to the store of the first one
+    with TelemetryWriter(str(tmp_path), buffer_size=100) as writer:
+        assert [writer.append(recorder) for recorder in recorders[:4]] == [0, 1, 2, 3]
+    with TelemetryWriter(str(tmp_path)) as writer:
+        assert [writer.append(recorder) for recorder in recorders[4:]] == [4, 5]
+
+    store = TelemetryStore(str(tmp_path))
+    expected_columns = get_expected_columns(recorders)
+    assert store.get_event_count() == len(expected_columns["match"])
+    assert store.get_match_count() == len(recorders)
+    for name, values in expected_columns.items():
+        assert np.array_equal(store.get_column(name), values), name
+
+    # Small chunks, so that the aggregates are combined from many of them
+    is_point = expected_columns["event_type"] == MatchEventType.POINT
+    points = expected_columns["player"][is_point]
+    assert point_counts(store, chunk_size=64) == (np.count_nonzero(points == PlayerIndex.PLAYER_ONE),
+                                                  np.count_nonzero(points == PlayerIndex.PLAYER_TWO))
+    expected_histogram = np.bincount(expected_columns["value"][is_point].astype(np.int64))
+    assert np.array_equal(rally_length_histogram(store, chunk_size=64), expected_histogram)
+    assert rally_length_histogram(store).sum() == 6 * 5
+
+
+def test_torn_event_is_dropped_on_reopen(tmp_path):
+    recorders = [record_match(seed, 2) for seed in range(3)]
+    with TelemetryWriter(str(tmp_path)) as writer:
+        writer.append(recorders[0])
+        writer.append(recorders[1])
+    sizes = {name: os.path.getsize(get_column_path(str(tmp_path), name)) for name, _, _ in EVENT_COLUMNS}
+
+    # A crash in the middle of writing the next event: some columns got their value, one only a part of it
+    for name, _, dtype in EVENT_COLUMNS[:3]:
+        with open(get_column_path(str(tmp_path), name), "ab") as column_file:
+            column_file.write(b"\xff" * np.dtype(dtype).itemsize)
+    with open(get_column_path(str(tmp_path), "x"), "ab") as column_file:
+        column_file.write(b"\xff\xff")
+    # The reader ignores the torn event as well
+    assert TelemetryStore(str(tmp_path)).get_event_count() == recorders[0].get_event_count() + recorders[1].get_event_count()
+
+    with TelemetryWriter(str(tmp_path)) as writer:
+        # The torn event has been truncated away
+        assert {name: os.path.getsize(get_column_path(str(tmp_path), name)) for name, _, _ in EVENT_COLUMNS} == sizes
+        assert writer.get_match_count() == 2
+        assert writer.append(recorders[2]) == 2
+
+    store = TelemetryStore(str(tmp_path))
+    for name, values in get_expected_columns(recorders).items():
+        assert np.array_equal(store.get_column(name), values), name
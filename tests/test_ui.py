@@ -0,0 +1,83 @@
+import os
+import pygame
+import pytest
+from pypong.core.ui import GlyphAtlas, UIManager
+
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "res", "ka1.ttf")
+WHITE = (255, 255, 255)
+
+
+@pytest.fixture(autouse=True)
+def fonts():
+    pygame.font.init()
+    yield
+    pygame.font.quit()
+
+
+def test_least_recently_used_text_is_evicted():
+    ui = UIManager([("font", FONT_PATH, 20)], cache_size=2)
+    first = ui.draw_text("first", "font", WHITE)
+    second = ui.draw_text("second", "font", WHITE)
+    # Using the first text again makes the second one the least recently used
+    assert ui.draw_text("first", "font", WHITE) is first
+    ui.draw_text("third", "font", WHITE)
+
+    assert ui.draw_text("first", "font", WHITE) is first
+    assert ui.draw_text("second", "font", WHITE) is not second
+    assert ui.get_cache_stats() == (2, 4)
+
+
+def test_texts_are_cached_per_font_and_color():
+    ui = UIManager([("small", FONT_PATH, 12), ("large", FONT_PATH, 30)])
+    small = ui.draw_text("text", "small", WHITE)
+    assert ui.draw_text("text", "large", WHITE) is not small
+    assert ui.draw_text("text", "small", [255, 0, 0]) is not small
+    assert ui.draw_text("text", "small", [255, 255, 255]) is small
+    # Unregistered fonts produce empty texts
+    assert ui.draw_text("text", "missing", WHITE).surface is None
+
+
+def test_numeric_text_is_drawn_from_the_glyph_atlas():
+    ui = UIManager([("font", FONT_PATH, 30)], cache_size=4, use_glyph_atlas=True)
+    font = pygame.font.Font(FONT_PATH, 30)
+
+    score = ui.draw_text("1207", "font", WHITE)
+    assert score.size == (sum(font.size(digit)[0] for digit in "1207"), font.get_height())
+    assert score.line_size == font.get_linesize()
+    # The digits are the font's own glyphs placed next to each other
+    expected = pygame.mask.Mask(score.size)
+    x = 0
+    for digit in "1207":
+        glyph = font.render(digit, 0, WHITE)
+        expected.draw(pygame.mask.from_surface(glyph), (x, 0))
+        x += glyph.get_width()
+    drawn = pygame.mask.from_surface(score.surface)
+    assert expected.count() > 0
+    assert drawn.count() == expected.count() == drawn.overlap_area(expected, (0, 0))
+
+    # Numeric text doesn't go through the cache, other text does
+    ui.draw_text("12", "font", WHITE)
+    assert ui.get_cache_stats() == (0, 0)
+    ui.draw_text("PRESS SPACE", "font", WHITE)
+    ui.draw_text("1 2", "font", WHITE)
+    assert ui.get_cache_stats() == (0, 2)
+    assert ui.get_glyph_atlas_count() == 1
+
+
+def test_glyph_atlas_is_only_created_for_numeric_text():
+    ui = UIManager([("font", FONT_PATH, 30)], use_glyph_atlas=True)
+    ui.draw_text("PRESS SPACE", "font", WHITE)
+    ui.draw_text("Player 1 scored!", "font", (255, 0, 0))
+    assert ui.get_glyph_atlas_count() == 0
+
+    ui.draw_text("3", "font", (255, 0, 0))
+    ui.draw_text("10", "font", (255, 0, 0))
+    assert ui.get_glyph_atlas_count() == 1
+
+
+def test_glyph_atlas_only_draws_digits():
+    atlas = GlyphAtlas(pygame.font.Font(FONT_PATH, 20), WHITE)
+    assert atlas.can_draw("0123456789")
+    assert not atlas.can_draw("")
+    assert not atlas.can_draw("12a")